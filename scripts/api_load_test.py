@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Нагрузочный замер HTTP API IT Compass. Поднимает сервер во временном
+каталоге профилей (или использует --url) и для каждого уровня параллельности
+гоняет смесь запросов по keep-alive соединениям; сообщает запросы в секунду
+и задержки p50/p95/p99.
+
+Пример: python scripts/api_load_test.py --requests 2000 --concurrency 1,8,32 --users 50
+"""
+import argparse
+import asyncio
+import json
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import List, Tuple
+from urllib.parse import quote, urlsplit
+
+# Add the project root to the path to allow imports
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.api.server import CompassService, start_api_server
+from src.core.tracker_pool import TrackerPool
+
+SEARCH_QUERIES = ["git", "python скрипт", "docker контейнер", "sql запрос", "linux", "api"]
+
+
+def percentile(values: List[float], q: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(q / 100 * (len(ordered) - 1)))))
+    return ordered[index]
+
+
+def request_mix(count: int, users: int, marker_ids: List[str], seed: int) -> List[Tuple[str, str, bytes]]:
+    """Чтения преобладают: прогресс, рекомендации, поиск; каждый десятый запрос — отметка маркеров."""
+    rng = random.Random(seed)
+    requests = []
+    for i in range(count):
+        user = f"user{rng.randrange(users)}"
+        kind = i % 10
+        if kind == 0:
+            body = json.dumps({"marker_ids": rng.sample(marker_ids, min(3, len(marker_ids)))}).encode("utf-8")
+            requests.append(("POST", f"/users/{user}/marks", body))
+        elif kind < 5:
+            requests.append(("GET", f"/users/{user}/progress", b""))
+        elif kind < 7:
+            requests.append(("GET", f"/users/{user}/recommendations?limit=5", b""))
+        elif kind < 9:
+            requests.append(("GET", f"/search?q={quote(rng.choice(SEARCH_QUERIES))}&limit=5", b""))
+        else:
+            requests.append(("GET", f"/users/{user}/portfolio", b""))
+    return requests
+
+
+async def _client(host: str, port: int, queue: "asyncio.Queue", latencies: List[float], statuses: dict) -> None:
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        while True:
+            try:
+                method, path, body = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            started = time.perf_counter()
+            writer.write(
+                f"{method} {path} HTTP/1.1\r\nHost: {host}\r\nContent-Length: {len(body)}\r\n\r\n".encode("latin-1") + body
+            )
+            status = int((await reader.readline()).split()[1])
+            length = 0
+            while True:
+                line = await reader.readline()
+                if line in (b"\r\n", b""):
+                    break
+                name, _, value = line.decode("latin-1").partition(":")
+                if name.strip().lower() == "content-length":
+                    length = int(value)
+            await reader.readexactly(length)
+            latencies.append(time.perf_counter() - started)
+            statuses[status] = statuses.get(status, 0) + 1
+    finally:
+        writer.close()
+
+
+async def run_level(url: str, requests: List[Tuple[str, str, bytes]], concurrency: int) -> dict:
+    parts = urlsplit(url)
+    queue: asyncio.Queue = asyncio.Queue()
+    for item in requests:
+        queue.put_nowait(item)
+    latencies: List[float] = []
+    statuses: dict = {}
+    started = time.perf_counter()
+    await asyncio.gather(*(_client(parts.hostname, parts.port, queue, latencies, statuses) for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    return {
+        "concurrency": concurrency,
+        "requests": len(latencies),
+        "elapsed": elapsed,
+        "rps": len(latencies) / elapsed if elapsed else 0.0,
+        "p50": percentile(latencies, 50),
+        "p95": percentile(latencies, 95),
+        "p99": percentile(latencies, 99),
+        "errors": sum(count for status, count in statuses.items() if status >= 500),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Нагрузочный замер HTTP API')
+    parser.add_argument('--url', help='Адрес уже запущенного API; по умолчанию сервер поднимается во временном каталоге')
+    parser.add_argument('--requests', type=int, default=2000, help='Запросов на каждый уровень параллельности')
+    parser.add_argument('--concurrency', default="1,4,16,64")
+    parser.add_argument('--users', type=int, default=50)
+    parser.add_argument('--io-workers', type=int, default=8)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        server = service = None
+        pool = TrackerPool(
+            default_progress_file=str(Path(temp_dir) / "progress.json"),
+            profiles_dir=str(Path(temp_dir) / "profiles"),
+            max_size=max(64, args.users)
+        )
+        url = args.url
+        if url is None:
+            service = CompassService(pool, io_workers=args.io_workers)
+            server, url = start_api_server(service)
+            print(f"🧪 Локальный сервер: {url}")
+
+        marker_ids = [
+            marker.id
+            for skill_data in pool.markers.values()
+            for level_markers in skill_data.levels.values()
+            for marker in level_markers
+        ]
+        requests = request_mix(args.requests, args.users, marker_ids, args.seed)
+
+        print(f"📝 Запросов на уровень: {len(requests)}, пользователей: {args.users}")
+        print("-" * 72)
+        print(f"{'Соедин.':>7} {'Запросов':>9} {'Время, с':>9} {'Запр./с':>9} "
+              f"{'p50, мс':>9} {'p95, мс':>9} {'p99, мс':>9} {'5xx':>5}")
+        for concurrency in [int(level) for level in args.concurrency.split(",") if level.strip()]:
+            row = asyncio.run(run_level(url, requests, concurrency))
+            print(f"{row['concurrency']:>7} {row['requests']:>9} {row['elapsed']:>9.2f} {row['rps']:>9.0f} "
+                  f"{row['p50'] * 1000:>9.2f} {row['p95'] * 1000:>9.2f} {row['p99'] * 1000:>9.2f} {row['errors']:>5}")
+
+        if server is not None:
+            server.shutdown()
+            service.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Отчёт по прогрессу группы пользователей: сильные навыки, уровни, на которых
+застревают, распределение числа выполненных маркеров.
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# Add the project root to the path to allow imports
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.core.tracker import load_markers
+from src.utils.cohort_analytics import DEFAULT_PERCENTILES, load_cohort, profile_progress_files
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Аналитика прогресса когорты пользователей')
+    parser.add_argument('--profiles-dir', default="src/data/profiles", help='Директория файлов прогресса профилей')
+    parser.add_argument('--default-progress', default="src/data/user_progress.json")
+    parser.add_argument('--markers-dir', default="src/data/markers")
+    parser.add_argument('--top', type=int, default=5, help='Сколько навыков и уровней показывать')
+    args = parser.parse_args()
+
+    markers = load_markers(Path(args.markers_dir))
+    started = time.perf_counter()
+    cohort = load_cohort(markers, profile_progress_files(args.profiles_dir, args.default_progress))
+    print(f"👥 Пользователей: {len(cohort)}, маркеров в каталоге: {len(cohort.marker_ids)} "
+          f"(загрузка {time.perf_counter() - started:.2f} с)")
+    if not len(cohort):
+        print("ℹ️ Файлы прогресса не найдены")
+        return
+
+    print("\n💪 СИЛЬНЫЕ НАВЫКИ КОМАНДЫ:")
+    for item in cohort.skill_strength()[:args.top]:
+        print(f" {item['skill_name']:<22} {item['mean_completion'] * 100:5.1f}% в среднем, "
+              f"начали {item['started_share'] * 100:.0f}%")
+
+    print("\n🧱 ГДЕ ЗАСТРЕВАЮТ (начали уровень, но не завершили):")
+    stalls = sorted(cohort.level_stats(), key=lambda item: -item["stalled_share"])
+    for item in stalls[:args.top]:
+        print(f" {item['skill_name']} — уровень {item['level']}: {item['stalled_share'] * 100:.0f}% "
+              f"(завершили {item['finished_share'] * 100:.0f}%)")
+
+    totals = cohort.percentiles()["total"]
+    print("\n📊 ВЫПОЛНЕНО МАРКЕРОВ НА ЧЕЛОВЕКА:")
+    print(" " + ", ".join(f"p{q}: {value:.0f}" for q, value in zip(DEFAULT_PERCENTILES, totals)))
+
+if __name__ == "__main__":
+    main()
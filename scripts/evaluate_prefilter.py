@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""
+Оценка локального отбора маркеров-кандидатов на размеченной выборке.
+Показывает, сколько ожидаемых маркеров попадает в промпт и насколько
+он сокращается при разных лимитах кандидатов.
+"""
+import argparse
+import json
+import sys
+from pathlib import Path
+
+# Add the project root to the path to allow imports
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.core.tracker import load_markers
+from src.utils.marker_index import MarkerIndex, evaluate_recall
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Полнота отбора маркеров-кандидатов против размера промпта')
+    parser.add_argument('sample', nargs='?', default=str(project_root / "examples" / "prefilter_sample.jsonl"),
+                        help='JSONL с полями "text" и "marker_ids"')
+    parser.add_argument('--markers-dir', default="src/data/markers")
+    parser.add_argument('--limits', default="5,10,20,40", help='Лимиты кандидатов через запятую')
+    args = parser.parse_args()
+    
+    markers = load_markers(Path(args.markers_dir))
+    index = MarkerIndex(markers)
+    
+    with open(args.sample, 'r', encoding='utf-8') as f:
+        samples = [json.loads(line) for line in f if line.strip()]
+    
+    full_prompt_chars = sum(len(marker.id) + len(marker.marker) + 6 for _, marker in index.entries)
+    limits = [int(limit) for limit in args.limits.split(",") if limit.strip()]
+    
+    print(f"📊 Каталог: {len(index)} маркеров, {full_prompt_chars} символов в полном списке")
+    print(f"📝 Размеченных примеров: {len(samples)}")
+    print("-" * 60)
+    print(f"{'Top-N':>6} {'Полнота':>10} {'Символов':>10} {'Доля промпта':>14}")
+    for row in evaluate_recall(index, samples, limits, full_prompt_chars):
+        print(f"{row['limit']:>6} {row['recall']:>10.1%} {row['avg_prompt_chars']:>10.0f} {row['prompt_ratio']:>14.1%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Миграция файлов прогресса на текущую версию каталога маркеров.
+
+После правки каталога (переименование, удаление, перенос маркеров)
+зарегистрируйте шаг миграции:
+    python scripts/migrate_progress.py record --rename git_1_1=git_basics_1 --remove old_marker
+Затем обновите все файлы прогресса:
+    python scripts/migrate_progress.py run
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# Add the project root to the path to allow imports
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.core.catalog_version import DEFAULT_MIGRATIONS_FILE, catalog_version, get_catalog_migrations
+from src.core.progress_bitset import PROGRESS_FORMATS, PROGRESS_FORMAT_JSON
+from src.core.tracker import CareerTracker, load_markers
+from src.utils.cohort_analytics import profile_progress_files
+
+
+def record(args, markers) -> None:
+    migrations = get_catalog_migrations(args.migrations_file)
+    version = catalog_version(markers)
+    renamed = {}
+    for pair in args.rename:
+        old_id, sep, new_id = pair.partition("=")
+        if not sep or not old_id or not new_id:
+            print(f"❌ Ожидается старый=новый, получено: {pair}")
+            sys.exit(1)
+        renamed[old_id] = new_id
+    if not renamed and not args.remove and migrations.steps and migrations.steps[-1]["to"] == version:
+        print(f"ℹ️ Версия каталога {version} уже зарегистрирована")
+        return
+    migrations.record(version, renamed=renamed, removed=args.remove)
+    print(f"✅ Шаг миграции к версии {version}: переименований {len(renamed)}, удалений {len(args.remove)}")
+
+
+def run(args, markers) -> None:
+    version = catalog_version(markers)
+    files = profile_progress_files(args.profiles_dir, args.default_progress)
+    print(f"📁 Файлов прогресса: {len(files)}, версия каталога: {version}")
+    started = time.perf_counter()
+    upgraded = 0
+    for path in files.values():
+        tracker = CareerTracker(
+            markers_dir=args.markers_dir, progress_file=str(path), markers=markers,
+            progress_format=args.progress_format, catalog_version=version,
+            migrations_file=args.migrations_file
+        )
+        if tracker.upgrade_progress_file():
+            upgraded += 1
+    elapsed = time.perf_counter() - started
+    print(f"✅ Обновлено: {upgraded}, уже актуальны: {len(files) - upgraded} ({elapsed:.2f} с)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Миграция прогресса между версиями каталога маркеров')
+    parser.add_argument('--markers-dir', default="src/data/markers")
+    parser.add_argument('--migrations-file', default=DEFAULT_MIGRATIONS_FILE)
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    record_parser = commands.add_parser('record', help='Зарегистрировать текущую версию каталога и изменения ID')
+    record_parser.add_argument('--rename', action='append', default=[], metavar='СТАРЫЙ=НОВЫЙ')
+    record_parser.add_argument('--remove', action='append', default=[], metavar='ID')
+
+    run_parser = commands.add_parser('run', help='Перевести все файлы прогресса на текущую версию')
+    run_parser.add_argument('--profiles-dir', default="src/data/profiles")
+    run_parser.add_argument('--default-progress', default="src/data/user_progress.json")
+    run_parser.add_argument('--progress-format', choices=PROGRESS_FORMATS, default=PROGRESS_FORMAT_JSON,
+                            help='Формат, в котором записываются обновлённые файлы')
+    args = parser.parse_args()
+
+    markers = load_markers(Path(args.markers_dir))
+    if args.command == 'record':
+        record(args, markers)
+    else:
+        run(args, markers)
+
+
+if __name__ == "__main__":
+    main()
@@ -6,47 +6,52 @@
 import json
 import os
 import sys
+import time
 import requests
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
 from datetime import datetime
 
 # Add the project root to the path to allow imports
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
-from src.core.tracker import CareerTracker
+from src.core.tracker import CareerTracker, Marker
 from src.utils.portfolio_gen import PortfolioGenerator
+from src.utils.notes_chunker import DEFAULT_CHUNK_TOKENS, estimate_tokens, iter_chunks, split_blocks, split_into_chunks
+from src.utils.notes_reader import iter_note_blocks
+from src.utils.offline_matcher import OfflineMatcher, get_offline_matcher, init_worker, match_in_worker
+from src.utils.reasoning_cache import DEFAULT_CACHE_FILE, ResponseCache
+from src.utils.marker_index import get_marker_index
+from src.utils.match_aggregator import DEFAULT_METHOD, aggregate_matches, parse_threshold
+from src.core.http_client import get_http_client
+from src.utils.notes_manifest import NotesManifest, ScannedFile, default_manifest_path
+from src.utils.request_packer import (
+    DEFAULT_PACK_MAX_ITEMS, SECTION_OVERHEAD_TOKENS, format_pack, iter_packs, split_pack_matches
+)
 
+NOTES_SUFFIXES = ['.txt', '.md', '.json', '.py', '.js', '.html', '.css']
+DEFAULT_MAX_CONCURRENCY = 4
+DEFAULT_CACHE_MAX_MB = 256
+DEFAULT_TOP_MARKERS = 40
+PROGRESS_INTERVAL = 1.0
 
-class ReasoningIntegrator:
-    def __init__(self, tracker: CareerTracker):
-        self.tracker = tracker
-        self.reasoning_api_url = os.getenv("REASONING_API_URL", "https://api.openai.com/v1/chat/completions")
-        self.reasoning_api_key = os.getenv("REASONING_API_KEY")
-        self.reasoning_model = os.getenv("REASONING_MODEL", "gpt-4")
-        
-    def analyze_notes_with_reasoning(self, notes_content: str) -> List[Dict]:
-        """
-        Отправляет содержимое заметок в reasoning-модель для анализа
-        и возвращает список найденных маркеров.
-        """
-        if not self.reasoning_api_key:
-            print("⚠️ REASONING_API_KEY не установлен. Используем симуляцию.")
-            return self._simulate_reasoning_analysis(notes_content)
-        
-        # Подготовка промпта для reasoning-модели
-        markers_text = self._get_all_markers_text()
-        
-        prompt = f"""
+# Меняйте при любой правке PROMPT_TEMPLATE, чтобы кэш ответов не отдавал устаревшие результаты
+PROMPT_TEMPLATE_VERSION = "2"
+
+PROMPT_TEMPLATE = """
         Ты - аналитик, специализирующийся на оценке IT-компетенций.
         Ниже приведены фрагменты текста (заметки/диалоги), извлеченные из архива пользователя.
+        Каждый фрагмент начинается строкой <<<ФРАГМЕНТ N | источник>>> и заканчивается строкой <<<КОНЕЦ ФРАГМЕНТА N>>>.
         
         Твоя задача:
-        1. Внимательно проанализировать каждый фрагмент текста.
+        1. Внимательно проанализировать каждый фрагмент текста отдельно.
         2. Найти упоминания конкретных действий, решений, анализа, проектирования, написания кода, архитектурных решений и т.д.
         3. Сопоставить найденные действия/знания с маркерами компетенций IT Compass.
         4. Вывести результат в формате JSON: список объектов, где каждый объект имеет следующую структуру:
+           - "source": номер фрагмента N, в котором найдено совпадение (целое число),
            - "matched_marker_id": "ID маркера (например, 'python_1_1')",
            - "context_snippet": "Точный фрагмент текста, на котором основано сопоставление",
            - "confidence": "Уверенность в сопоставлении (низкая/средняя/высокая)",
@@ -60,6 +65,209 @@ class ReasoningIntegrator:
         Заметки/диалоги для анализа:
         {notes_content}
         """
+
+
+class ReasoningIntegrator:
+    def __init__(self, tracker: CareerTracker):
+        self.tracker = tracker
+        self.reasoning_api_url = os.getenv("REASONING_API_URL", "https://api.openai.com/v1/chat/completions")
+        self.reasoning_api_key = os.getenv("REASONING_API_KEY")
+        self.reasoning_model = os.getenv("REASONING_MODEL", "gpt-4")
+        # Бюджет токенов на фрагмент заметок и число одновременных запросов к API
+        self.max_chunk_tokens = int(os.getenv("REASONING_CHUNK_TOKENS", DEFAULT_CHUNK_TOKENS))
+        self.max_concurrency = max(1, int(os.getenv("REASONING_MAX_CONCURRENCY", DEFAULT_MAX_CONCURRENCY)))
+        self.http = get_http_client()
+        # Клиентское ограничение частоты запросов к API (запросов в секунду, 0 — без ограничения)
+        rate_limit = float(os.getenv("REASONING_RATE_LIMIT", "0"))
+        if rate_limit > 0:
+            self.http.set_rate_limit(self.reasoning_api_url, rate_limit)
+        # Сколько маркеров-кандидатов отбирать локально для промпта (0 — весь каталог)
+        self.top_markers = max(0, int(os.getenv("REASONING_TOP_MARKERS", DEFAULT_TOP_MARKERS)))
+        # Сколько небольших фрагментов (обычно файлов) упаковывать в один запрос (1 — без упаковки)
+        self.pack_max_items = max(1, int(os.getenv("REASONING_PACK_MAX_ITEMS", DEFAULT_PACK_MAX_ITEMS)))
+        # Число процессов для офлайн-анализа директорий (1 — в текущем процессе)
+        self.offline_workers = max(1, int(os.getenv("REASONING_OFFLINE_WORKERS", "1")))
+        # Объединение повторных совпадений: noisy_or или max, и порог итоговой уверенности (число или метка)
+        self.aggregation_method = os.getenv("REASONING_AGGREGATION", DEFAULT_METHOD)
+        self.min_confidence = parse_threshold(os.getenv("REASONING_MIN_CONFIDENCE"))
+        self._simulation_warned = False
+        self.cache: Optional[ResponseCache] = None
+        if os.getenv("REASONING_CACHE", "1") != "0":
+            self.cache = ResponseCache(
+                os.getenv("REASONING_CACHE_FILE", DEFAULT_CACHE_FILE),
+                max_bytes=int(os.getenv("REASONING_CACHE_MAX_MB", DEFAULT_CACHE_MAX_MB)) * 1024 * 1024
+            )
+        
+    def analyze_notes_with_reasoning(self, notes_content: str) -> List[Dict]:
+        """
+        Отправляет содержимое заметок в reasoning-модель для анализа
+        и возвращает список найденных маркеров.
+        
+        Длинные заметки делятся на фрагменты под бюджет токенов, фрагменты
+        анализируются параллельно, результаты объединяются в исходном порядке.
+        """
+        if not self.reasoning_api_key:
+            self._warn_simulation()
+            return self._simulate_reasoning_analysis(notes_content)
+        
+        matches, _ = self._analyze_chunk_stream(self._split_notes(notes_content))
+        return matches
+    
+    def _split_notes(self, notes_content: str) -> List[str]:
+        return split_into_chunks(notes_content, self.max_chunk_tokens)
+    
+    def _iter_file_chunks(self, file_path: Path) -> Iterator[str]:
+        """Фрагменты файла, прочитанного потоково: в памяти только текущий блок."""
+        blocks = (block for raw in iter_note_blocks(file_path) for block in split_blocks(raw))
+        return iter_chunks(blocks, self.max_chunk_tokens)
+    
+    def _analyze_chunk_stream(self, chunks: Iterable[str]) -> Tuple[List[Dict], bool]:
+        if not self.reasoning_api_key:
+            return self._merge_chunk_results(self._analyze_chunk(chunk) for chunk in chunks)
+        with ThreadPoolExecutor(max_workers=self.max_concurrency) as executor:
+            results = self._ordered_map(executor, self._analyze_chunk, chunks)
+            return self._merge_chunk_results(result for _, result in results)
+    
+    def _ordered_map(self, executor: Optional[Executor], func: Callable, items: Iterable,
+                     window: Optional[int] = None, arg: Optional[Callable] = None) -> Iterator[Tuple]:
+        """Как executor.map, но не вычитывает items целиком: в работе не больше
+        window (по умолчанию 2 * max_concurrency) задач, результаты отдаются
+        в исходном порядке. arg(item) — что передать в func вместо самого item."""
+        if executor is None:
+            for item in items:
+                yield item, func(arg(item) if arg else item)
+            return
+        
+        window = window or self.max_concurrency * 2
+        pending = deque()
+        for item in items:
+            pending.append((item, executor.submit(func, arg(item) if arg else item)))
+            if len(pending) >= window:
+                item, future = pending.popleft()
+                yield item, future.result()
+        while pending:
+            item, future = pending.popleft()
+            yield item, future.result()
+    
+    def _warn_simulation(self) -> None:
+        if not self._simulation_warned:
+            print("⚠️ REASONING_API_KEY не установлен. Используем офлайн-сопоставление.")
+            self._simulation_warned = True
+    
+    def _merge_chunk_results(self, chunk_results) -> Tuple[List[Dict], bool]:
+        """Объединяет совпадения фрагментов; второй элемент — все ли фрагменты обработаны."""
+        matches = []
+        complete = True
+        for chunk_matches in chunk_results:
+            if chunk_matches is None:
+                complete = False
+                continue
+            matches.extend(chunk_matches)
+        return matches, complete
+    
+    def _analyze_chunk(self, notes_content: str) -> Optional[List[Dict]]:
+        """Анализирует фрагмент заметок, используя дисковый кэш ответов.
+        
+        Возвращает None, если фрагмент проанализировать не удалось.
+        """
+        return self._analyze_pack([("", notes_content)])[0]
+    
+    def _analyze_pack(self, sections: List[Tuple[str, str]]) -> List[Optional[List[Dict]]]:
+        """Анализирует пачку фрагментов (подпись, текст) одним запросом к модели.
+        
+        Кэш ответов ведётся по каждому фрагменту отдельно: в запрос попадают
+        только промахи. Для каждого фрагмента возвращает его совпадения
+        или None, если проанализировать его не удалось.
+        """
+        if not self.reasoning_api_key:
+            return self.offline_matcher().match([text for _, text in sections])
+        
+        results: List[Optional[List[Dict]]] = [None] * len(sections)
+        keys: List[Optional[str]] = [None] * len(sections)
+        pending = []
+        for i, (_, text) in enumerate(sections):
+            if self.cache is not None:
+                keys[i] = ResponseCache.make_key(text, self.catalog_version(), self.reasoning_model, self._prompt_version())
+                cached = self.cache.get(keys[i])
+                if cached is not None:
+                    results[i] = cached
+                    continue
+            pending.append(i)
+        
+        candidates: Dict[str, Tuple[str, Marker]] = {}
+        to_request = []
+        for i in pending:
+            if not self.top_markers:
+                to_request.append(i)
+                continue
+            found = self._candidate_markers(sections[i][1])
+            if not found:
+                # Ни один маркер не похож на текст — запрос к модели не нужен
+                results[i] = []
+                continue
+            for skill_name, marker in found:
+                candidates.setdefault(marker.id, (skill_name, marker))
+            to_request.append(i)
+        
+        if not to_request:
+            return results
+        
+        markers_text = self._markers_text(candidates.values()) if self.top_markers else self._get_all_markers_text()
+        answers = self._request_pack([sections[i] for i in to_request], markers_text)
+        for i, matches in zip(to_request, answers):
+            results[i] = matches
+            if matches is not None and self.cache is not None:
+                # Ошибки не кэшируем — при следующем запуске фрагмент будет запрошен снова
+                self.cache.put(keys[i], matches)
+        return results
+    
+    def _prompt_version(self) -> str:
+        return f"{PROMPT_TEMPLATE_VERSION}:top{self.top_markers}"
+    
+    def analysis_key(self) -> str:
+        """Всё, от чего зависит результат анализа файла."""
+        if not self.reasoning_api_key:
+            return f"offline:{self.catalog_version()}"
+        return f"{self.reasoning_model}:{self._prompt_version()}:{self.catalog_version()}"
+    
+    def catalog_version(self) -> str:
+        """Хэш каталога маркеров: меняется при любой правке маркеров."""
+        return self.tracker.catalog_version
+    
+    def _candidate_markers(self, notes_content: str) -> List[Tuple[str, Marker]]:
+        index = get_marker_index(self.tracker.markers, self.catalog_version())
+        return [(skill_name, marker) for skill_name, marker, _ in index.search(notes_content, self.top_markers)]
+    
+    def _markers_text(self, candidates: Iterable[Tuple[str, Marker]]) -> str:
+        markers_text = []
+        current_skill = None
+        for skill_name, marker in sorted(candidates, key=lambda item: item[0]):
+            if skill_name != current_skill:
+                markers_text.append(f"\n{skill_name}:")
+                current_skill = skill_name
+            markers_text.append(f"  - {marker.id}: {marker.marker}")
+        return "\n".join(markers_text)
+    
+    def _request_pack(self, sections: List[Tuple[str, str]], markers_text: str) -> List[Optional[List[Dict]]]:
+        """Отправляет пачку фрагментов одним запросом и раскладывает ответ по фрагментам."""
+        matches = self._request_chunk(format_pack(sections), markers_text)
+        if not isinstance(matches, list):
+            return [None] * len(sections)
+        
+        per_section, unattributed = split_pack_matches(matches, len(sections))
+        if unattributed:
+            print(f"⚠️ {unattributed} совпадений без корректного номера фрагмента пропущено")
+        return per_section
+    
+    def _request_chunk(self, notes_content: str, markers_text: str) -> Optional[List[Dict]]:
+        """Отправляет заметки (одну пачку фрагментов) в reasoning-модель.
+        
+        Возвращает None, если ответ получить или разобрать не удалось.
+        """
+        prompt = PROMPT_TEMPLATE.format(
+            markers_text=markers_text,
+            notes_content=notes_content
+        )
         
         payload = {
             "model": self.reasoning_model,
@@ -75,7 +283,7 @@ class ReasoningIntegrator:
         }
         
         try:
-            response = requests.post(self.reasoning_api_url, json=payload, headers=headers)
+            response = self.http.post(self.reasoning_api_url, json=payload, headers=headers)
             response.raise_for_status()
             data = response.json()
             reasoning_output_text = data['choices'][0]['message']['content'].strip()
@@ -92,41 +300,26 @@ class ReasoningIntegrator:
                     print(f"Ошибка парсинга JSON из ответа Reasoning API: {e}")
                     print("Ответ API:")
                     print(reasoning_output_text)
-                    return []
+                    return None
             else:
                 print("Не удалось найти JSON в ответе Reasoning API.")
                 print("Ответ API:")
                 print(reasoning_output_text)
-                return []
+                return None
                 
         except requests.exceptions.RequestException as e:
             print(f"Ошибка при вызове Reasoning API: {e}")
-            return []
+            return None
     
     def _simulate_reasoning_analysis(self, notes_content: str) -> List[Dict]:
         """
-        Симуляция анализа reasoning-моделью для демонстрации.
+        Офлайн-анализ без API: TF-IDF-сопоставление с каталогом маркеров.
+        Возвращает результат в том же формате, что и reasoning-модель.
         """
-        print("Симуляция анализа...")
-        
-        # Найдем возможные совпадения в тексте
-        found_markers = []
-        
-        # Простой поиск по ключевым словам
-        if "python" in notes_content.lower() or "script" in notes_content.lower():
-            for skill_data in self.tracker.markers.values():
-                for level_markers in skill_data.levels.values():
-                    for marker in level_markers:
-                        if "python" in marker.marker.lower() or "script" in marker.marker.lower():
-                            found_markers.append({
-                                "matched_marker_id": marker.id,
-                                "context_snippet": notes_content[:200] + "...",
-                                "confidence": "средняя",
-                                "comment": "Найдено упоминание Python/скрипта в заметках"
-                            })
-                            break  # Добавим только первый найденный маркер для демонстрации
-        
-        return found_markers
+        return self.offline_matcher().analyze(notes_content)
+    
+    def offline_matcher(self) -> OfflineMatcher:
+        return get_offline_matcher(self.tracker.markers, self.catalog_version())
     
     def _get_all_markers_text(self) -> str:
         """Возвращает текстовое представление всех маркеров для промпта."""
@@ -141,71 +334,160 @@ class ReasoningIntegrator:
     
     def process_notes_file(self, file_path: str) -> List[Dict]:
         """Обрабатывает один файл с заметками."""
+        if not self.reasoning_api_key:
+            self._warn_simulation()
         try:
-            with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                content = f.read()
-            return self.analyze_notes_with_reasoning(content)
+            matches, _ = self._analyze_chunk_stream(self._iter_file_chunks(Path(file_path)))
+            return matches
         except Exception as e:
             print(f"Ошибка при обработке файла {file_path}: {e}")
             return []
     
-    def process_notes_directory(self, directory_path: str) -> List[Dict]:
-        """Обрабатывает все файлы в директории с заметками."""
-        all_matches = []
+    def process_notes_directory(self, directory_path: str, manifest_file: Optional[str] = None) -> List[Dict]:
+        """Обрабатывает все файлы в директории с заметками.
         
+        Манифест (путь, размер, mtime, хэш и совпадения каждого файла) позволяет
+        анализировать только новые и изменённые файлы; результаты удалённых
+        файлов отбрасываются. Возвращает совпадения по всему архиву.
+        """
         directory = Path(directory_path)
         if not directory.exists():
             print(f"Директория {directory_path} не существует")
             return []
         
-        # Обработка всех текстовых файлов в директории
-        for file_path in directory.rglob("*"):
-            if file_path.is_file() and file_path.suffix.lower() in ['.txt', '.md', '.json', '.py', '.js', '.html', '.css']:
-                print(f"Обработка файла: {file_path}")
-                matches = self.process_notes_file(str(file_path))
-                all_matches.extend(matches)
+        manifest = NotesManifest(
+            Path(manifest_file) if manifest_file else default_manifest_path(directory),
+            directory,
+            analysis_key=self.analysis_key()
+        )
+        changed = manifest.plan(NOTES_SUFFIXES)
+        print(f"Новых или изменённых файлов: {len(changed)} (всего в манифесте: {len(manifest.files)})")
+        
+        done = 0
+        last_report = time.monotonic()
+        for scanned, matches, complete in self._analyze_files(changed):
+            if complete:
+                manifest.record(scanned, [self._without_source(match) for match in matches])
+            done += 1
+            if done == len(changed) or time.monotonic() - last_report >= PROGRESS_INTERVAL:
+                print(f"📈 Проанализировано файлов: {done}/{len(changed)}")
+                last_report = time.monotonic()
+        manifest.save()
         
-        return all_matches
+        return manifest.all_matches()
+    
+    def _analyze_files(self, files: List[ScannedFile]) -> Iterator[Tuple[ScannedFile, List[Dict], bool]]:
+        """Анализирует файлы, отдавая (файл, совпадения, полностью ли обработан) в порядке обхода.
+        
+        Файлы читаются потоково, а их фрагменты отправляются через общий пул
+        с ограничением параллельности, поэтому память не зависит от размера архива.
+        Фрагменты разных файлов упаковываются в общие запросы с разметкой
+        источника, поэтому мелкие файлы не повторяют каталог маркеров каждый.
+        """
+        if not self.reasoning_api_key:
+            self._warn_simulation()
+        
+        def tasks():
+            for scanned in files:
+                print(f"Обработка файла: {scanned.path}")
+                try:
+                    for chunk in self._iter_file_chunks(scanned.path):
+                        yield scanned, chunk
+                    yield scanned, None
+                except Exception as e:
+                    print(f"Ошибка при обработке файла {scanned.path}: {e}")
+                    yield scanned, False
+        
+        def size(task):
+            _, chunk = task
+            return estimate_tokens(chunk) + SECTION_OVERHEAD_TOKENS if isinstance(chunk, str) else 0
+        
+        def run(pack):
+            sections = [(scanned.relative_path, chunk) for scanned, chunk in pack if isinstance(chunk, str)]
+            return self._analyze_pack(sections) if sections else []
+        
+        # Небольшие файлы и хвосты файлов идут в один запрос, пока пачка укладывается в бюджет токенов
+        packs = iter_packs(tasks(), size, self.max_chunk_tokens, self.pack_max_items)
+        executor, results_stream = self._pack_executor(run, packs)
+        try:
+            file_results: Dict[Path, List] = {}
+            for pack, results in results_stream:
+                pack_results = iter(results)
+                for scanned, chunk in pack:
+                    if isinstance(chunk, str):
+                        file_results.setdefault(scanned.path, []).append(next(pack_results))
+                        continue
+                    # Конец файла: chunk is None — прочитан целиком, False — ошибка чтения
+                    matches, complete = self._merge_chunk_results(file_results.pop(scanned.path, []))
+                    yield scanned, matches, complete and chunk is None
+        finally:
+            if executor is not None:
+                executor.shutdown()
+    
+    def _pack_executor(self, run: Callable, packs: Iterable[List]) -> Tuple[Optional[Executor], Iterator[Tuple]]:
+        """Исполнитель для пачек фрагментов и поток результатов (пачка, результаты) по порядку.
+        
+        API: пул потоков на max_concurrency запросов. Офлайн при offline_workers > 1:
+        пул процессов, каждый получает готовые признаки каталога один раз через
+        initializer, а задачам передаются только тексты фрагментов.
+        """
+        if self.reasoning_api_key:
+            executor = ThreadPoolExecutor(max_workers=self.max_concurrency)
+            return executor, self._ordered_map(executor, run, packs)
+        if self.offline_workers <= 1:
+            return None, self._ordered_map(None, run, packs)
+        
+        executor = ProcessPoolExecutor(
+            max_workers=self.offline_workers, initializer=init_worker, initargs=(self.offline_matcher(),)
+        )
+        def texts(pack):
+            return [chunk for _, chunk in pack if isinstance(chunk, str)]
+        
+        return executor, self._ordered_map(executor, match_in_worker, packs, window=self.offline_workers * 2, arg=texts)
+    
+    def _without_source(self, match: Dict) -> Dict:
+        return {key: value for key, value in match.items() if key != "source_file"}
+    
+    def aggregate_matches(self, matches: List[Dict]) -> List[Dict]:
+        """Уникальные маркеры с объединённой уверенностью и лучшими фрагментами-свидетельствами."""
+        return aggregate_matches(matches, method=self.aggregation_method, min_confidence=self.min_confidence)
     
     def apply_matches_to_tracker(self, matches: List[Dict]) -> Dict:
-        """Применяет найденные совпадения к трекеру и возвращает статистику."""
+        """Применяет найденные совпадения к трекеру и возвращает статистику.
+        
+        Ожидает результат aggregate_matches; повторы маркера всё равно
+        применяются один раз.
+        """
         results = {
             "applied": 0,
             "skipped": 0,
             "errors": 0
         }
         
+        marker_ids = []
+        seen = set()
         for match in matches:
             marker_id = match.get("matched_marker_id")
             if not marker_id:
                 results["errors"] += 1
                 continue
-            
-            # Проверим, существует ли маркер
-            if self._marker_exists(marker_id):
-                # Проверим, не отмечен ли он уже
-                if marker_id not in self.tracker.progress["completed_markers"]:
-                    success = self.tracker.mark_completed(marker_id)
-                    if success:
-                        results["applied"] += 1
-                        print(f"✅ Маркер {marker_id} отмечен как выполненный")
-                    else:
-                        results["errors"] += 1
-                else:
-                    results["skipped"] += 1
+            if marker_id in seen:
+                results["skipped"] += 1
+                continue
+            seen.add(marker_id)
+            marker_ids.append(marker_id)
+        
+        # Одно сохранение на все совпадения; при ошибке записи трекер откатывает весь пакет
+        for marker_id, status in self.tracker.mark_completed_batch(marker_ids).items():
+            if status == "completed":
+                results["applied"] += 1
+                print(f"✅ Маркер {marker_id} отмечен как выполненный")
+            elif status == "already_completed":
+                results["skipped"] += 1
             else:
                 results["errors"] += 1
         
         return results
-    
-    def _marker_exists(self, marker_id: str) -> bool:
-        """Проверяет, существует ли маркер в системе."""
-        for skill_data in self.tracker.markers.values():
-            for level_markers in skill_data.levels.values():
-                for marker in level_markers:
-                    if marker.id == marker_id:
-                        return True
-        return False
 
 
 def main():
@@ -246,13 +528,18 @@ def main():
         return
     
     print(f"\n🎯 Найдено {len(matches)} потенциальных совпадений")
+    matches = integrator.aggregate_matches(matches)
+    print(f"🧮 Уникальных маркеров с уверенностью не ниже {integrator.min_confidence:.2f}: {len(matches)}")
     
     if matches:
         print("\n📋 НАЙДЕННЫЕ СОВПАДЕНИЯ:")
         for i, match in enumerate(matches, 1):
             print(f"{i}. Маркер: {match.get('matched_marker_id', 'N/A')}")
-            print(f"   Контекст: {match.get('context_snippet', 'N/A')[:100]}...")
-            print(f"   Уверенность: {match.get('confidence', 'N/A')}")
+            print(f"   Уверенность: {match.get('confidence', 'N/A')} ({match['score']:.2f}, свидетельств: {match['count']})")
+            for snippet in match["evidence"]:
+                print(f"   Контекст: {snippet[:100]}...")
+            if match["sources"]:
+                print(f"   Файлы: {', '.join(Path(source).name for source in match['sources'][:5])}")
             print(f"   Комментарий: {match.get('comment', 'N/A')}")
             print()
         
@@ -264,6 +551,12 @@ def main():
         print(f"  - Пропущено (уже отмечены): {results['skipped']}")
         print(f"  - Ошибок: {results['errors']}")
     
+    if integrator.cache is not None:
+        stats = integrator.cache.stats()
+        print(f"\n💾 КЭШ ОТВЕТОВ: попаданий {stats['hits']}, промахов {stats['misses']} "
+              f"({stats['hit_rate']:.0%}), записей {stats['entries']}, "
+              f"{stats['size_bytes'] / 1024 / 1024:.1f} МБ, вытеснено {stats['evictions']}")
+    
     # Показать обновленный прогресс
     print("\n📊 ОБНОВЛЕННЫЙ ПРОГРЕСС:")
     tracker.show_progress()
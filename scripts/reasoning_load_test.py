@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Нагрузочный замер ReasoningIntegrator против локальной заглушки API.
+Для каждого уровня параллельности отправляет одинаковый набор фрагментов
+и сообщает пропускную способность и хвостовые задержки.
+
+Пример: python scripts/reasoning_load_test.py --chunks 200 --concurrency 1,4,16 --latency lognormal
+"""
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import List
+
+# Add the project root to the path to allow imports
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+# Кэш ответов исказил бы замер: каждый прогон должен доходить до сервера
+os.environ["REASONING_CACHE"] = "0"
+
+from reasoning_integration import ReasoningIntegrator
+from reasoning_stub_server import StubConfig, start_stub_server
+from src.core.tracker import CareerTracker
+
+
+def percentile(values: List[float], q: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(q / 100 * (len(ordered) - 1)))))
+    return ordered[index]
+
+
+def synthetic_chunks(tracker: CareerTracker, count: int) -> List[str]:
+    """Фрагменты «заметок», собранные из текста маркеров, — уникальные, чтобы не совпадать по хэшу."""
+    phrases = [
+        marker.marker
+        for skill_data in tracker.markers.values()
+        for level_markers in skill_data.levels.values()
+        for marker in level_markers
+    ] or ["Заметка"]
+    return [
+        f"Заметка {i}. {phrases[i % len(phrases)]}. {phrases[(i * 7 + 3) % len(phrases)]}."
+        for i in range(count)
+    ]
+
+
+def run_level(integrator: ReasoningIntegrator, chunks: List[str], concurrency: int) -> dict:
+    integrator.max_concurrency = concurrency
+    latencies: List[float] = []
+    lock = threading.Lock()
+    original_post = integrator.http.post
+
+    def timed_post(*args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return original_post(*args, **kwargs)
+        finally:
+            with lock:
+                latencies.append(time.perf_counter() - started)
+
+    integrator.http.post = timed_post
+    try:
+        started = time.perf_counter()
+        matches, complete = integrator._analyze_chunk_stream(chunks)
+        elapsed = time.perf_counter() - started
+    finally:
+        integrator.http.post = original_post
+
+    return {
+        "concurrency": concurrency,
+        "requests": len(latencies),
+        "elapsed": elapsed,
+        "throughput": len(latencies) / elapsed if elapsed else 0.0,
+        "p50": percentile(latencies, 50),
+        "p95": percentile(latencies, 95),
+        "p99": percentile(latencies, 99),
+        "matches": len(matches),
+        "complete": complete,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Нагрузочный замер ReasoningIntegrator')
+    parser.add_argument('--url', help='Адрес уже запущенного API; по умолчанию поднимается локальная заглушка')
+    parser.add_argument('--chunks', type=int, default=100)
+    parser.add_argument('--concurrency', default="1,2,4,8,16")
+    parser.add_argument('--latency', choices=["constant", "uniform", "lognormal"], default="lognormal")
+    parser.add_argument('--latency-ms', type=float, default=200.0)
+    parser.add_argument('--latency-spread', type=float, default=0.5)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--throttle-rate', type=float, default=0.0)
+    parser.add_argument('--retry-after', type=float, default=0.2)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    server = None
+    url = args.url
+    if url is None:
+        config = StubConfig(
+            latency=args.latency, latency_ms=args.latency_ms, latency_spread=args.latency_spread,
+            error_rate=args.error_rate, throttle_rate=args.throttle_rate,
+            retry_after=args.retry_after, seed=args.seed
+        )
+        server, url = start_stub_server(config)
+        print(f"🧪 Локальная заглушка: {url}")
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        tracker = CareerTracker(progress_file=str(Path(temp_dir) / "progress.json"))
+        integrator = ReasoningIntegrator(tracker)
+        integrator.reasoning_api_url = url
+        integrator.reasoning_api_key = integrator.reasoning_api_key or "stub"
+        chunks = synthetic_chunks(tracker, args.chunks)
+
+        print(f"📝 Фрагментов: {len(chunks)}")
+        print("-" * 78)
+        print(f"{'Поток.':>6} {'Запросов':>9} {'Время, с':>9} {'Запр./с':>9} "
+              f"{'p50, мс':>9} {'p95, мс':>9} {'p99, мс':>9} {'Совп.':>7}")
+        for concurrency in [int(level) for level in args.concurrency.split(",") if level.strip()]:
+            row = run_level(integrator, chunks, concurrency)
+            print(f"{row['concurrency']:>6} {row['requests']:>9} {row['elapsed']:>9.2f} {row['throughput']:>9.1f} "
+                  f"{row['p50'] * 1000:>9.0f} {row['p95'] * 1000:>9.0f} {row['p99'] * 1000:>9.0f} "
+                  f"{row['matches']:>7}{'' if row['complete'] else ' (есть ошибки)'}")
+
+    if server is not None:
+        print(f"\n📊 Ответы заглушки по статусам: {server.stats.snapshot()}")
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+Локальная заглушка OpenAI-совместимого API для тестов и нагрузочных замеров
+ReasoningIntegrator. Отвечает в формате chat.completions с детерминированными
+совпадениями, умеет имитировать задержки, ошибки 5xx и ответы 429.
+
+Запуск: python scripts/reasoning_stub_server.py --port 8765 --latency lognormal --latency-ms 400
+Затем: REASONING_API_URL=http://127.0.0.1:8765/v1/chat/completions REASONING_API_KEY=stub
+"""
+import argparse
+import hashlib
+import json
+import math
+import random
+import re
+import threading
+import sys
+import time
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+# Add the project root to the path to allow imports
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.utils.request_packer import PACK_SECTION_RE
+
+MARKER_LINE_RE = re.compile(r"^\s*-\s+([\w\-]+):\s*(.+)$", re.MULTILINE)
+NOTES_HEADER = "Заметки/диалоги для анализа:"
+
+
+@dataclass
+class StubConfig:
+    latency: str = "constant"      # constant | uniform | lognormal
+    latency_ms: float = 200.0      # среднее (медиана для lognormal)
+    latency_spread: float = 0.5    # разброс: доля от среднего для uniform, sigma для lognormal
+    error_rate: float = 0.0        # доля ответов 500
+    throttle_rate: float = 0.0     # доля ответов 429
+    retry_after: float = 1.0       # значение заголовка Retry-After для 429
+    max_matches: int = 2
+    seed: Optional[int] = None
+
+
+class StubStats:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.counts: Dict[int, int] = {}
+
+    def record(self, status: int) -> None:
+        with self.lock:
+            self.counts[status] = self.counts.get(status, 0) + 1
+
+    def snapshot(self) -> Dict[int, int]:
+        with self.lock:
+            return dict(self.counts)
+
+
+def canned_matches(prompt: str, max_matches: int) -> List[Dict]:
+    """Детерминированные совпадения: одинаковый промпт — одинаковый ответ.
+
+    Маркеры выбираются из перечисленных в промпте по хэшу текста каждого
+    фрагмента заметок; номер фрагмента возвращается в поле "source".
+    """
+    notes_start = prompt.find(NOTES_HEADER)
+    markers_part = prompt[:notes_start] if notes_start != -1 else prompt
+    notes = prompt[notes_start + len(NOTES_HEADER):].strip() if notes_start != -1 else ""
+    marker_ids = [marker_id for marker_id, _ in MARKER_LINE_RE.findall(markers_part)]
+    if not marker_ids or not notes:
+        return []
+
+    sections = [(int(number), text) for number, text in PACK_SECTION_RE.findall(notes)] or [(1, notes)]
+    matches = []
+    for source, text in sections:
+        matches.extend(_section_matches(source, text, marker_ids, max_matches))
+    return matches
+
+
+def _section_matches(source: int, text: str, marker_ids: List[str], max_matches: int) -> List[Dict]:
+    digest = hashlib.sha256(text.encode("utf-8")).digest()
+    count = digest[0] % (max_matches + 1)
+    matches = []
+    for i in range(count):
+        marker_id = marker_ids[digest[i + 1] % len(marker_ids)]
+        if any(match["matched_marker_id"] == marker_id for match in matches):
+            continue
+        matches.append({
+            "source": source,
+            "matched_marker_id": marker_id,
+            "context_snippet": text[:120],
+            "confidence": ("низкая", "средняя", "высокая")[digest[i + 8] % 3],
+            "comment": "Ответ локальной заглушки reasoning API",
+        })
+    return matches
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    server_version = "ReasoningStub/1.0"
+    protocol_version = "HTTP/1.1"
+    # Заголовки и тело уходят отдельными записями — без TCP_NODELAY keep-alive ловит задержку ACK
+    disable_nagle_algorithm = True
+
+    def do_POST(self):
+        config: StubConfig = self.server.config
+        rng: random.Random = self.server.rng
+        length = int(self.headers.get("Content-Length", 0))
+        body = self.rfile.read(length)
+
+        with self.server.rng_lock:
+            delay = _sample_latency(config, rng)
+            roll = rng.random()
+        time.sleep(delay)
+
+        if roll < config.throttle_rate:
+            self._reply(429, {"error": {"message": "Rate limit exceeded (stub)"}},
+                        {"Retry-After": f"{config.retry_after:g}"})
+            return
+        if roll < config.throttle_rate + config.error_rate:
+            self._reply(500, {"error": {"message": "Internal error (stub)"}})
+            return
+
+        try:
+            payload = json.loads(body)
+            prompt = payload["messages"][-1]["content"]
+        except (ValueError, KeyError, IndexError, TypeError):
+            self._reply(400, {"error": {"message": "Invalid chat.completions payload"}})
+            return
+
+        content = json.dumps(canned_matches(prompt, config.max_matches), ensure_ascii=False)
+        self._reply(200, {
+            "id": "chatcmpl-stub-" + hashlib.sha1(body).hexdigest()[:12],
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": payload.get("model", "stub"),
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": "stop",
+            }],
+            "usage": {"prompt_tokens": len(prompt) // 3, "completion_tokens": len(content) // 3},
+        })
+
+    def _reply(self, status: int, data: Dict, headers: Optional[Dict[str, str]] = None) -> None:
+        self.server.stats.record(status)
+        body = json.dumps(data, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def _sample_latency(config: StubConfig, rng: random.Random) -> float:
+    mean = config.latency_ms / 1000
+    if config.latency == "uniform":
+        spread = mean * config.latency_spread
+        return max(0.0, rng.uniform(mean - spread, mean + spread))
+    if config.latency == "lognormal":
+        return rng.lognormvariate(math.log(max(mean, 1e-6)), config.latency_spread)
+    return mean
+
+
+def start_stub_server(config: StubConfig, host: str = "127.0.0.1", port: int = 0) -> Tuple[ThreadingHTTPServer, str]:
+    """Запускает заглушку в фоновом потоке; port=0 — любой свободный порт."""
+    server = ThreadingHTTPServer((host, port), StubHandler)
+    server.daemon_threads = True
+    server.config = config
+    server.rng = random.Random(config.seed)
+    server.rng_lock = threading.Lock()
+    server.stats = StubStats()
+    thread = threading.Thread(target=server.serve_forever, name="reasoning-stub", daemon=True)
+    thread.start()
+    url = f"http://{server.server_address[0]}:{server.server_address[1]}/v1/chat/completions"
+    return server, url
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Локальная заглушка reasoning API (chat.completions)')
+    parser.add_argument('--host', default="127.0.0.1")
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency', choices=["constant", "uniform", "lognormal"], default="constant")
+    parser.add_argument('--latency-ms', type=float, default=200.0)
+    parser.add_argument('--latency-spread', type=float, default=0.5)
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Доля ответов 500')
+    parser.add_argument('--throttle-rate', type=float, default=0.0, help='Доля ответов 429')
+    parser.add_argument('--retry-after', type=float, default=1.0)
+    parser.add_argument('--seed', type=int, default=None)
+    args = parser.parse_args()
+
+    config = StubConfig(
+        latency=args.latency, latency_ms=args.latency_ms, latency_spread=args.latency_spread,
+        error_rate=args.error_rate, throttle_rate=args.throttle_rate,
+        retry_after=args.retry_after, seed=args.seed
+    )
+    server, url = start_stub_server(config, args.host, args.port)
+    print(f"🧪 Заглушка reasoning API запущена: {url}")
+    print("Нажмите Ctrl+C для остановки")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        server.shutdown()
+        print(f"\n📊 Ответы по статусам: {server.stats.snapshot()}")
+
+
+if __name__ == "__main__":
+    main()
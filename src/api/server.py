@@ -0,0 +1,340 @@
+"""
+HTTP API IT Compass на asyncio (только стандартная библиотека).
+Каталог маркеров и поисковый индекс загружаются один раз на процесс,
+трекеры пользователей берутся из общего TrackerPool; всё, что читает или
+пишет файлы прогресса либо ждёт блокировку трекера, выполняется в пуле
+потоков, чтобы не блокировать цикл событий.
+
+Запуск: python -m src.api.server --port 8080
+
+Маршруты:
+    GET  /health
+    GET  /users/{id}/progress
+    POST /users/{id}/marks              {"marker_ids": [...]} или {"marker_id": "..."}
+    GET  /users/{id}/recommendations?limit=10
+    GET  /users/{id}/portfolio          (text/markdown)
+    GET  /search?q=...&limit=10
+Методология "Объективные маркеры компетенций"
+© 2025 Ekaterina Kudelya. CC BY-ND 4.0
+"""
+import argparse
+import asyncio
+import json
+import logging
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from src.core.tracker import CareerTracker, Marker
+from src.core.tracker_pool import TrackerPool
+from src.utils.marker_index import get_marker_index
+from src.utils.portfolio_gen import PortfolioGenerator
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8080
+DEFAULT_IO_WORKERS = 8
+DEFAULT_LIMIT = 10
+MAX_LIMIT = 100
+MAX_BODY_BYTES = 1 << 20
+MAX_HEADER_LINES = 100
+MAX_BATCH_MARKERS = 500
+
+STATUS_TEXT = {
+    200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+    413: "Payload Too Large", 500: "Internal Server Error",
+}
+
+class ApiError(Exception):
+    """Ошибка запроса, которая отдаётся клиенту как JSON {"error": ...}."""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+def _marker_json(skill_name: str, marker: Marker) -> Dict[str, Any]:
+    return {
+        "id": marker.id,
+        "marker": marker.marker,
+        "skill": skill_name,
+        "priority": marker.priority,
+        "validation": marker.validation,
+    }
+
+class CompassService:
+    """Операции API поверх общего каталога и кэша трекеров пользователей."""
+
+    def __init__(self, pool: Optional[TrackerPool] = None, io_workers: int = DEFAULT_IO_WORKERS):
+        self.pool = pool if pool is not None else TrackerPool()
+        self.executor = ThreadPoolExecutor(max_workers=io_workers, thread_name_prefix="compass-io")
+        self.index = get_marker_index(self.pool.markers, self.pool.catalog_version)
+        self.portfolio_generator = PortfolioGenerator()
+
+    async def _in_thread(self, func: Callable, *args) -> Any:
+        return await asyncio.get_running_loop().run_in_executor(self.executor, func, *args)
+
+    async def tracker(self, user_id: str) -> CareerTracker:
+        # get() перечитывает изменённый файл под блокировкой трекера — только в потоке
+        return await self._in_thread(self.pool.get, user_id)
+
+    async def progress(self, user_id: str) -> Dict[str, Any]:
+        tracker = await self.tracker(user_id)
+        return await self._in_thread(self._progress_summary, tracker)
+
+    @staticmethod
+    def _progress_summary(tracker: CareerTracker) -> Dict[str, Any]:
+        with tracker.lock:
+            return tracker.progress_summary()
+
+    async def mark(self, user_id: str, marker_ids: List[str]) -> Dict[str, Any]:
+        tracker = await self.tracker(user_id)
+        results = await self._in_thread(tracker.mark_completed_batch, marker_ids)
+        return {
+            "results": results,
+            "completed": sum(1 for status in results.values() if status == "completed"),
+        }
+
+    async def recommendations(self, user_id: str, limit: int) -> Dict[str, Any]:
+        tracker = await self.tracker(user_id)
+        recommended = await self._in_thread(tracker.recommended_markers)
+        return {
+            "total": len(recommended),
+            "markers": [_marker_json(skill_name, marker) for skill_name, marker in recommended[:limit]],
+        }
+
+    def search(self, query: str, limit: int) -> Dict[str, Any]:
+        return {
+            "query": query,
+            "markers": [
+                dict(_marker_json(skill_name, marker), score=round(score, 4))
+                for skill_name, marker, score in self.index.search(query, limit)
+            ],
+        }
+
+    async def portfolio(self, user_id: str) -> str:
+        tracker = await self.tracker(user_id)
+        completed = await self._in_thread(tracker.completed_markers)
+        return self.portfolio_generator.render([
+            dict(asdict(marker), skill_name=skill_name) for skill_name, marker in completed
+        ])
+
+    def close(self) -> None:
+        self.executor.shutdown(wait=True)
+
+def _query_limit(query: Dict[str, List[str]]) -> int:
+    try:
+        limit = int(query.get("limit", [DEFAULT_LIMIT])[0])
+    except ValueError:
+        raise ApiError(400, "limit должен быть целым числом")
+    return max(1, min(limit, MAX_LIMIT))
+
+def _marker_ids(body: Any) -> List[str]:
+    if not isinstance(body, dict):
+        raise ApiError(400, "Ожидается JSON-объект")
+    marker_ids = body.get("marker_ids")
+    if marker_ids is None and "marker_id" in body:
+        marker_ids = [body["marker_id"]]
+    if not isinstance(marker_ids, list) or not all(isinstance(item, str) for item in marker_ids):
+        raise ApiError(400, "Ожидается marker_ids — список строк (или marker_id)")
+    if len(marker_ids) > MAX_BATCH_MARKERS:
+        raise ApiError(413, f"Не больше {MAX_BATCH_MARKERS} маркеров за запрос")
+    return marker_ids
+
+class CompassApp:
+    """Маршрутизация запросов к CompassService; ответ — (статус, тип содержимого, тело)."""
+
+    ROUTES = [
+        ("GET", re.compile(r"^/health$"), "health"),
+        ("GET", re.compile(r"^/search$"), "search"),
+        ("GET", re.compile(r"^/users/(?P<user_id>[\w\-]+)/progress$"), "progress"),
+        ("POST", re.compile(r"^/users/(?P<user_id>[\w\-]+)/marks$"), "marks"),
+        ("GET", re.compile(r"^/users/(?P<user_id>[\w\-]+)/recommendations$"), "recommendations"),
+        ("GET", re.compile(r"^/users/(?P<user_id>[\w\-]+)/portfolio$"), "portfolio"),
+    ]
+
+    def __init__(self, service: CompassService):
+        self.service = service
+
+    async def dispatch(self, method: str, target: str, body: bytes) -> Tuple[int, str, bytes]:
+        url = urlsplit(target)
+        query = parse_qs(url.query)
+        allowed = []
+        for route_method, pattern, name in self.ROUTES:
+            match = pattern.match(url.path)
+            if match is None:
+                continue
+            if route_method != method:
+                allowed.append(route_method)
+                continue
+            result = await getattr(self, f"_{name}")(query, body, **match.groupdict())
+            if isinstance(result, str):
+                return 200, "text/markdown; charset=utf-8", result.encode("utf-8")
+            return 200, "application/json; charset=utf-8", json.dumps(result, ensure_ascii=False).encode("utf-8")
+        if allowed:
+            raise ApiError(405, f"Метод {method} не поддерживается для {url.path}")
+        raise ApiError(404, f"Маршрут {url.path} не найден")
+
+    async def _health(self, query, body) -> Dict[str, Any]:
+        return {"status": "ok", "markers": len(self.service.index), "users_cached": len(self.service.pool)}
+
+    async def _search(self, query, body) -> Dict[str, Any]:
+        text = query.get("q", [""])[0].strip()
+        if not text:
+            raise ApiError(400, "Нужен параметр q")
+        return self.service.search(text, _query_limit(query))
+
+    async def _progress(self, query, body, user_id: str) -> Dict[str, Any]:
+        return await self.service.progress(user_id)
+
+    async def _marks(self, query, body, user_id: str) -> Dict[str, Any]:
+        try:
+            payload = json.loads(body.decode("utf-8") or "null")
+        except (UnicodeDecodeError, ValueError):
+            raise ApiError(400, "Тело запроса — не JSON")
+        return await self.service.mark(user_id, _marker_ids(payload))
+
+    async def _recommendations(self, query, body, user_id: str) -> Dict[str, Any]:
+        return await self.service.recommendations(user_id, _query_limit(query))
+
+    async def _portfolio(self, query, body, user_id: str) -> str:
+        return await self.service.portfolio(user_id)
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """HTTP/1.1 с keep-alive: запросы одного соединения обрабатываются по очереди."""
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                keep_alive = await self._handle_request(request_line, reader, writer)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def _handle_request(self, request_line: bytes, reader: asyncio.StreamReader,
+                              writer: asyncio.StreamWriter) -> bool:
+        try:
+            method, target, version = request_line.decode("latin-1").split()
+        except ValueError:
+            self._write(writer, 400, "application/json; charset=utf-8",
+                        json.dumps({"error": "Некорректная строка запроса"}).encode("utf-8"), False)
+            return False
+
+        headers: Dict[str, str] = {}
+        for _ in range(MAX_HEADER_LINES):
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        connection = headers.get("connection", "").lower()
+        keep_alive = connection != "close" if version == "HTTP/1.1" else connection == "keep-alive"
+
+        try:
+            length = int(headers.get("content-length", "0"))
+            if length < 0:
+                raise ValueError(length)
+        except ValueError:
+            self._write(writer, 400, "application/json; charset=utf-8",
+                        json.dumps({"error": "Некорректный Content-Length"}).encode("utf-8"), False)
+            return False
+        if length > MAX_BODY_BYTES:
+            self._write(writer, 413, "application/json; charset=utf-8",
+                        json.dumps({"error": "Слишком большое тело запроса"}).encode("utf-8"), False)
+            return False
+        body = await reader.readexactly(length) if length else b""
+
+        try:
+            status, content_type, payload = await self.dispatch(method.upper(), target, body)
+        except ApiError as e:
+            status, content_type = e.status, "application/json; charset=utf-8"
+            payload = json.dumps({"error": e.message}, ensure_ascii=False).encode("utf-8")
+        except Exception as e:
+            logger.exception(f"Ошибка обработки {method} {target}: {e}")
+            status, content_type = 500, "application/json; charset=utf-8"
+            payload = json.dumps({"error": "Внутренняя ошибка сервера"}, ensure_ascii=False).encode("utf-8")
+        self._write(writer, status, content_type, payload, keep_alive)
+        return keep_alive
+
+    @staticmethod
+    def _write(writer: asyncio.StreamWriter, status: int, content_type: str, payload: bytes, keep_alive: bool) -> None:
+        head = (
+            f"HTTP/1.1 {status} {STATUS_TEXT.get(status, 'Unknown')}\r\n"
+            f"Content-Type: {content_type}\r\n"
+            f"Content-Length: {len(payload)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+        )
+        writer.write(head.encode("latin-1") + payload)
+
+async def serve(app: CompassApp, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT) -> asyncio.AbstractServer:
+    return await asyncio.start_server(app.handle_connection, host, port)
+
+class ApiServerThread:
+    """Сервер в фоновом потоке со своим циклом событий — для тестов и нагрузочных замеров."""
+
+    def __init__(self, app: CompassApp, host: str = DEFAULT_HOST, port: int = 0):
+        self.app = app
+        self.loop = asyncio.new_event_loop()
+        self._ready = threading.Event()
+        self._thread = threading.Thread(target=self._run, args=(host, port), daemon=True)
+        self.server: Optional[asyncio.AbstractServer] = None
+
+    def _run(self, host: str, port: int) -> None:
+        asyncio.set_event_loop(self.loop)
+        self.server = self.loop.run_until_complete(serve(self.app, host, port))
+        self._ready.set()
+        self.loop.run_forever()
+        self.server.close()
+        self.loop.run_until_complete(self.server.wait_closed())
+        self.loop.close()
+
+    def start(self) -> str:
+        self._thread.start()
+        self._ready.wait()
+        host, port = self.server.sockets[0].getsockname()[:2]
+        return f"http://{host}:{port}"
+
+    def shutdown(self) -> None:
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join()
+
+def start_api_server(service: CompassService, host: str = DEFAULT_HOST, port: int = 0) -> Tuple[ApiServerThread, str]:
+    """Запускает API в фоновом потоке; возвращает (сервер, базовый URL)."""
+    server = ApiServerThread(CompassApp(service), host, port)
+    return server, server.start()
+
+def main():
+    parser = argparse.ArgumentParser(description='HTTP API IT Compass')
+    parser.add_argument('--host', default=DEFAULT_HOST)
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--io-workers', type=int, default=DEFAULT_IO_WORKERS, help='Потоков для файловых операций')
+    parser.add_argument('--max-users', type=int, default=64, help='Сколько трекеров держать в памяти')
+    args = parser.parse_args()
+
+    service = CompassService(TrackerPool(max_size=args.max_users), io_workers=args.io_workers)
+    app = CompassApp(service)
+
+    async def run():
+        server = await serve(app, args.host, args.port)
+        print(f"🚀 API запущено: http://{args.host}:{args.port} (маркеров: {len(service.index)})")
+        async with server:
+            await server.serve_forever()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        print("\n👋 Сервер остановлен")
+    finally:
+        service.close()
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,44 @@
-import requests
 import json
+import logging
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
 from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+
+from src.core.http_client import get_http_client
+from src.core.support_resources import SupportResourceStore, get_support_store
+from src.core.service_health import STATE_CLOSED, STATE_HALF_OPEN, STATE_OPEN, HealthRegistry, get_health_registry
+from src.utils.ttl_cache import DiskTTLCache
+
+logger = logging.getLogger(__name__)
+
+# (подключение, чтение) для одного запроса и общий срок ожидания ответа сервиса
+SERVICE_TIMEOUT = (3, 8)
+SERVICE_DEADLINE = 5.0
+# Меню поддержки интерактивное: одна повторная попытка, чтобы не заставлять ждать
+SERVICE_RETRIES = 1
+SERVICE_CACHE_FILE = PROJECT_ROOT / "src" / "data" / "cache" / "crisis_services.json"
+
+class ServiceError(Exception):
+    """Сервис недоступен или вернул ошибку."""
 
 class CrisisAPIService:
     """Класс для интеграции с API сервисов психологической помощи"""
     
-    def __init__(self):
+    def __init__(self, cache_file: Optional[str] = None, deadline: float = SERVICE_DEADLINE,
+                 health: Optional[HealthRegistry] = None, resources: Optional[SupportResourceStore] = None):
+        self.http = get_http_client()
+        self.health = health or get_health_registry()
+        self.deadline = deadline
+        self.cache = DiskTTLCache(str(cache_file or SERVICE_CACHE_FILE))
+        self.resources = resources or get_support_store()
+        self._executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="crisis-api")
+        self._inflight: Dict[str, Future] = {}
+        self._inflight_lock = threading.Lock()
         self.services = {
             "psyhelp_hotline": {
                 "name": "Психологическая помощь",
@@ -26,49 +59,146 @@ class CrisisAPIService:
         }
     
     def get_hotlines(self):
-        """Получить список горячих линий психологической помощи"""
-        try:
-            response = requests.get(self.services["psyhelp_hotline"]["api_url"], timeout=10)
-            if response.status_code == 200:
-                return response.json()
-            else:
-                return {"error": f"Ошибка API: {response.status_code}"}
-        except Exception as e:
-            return {"error": str(e)}
+        """Получить список горячих линий психологической помощи.
+        
+        Если сервис недоступен, возвращаются встроенные кризисные контакты.
+        """
+        return self._call(*self._hotlines_call())
     
     def get_meditations(self):
         """Получить список медитаций для снятия стресса"""
-        try:
-            response = requests.get(self.services["mindful_meditations"]["api_url"], timeout=10)
-            if response.status_code == 200:
-                return response.json()
-            else:
-                return {"error": f"Ошибка API: {response.status_code}"}
-        except Exception as e:
-            return {"error": str(e)}
+        return self._call(*self._meditations_call())
     
     def find_psychologists(self, city=None, specialization=None):
         """Найти психологов по городу и специализации"""
+        return self._call(*self._psychologists_call(city, specialization))
+    
+    def fetch_all(self, city=None, specialization=None) -> Dict[str, Any]:
+        """Запрашивает все сервисы параллельно с общим сроком ожидания self.deadline.
+        
+        Свежие данные из кэша отдаются без запроса, устаревшие — сразу,
+        с обновлением в фоне. Ключи результата совпадают с ключами self.services.
+        """
+        calls = {
+            "psyhelp_hotline": self._hotlines_call(),
+            "mindful_meditations": self._meditations_call(),
+            "psyhelp_find": self._psychologists_call(city, specialization),
+        }
+        started = {name: self._start(service, cache_key, request) for name, (service, cache_key, request, _) in calls.items()}
+        deadline_at = time.monotonic() + self.deadline
+        return {
+            name: self._resolve(*started[name], calls[name][3], deadline_at)
+            for name in calls
+        }
+    
+    def crisis_contacts(self) -> List[Dict]:
+        """Кризисные контакты из support/resources: доступны мгновенно и без сети."""
+        return self.resources.crisis_contacts()
+    
+    def _hotlines_call(self) -> Tuple[str, str, Callable, Callable]:
+        url = self.services["psyhelp_hotline"]["api_url"]
+        request = lambda: self.http.get(url, timeout=SERVICE_TIMEOUT, max_retries=SERVICE_RETRIES)
+        return "psyhelp_hotline", "psyhelp_hotline", request, lambda error: self.crisis_contacts()
+    
+    def _meditations_call(self) -> Tuple[str, str, Callable, Callable]:
+        url = self.services["mindful_meditations"]["api_url"]
+        request = lambda: self.http.get(url, timeout=SERVICE_TIMEOUT, max_retries=SERVICE_RETRIES)
+        return "mindful_meditations", "mindful_meditations", request, lambda error: {"error": error}
+    
+    def _psychologists_call(self, city=None, specialization=None) -> Tuple[str, str, Callable, Callable]:
+        payload = {}
+        if city:
+            payload["city"] = city
+        if specialization:
+            payload["specialization"] = specialization
+        
+        service = self.services["psyhelp_find"]
+        request = lambda: self.http.post(
+            service["api_url"],
+            json=payload,
+            headers=service["headers"],
+            timeout=SERVICE_TIMEOUT,
+            max_retries=SERVICE_RETRIES
+        )
+        cache_key = "psyhelp_find:" + json.dumps(payload, ensure_ascii=False, sort_keys=True)
+        return "psyhelp_find", cache_key, request, lambda error: {"error": error}
+    
+    def _call(self, service: str, cache_key: str, request: Callable, fallback: Callable):
+        entry, future = self._start(service, cache_key, request)
+        return self._resolve(entry, future, fallback, time.monotonic() + self.deadline)
+    
+    def _start(self, service: str, cache_key: str, request: Callable):
+        """Запись кэша и, если она не свежая, запущенное обновление.
+        
+        Если выключатель сервиса открыт, запрос не отправляется: future
+        сразу завершается ошибкой, и вызывающий получает кэш или встроенные данные.
+        """
+        entry = self.cache.get(cache_key)
+        if entry is not None and entry.fresh:
+            return entry, None
+        with self._inflight_lock:
+            in_flight = cache_key in self._inflight
+        if not in_flight and not self.health.get(service).breaker.allow():
+            future = Future()
+            future.set_exception(ServiceError(f"Сервис {self.services[service]['name']} временно недоступен"))
+            return entry, future
+        return entry, self._refresh(service, cache_key, request)
+    
+    def _resolve(self, entry, future: Optional[Future], fallback: Callable, deadline_at: float):
+        if future is None or (entry is not None and not future.done()):
+            # Stale-while-revalidate: устаревшие данные сразу, обновление продолжается в фоне
+            return entry.value
+        try:
+            return future.result(timeout=max(0.0, deadline_at - time.monotonic()))
+        except FutureTimeoutError:
+            error = f"Сервис не ответил за {self.deadline:g} с"
+        except Exception as e:
+            error = str(e)
+        if entry is not None:
+            return entry.value
+        return fallback(error)
+    
+    def _refresh(self, service: str, cache_key: str, request: Callable) -> Future:
+        """Запускает запрос в фоне; одновременные обновления одного ключа объединяются."""
+        with self._inflight_lock:
+            future = self._inflight.get(cache_key)
+            if future is not None:
+                return future
+            future = self._executor.submit(self._fetch, service, cache_key, request)
+            self._inflight[cache_key] = future
+        # Вне блокировки: для уже завершённой задачи колбэк выполняется сразу в этом потоке
+        future.add_done_callback(lambda done: self._forget(cache_key, done))
+        return future
+    
+    def _forget(self, cache_key: str, future: Future) -> None:
+        with self._inflight_lock:
+            if self._inflight.get(cache_key) is future:
+                del self._inflight[cache_key]
+    
+    def close(self, wait: bool = False) -> None:
+        """Останавливает фоновые обновления; незавершённые запросы дорабатывают сами."""
+        self._executor.shutdown(wait=wait)
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+    
+    def _fetch(self, service: str, cache_key: str, request: Callable):
+        health = self.health.get(service)
+        started = time.monotonic()
         try:
-            payload = {}
-            if city:
-                payload["city"] = city
-            if specialization:
-                payload["specialization"] = specialization
-            
-            response = requests.post(
-                self.services["psyhelp_find"]["api_url"],
-                json=payload,
-                headers=self.services["psyhelp_find"]["headers"],
-                timeout=10
-            )
-            
-            if response.status_code == 200:
-                return response.json()
-            else:
-                return {"error": f"Ошибка API: {response.status_code}"}
+            response = request()
+            if response.status_code != 200:
+                raise ServiceError(f"Ошибка API: {response.status_code}")
+            data = response.json()
         except Exception as e:
-            return {"error": str(e)}
+            health.record(time.monotonic() - started, ok=False, error=str(e))
+            raise
+        health.record(time.monotonic() - started, ok=True)
+        self.cache.put(cache_key, data)
+        return data
     
     def show_available_services(self):
         """Показать доступные сервисы"""
@@ -76,10 +206,12 @@ class CrisisAPIService:
         print("🌐 ДОСТУПНЫЕ СЕРВИСЫ ПОДДЕРЖКИ")
         print("="*50)
         
+        health = self.health.snapshot(self.services)
         for key, service in self.services.items():
             print(f"\n🔹 {service['name']}")
             print(f"   URL: {service['api_url']}")
             print(f"   Метод: {service['method']}")
+            print(f"   Состояние: {self._describe_health(health[key])}")
         
         print("\n" + "="*50)
         print("💡 Как использовать: Выберите сервис и вызовите соответствующий метод")
@@ -87,6 +219,22 @@ class CrisisAPIService:
         print("="*50)
         
         input("\nНажмите Enter, чтобы продолжить...")
+    
+    def _describe_health(self, health: Dict) -> str:
+        if health["state"] == STATE_OPEN:
+            status = f"🔴 недоступен, повторная проверка через {health['retry_in']:.0f} с (показываем сохранённые данные)"
+        elif health["state"] == STATE_HALF_OPEN:
+            status = "🟡 проверяется после сбоя"
+        elif not health["calls"]:
+            return "⚪ ещё не запрашивался"
+        else:
+            status = "🟢 доступен"
+        details = f"запросов {health['calls']}, ошибок {health['error_rate']:.0%}"
+        if health["p50"] is not None:
+            details += f", задержка p50 {health['p50'] * 1000:.0f} мс / p95 {health['p95'] * 1000:.0f} мс"
+        if health["state"] != STATE_CLOSED and health["last_error"]:
+            details += f", последняя ошибка: {health['last_error']}"
+        return f"{status} ({details})"
 
 # Пример использования
 if __name__ == "__main__":
@@ -0,0 +1,158 @@
+"""
+Версия каталога маркеров и миграция прогресса между версиями.
+Версия — хэш нормализованного набора маркеров (навык, уровень, ID, текст,
+валидация, явные предварительные условия): меняется при переименовании,
+удалении или переносе маркера.
+Таблица миграций хранит шаги переименований и удалений; прогресс,
+записанный при старой версии, переводится в текущую за один проход по ID.
+Методология "Объективные маркеры компетенций"
+© 2025 Ekaterina Kudelya. CC BY-ND 4.0
+"""
+import hashlib
+import json
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional
+
+if TYPE_CHECKING:
+    # Трекер сам импортирует этот модуль
+    from src.core.tracker import SkillData
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MIGRATIONS_FILE = "src/data/catalog_migrations.json"
+
+def catalog_version(markers: Dict[str, "SkillData"]) -> str:
+    """Хэш нормализованного каталога: не зависит от порядка файлов, навыков и маркеров."""
+    catalog = sorted(
+        (skill_name, level_key, marker.id, marker.marker.strip(), marker.validation.strip())
+        # Явные предварительные условия — тоже часть каталога; пока их нет, хэш прежний
+        + ((sorted(marker.prerequisites),) if marker.prerequisites is not None else ())
+        for skill_name, skill_data in markers.items()
+        for level_key, level_markers in skill_data.levels.items()
+        for marker in level_markers
+    )
+    payload = json.dumps(catalog, ensure_ascii=False).encode("utf-8")
+    return hashlib.sha256(payload).hexdigest()[:16]
+
+class CatalogMigrations:
+    """Упорядоченные шаги миграции ID маркеров.
+
+    Шаг: {"to": версия каталога после шага, "renamed": {старый: новый},
+    "removed": [ID]}. Для версии, с которой записан прогресс, шаги
+    сворачиваются в одно отображение старый ID -> новый ID (None — удалён),
+    которое кэшируется: миграция файла — один проход по его ID.
+    """
+
+    def __init__(self, migrations_file: Optional[str] = DEFAULT_MIGRATIONS_FILE):
+        self.migrations_file = Path(migrations_file) if migrations_file else None
+        self.steps: List[Dict] = []
+        self._mappings: Dict[Optional[str], Dict[str, Optional[str]]] = {}
+        self._lock = threading.Lock()
+        self._load()
+
+    def __len__(self) -> int:
+        return len(self.steps)
+
+    def mapping_from(self, version: Optional[str]) -> Dict[str, Optional[str]]:
+        """Свёрнутое отображение ID для прогресса, записанного при version.
+
+        Неизвестная версия (или её отсутствие — файлы до версионирования)
+        означает, что применяются все шаги.
+        """
+        with self._lock:
+            mapping = self._mappings.get(version)
+            if mapping is None:
+                mapping = _compose(self.steps[self._start_index(version):])
+                self._mappings[version] = mapping
+            return mapping
+
+    def migrate(self, marker_ids: Iterable[str], version: Optional[str]) -> List[str]:
+        """ID после миграции: переименованные заменены, удалённые и повторы убраны, порядок сохранён."""
+        mapping = self.mapping_from(version)
+        result = []
+        seen = set()
+        for marker_id in marker_ids:
+            new_id = mapping.get(marker_id, marker_id)
+            if new_id is None or new_id in seen:
+                continue
+            seen.add(new_id)
+            result.append(new_id)
+        return result
+
+    def record(self, to_version: str, renamed: Optional[Dict[str, str]] = None,
+               removed: Optional[Iterable[str]] = None) -> Dict:
+        """Добавляет шаг миграции к версии to_version и сохраняет таблицу."""
+        step = {"to": to_version, "renamed": dict(renamed or {}), "removed": sorted(set(removed or []))}
+        with self._lock:
+            self.steps.append(step)
+            self._mappings.clear()
+            self._save()
+        return step
+
+    def _start_index(self, version: Optional[str]) -> int:
+        for index in range(len(self.steps) - 1, -1, -1):
+            if self.steps[index]["to"] == version:
+                return index + 1
+        return 0
+
+    def _load(self) -> None:
+        if self.migrations_file is None or not self.migrations_file.exists():
+            return
+        try:
+            with open(self.migrations_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            steps = data["migrations"]
+            for step in steps:
+                if not isinstance(step.get("to"), str):
+                    raise ValueError("у шага нет версии to")
+                if not isinstance(step.setdefault("renamed", {}), dict):
+                    raise ValueError("renamed должен быть объектом")
+                if not isinstance(step.setdefault("removed", []), list):
+                    raise ValueError("removed должен быть списком")
+            self.steps = steps
+        except (OSError, ValueError, KeyError, TypeError, AttributeError) as e:
+            # Без таблицы прогресс молча потерял бы переименованные маркеры
+            raise ValueError(f"Повреждена таблица миграций каталога {self.migrations_file}: {e}") from e
+
+    def _save(self) -> None:
+        if self.migrations_file is None:
+            return
+        try:
+            self.migrations_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp_file = self.migrations_file.with_suffix(".tmp")
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump({"migrations": self.steps}, f, ensure_ascii=False, indent=2)
+            os.replace(tmp_file, self.migrations_file)
+        except OSError as e:
+            logger.error(f"Ошибка сохранения таблицы миграций {self.migrations_file}: {e}")
+
+def _compose(steps: List[Dict]) -> Dict[str, Optional[str]]:
+    mapping: Dict[str, Optional[str]] = {}
+    for step in steps:
+        renamed, removed = step["renamed"], set(step["removed"])
+        # Уже отображённые ID проходят через шаг дальше (цепочки a -> b -> c)
+        for old_id, new_id in mapping.items():
+            if new_id is not None:
+                new_id = renamed.get(new_id, new_id)
+                mapping[old_id] = None if new_id in removed else new_id
+        for old_id, new_id in renamed.items():
+            mapping.setdefault(old_id, None if new_id in removed else new_id)
+        for old_id in removed:
+            mapping.setdefault(old_id, None)
+    return mapping
+
+_migrations_cache: Dict[Path, CatalogMigrations] = {}
+_migrations_lock = threading.Lock()
+
+def get_catalog_migrations(migrations_file: str = DEFAULT_MIGRATIONS_FILE) -> CatalogMigrations:
+    """Одна таблица на файл в процессе: свёрнутые отображения переиспользуются всеми трекерами."""
+    key = Path(migrations_file).resolve()
+    with _migrations_lock:
+        migrations = _migrations_cache.get(key)
+        if migrations is None:
+            migrations = CatalogMigrations(str(key))
+            _migrations_cache[key] = migrations
+        return migrations
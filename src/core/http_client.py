@@ -0,0 +1,150 @@
+"""
+Общий HTTP-клиент для внешних API IT Compass.
+Пул keep-alive соединений, таймауты, повторы с экспоненциальной задержкой
+и ограничение частоты запросов на каждый endpoint.
+Методология "Объективные маркеры компетенций"
+© 2025 Ekaterina Kudelya. CC BY-ND 4.0
+"""
+import logging
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional, Tuple, Union
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+DEFAULT_TIMEOUT = (5.0, 60.0)  # (подключение, чтение)
+MAX_RETRY_AFTER = 120.0
+
+class TokenBucket:
+    """Ограничитель частоты: не более rate запросов в секунду с запасом burst."""
+
+    def __init__(self, rate: float, burst: Optional[float] = None):
+        self.rate = rate
+        self.capacity = burst if burst is not None else max(1.0, rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """Забирает один токен, при необходимости ожидая. Возвращает время ожидания."""
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return waited
+                delay = (1 - self._tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+class HttpClient:
+    """Потокобезопасная обёртка над requests.Session для всех внешних вызовов."""
+
+    def __init__(self, timeout: Union[float, Tuple[float, float]] = DEFAULT_TIMEOUT,
+                 max_retries: int = 4, backoff_base: float = 0.5, backoff_max: float = 30.0,
+                 pool_maxsize: int = 16):
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=8, pool_maxsize=pool_maxsize)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self._limiters: Dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    def set_rate_limit(self, url: str, rate: float, burst: Optional[float] = None) -> None:
+        """Ограничивает частоту запросов к endpoint (схема, хост и путь url)."""
+        with self._lock:
+            if rate > 0:
+                self._limiters[_endpoint(url)] = TokenBucket(rate, burst)
+            else:
+                self._limiters.pop(_endpoint(url), None)
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        return self.request("POST", url, **kwargs)
+
+    def request(self, method: str, url: str, max_retries: Optional[int] = None, **kwargs) -> requests.Response:
+        """Выполняет запрос с повторами на 429/5xx и сетевые ошибки.
+
+        После исчерпания попыток возвращает последний ответ (или пробрасывает
+        последнее исключение requests), чтобы вызывающий код сам решил, что делать.
+        """
+        kwargs.setdefault("timeout", self.timeout)
+        retries = self.max_retries if max_retries is None else max_retries
+        limiter = self._limiters.get(_endpoint(url))
+
+        for attempt in range(retries + 1):
+            if limiter is not None:
+                limiter.acquire()
+            try:
+                response = self.session.request(method, url, **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                if attempt >= retries:
+                    raise
+                delay = self._backoff(attempt)
+                logger.warning(f"{method} {url}: {e}; повтор через {delay:.1f} с")
+                time.sleep(delay)
+                continue
+
+            if response.status_code not in RETRY_STATUSES or attempt >= retries:
+                return response
+
+            delay = _retry_after(response)
+            if delay is None:
+                delay = self._backoff(attempt)
+            logger.warning(f"{method} {url}: HTTP {response.status_code}; повтор через {delay:.1f} с")
+            response.close()
+            time.sleep(delay)
+
+        return response
+
+    def _backoff(self, attempt: int) -> float:
+        # "Full jitter": случайная задержка до экспоненциально растущего предела
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+def _endpoint(url: str) -> str:
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}{parts.path}"
+
+def _retry_after(response: requests.Response) -> Optional[float]:
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        delay = float(value)
+    except ValueError:
+        try:
+            retry_at = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        if retry_at.tzinfo is None:
+            retry_at = retry_at.replace(tzinfo=timezone.utc)
+        delay = (retry_at - datetime.now(timezone.utc)).total_seconds()
+    return min(max(0.0, delay), MAX_RETRY_AFTER)
+
+_shared_client: Optional[HttpClient] = None
+_shared_lock = threading.Lock()
+
+def get_http_client() -> HttpClient:
+    """Общий на процесс клиент: соединения переиспользуются всеми модулями."""
+    global _shared_client
+    with _shared_lock:
+        if _shared_client is None:
+            _shared_client = HttpClient()
+        return _shared_client
@@ -1,14 +1,17 @@
-import json
-import random
-import os
+import sys
 import webbrowser
 from datetime import datetime
+from pathlib import Path
+
+# Add the project root to the path to allow imports
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.core.support_resources import get_support_store
 
 class MentalSupportSystem:
     def __init__(self):
-        self.resources_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'support', 'resources')
-        self.quotes_file = os.path.join(self.resources_path, 'motivational_quotes.json')
-        self.contacts_file = os.path.join(self.resources_path, 'crisis_contacts.json')
+        self.resources = get_support_store()
         
     def show_main_menu(self):
         """Основное меню психологической поддержки"""
@@ -27,47 +30,33 @@ class MentalSupportSystem:
     
     def show_motivational_quote(self):
         """Показать случайную мотивационную цитату"""
-        try:
-            with open(self.quotes_file, 'r', encoding='utf-8') as f:
-                quotes = json.load(f)
-            
-            quote = random.choice(quotes)
-            print(f"\n🌟 {quote['quote']}")
-            print(f"   — {quote['author']}")
-            
-            if quote['action']:
-                print(f"\n💡 Действие: {quote['action']}")
-                
-        except Exception as e:
-            print(f"❌ Ошибка загрузки цитат: {e}")
-            print("💡 Попробуйте поработать над одним маленьким шагом сегодня")
+        quote = self.resources.random_quote()
+        print(f"\n🌟 {quote['quote']}")
+        print(f"   — {quote['author']}")
+        
+        if quote['action']:
+            print(f"\n💡 Действие: {quote['action']}")
     
     def show_crisis_contacts(self):
         """Показать кризисные номера помощи"""
-        try:
-            with open(self.contacts_file, 'r', encoding='utf-8') as f:
-                contacts = json.load(f)
-            
-            print("\n" + "="*50)
-            print("🆘 ЭКСТРЕННЫЕ КОНТАКТЫ ПОМОЩИ")
-            print("="*50)
-            
-            for contact in contacts:
-                print(f"\n📍 {contact['name']}")
-                print(f"📞 {contact['phone']}")
+        # Если файл контактов недоступен, хранилище вернёт встроенные экстренные номера
+        contacts = self.resources.crisis_contacts()
+        
+        print("\n" + "="*50)
+        print("🆘 ЭКСТРЕННЫЕ КОНТАКТЫ ПОМОЩИ")
+        print("="*50)
+        
+        for contact in contacts:
+            print(f"\n📍 {contact['name']}")
+            print(f"📞 {contact['phone']}")
+            if contact['website']:
                 print(f"🌐 {contact['website']}")
+            if contact['description']:
                 print(f"ℹ️ {contact['description']}")
-            
-            print("\n" + "="*50)
-            print("❗ Если вы или кто-то рядом с вами в опасности - немедленно обратитесь за помощью")
-            print("="*50)
-            
-        except Exception as e:
-            print(f"❌ Ошибка загрузки контактов: {e}")
-            print("\n🆘 Срочные номера для России:")
-            print("   📞 112 - единая служба спасения")
-            print("   📞 8-800-333-44-34 - доверенная служба для детей и подростков")
-            print("   📞 8-800-2000-122 - детский телефон доверия")
+        
+        print("\n" + "="*50)
+        print("❗ Если вы или кто-то рядом с вами в опасности - немедленно обратитесь за помощью")
+        print("="*50)
     
     def activate_low_energy_mode(self):
         """Активировать режим 'низкой энергии'"""
@@ -89,20 +78,17 @@ class MentalSupportSystem:
     
     def show_community_guide(self):
         """Показать руководство сообщества"""
-        guide_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'support', 'community_guide.md')
+        content = self.resources.community_guide()
         
-        try:
-            with open(guide_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-            
+        if content is not None:
             print("\n" + "="*50)
             print("👥 РУКОВОДСТВО СООБЩЕСТВА IT COMPASS")
             print("="*50)
             print(content)
             print("="*50)
             
-        except Exception as e:
-            print(f"❌ Ошибка загрузки руководства: {e}")
+        else:
+            print("❌ Руководство сообщества недоступно")
             print("\n💡 Основные принципы поддержки:")
             print("1. Слушайте без осуждения")
             print("2. Предлагайте помощь, но не навязывайте")
@@ -139,62 +125,29 @@ class MentalSupportSystem:
 # Функции для интеграции в основной интерфейс
 def show_random_quote_on_startup():
     """Показать случайную цитату при запуске"""
-    try:
-        resources_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'support', 'resources')
-        quotes_file = os.path.join(resources_path, 'motivational_quotes.json')
-        
-        with open(quotes_file, 'r', encoding='utf-8') as f:
-            quotes = json.load(f)
-        
-        quote = random.choice(quotes)
-        print(f"\n{'='*60}")
-        print(f"🌟 {quote['quote']}")
-        print(f"   — {quote['author']}")
-        print(f"{'='*60}")
-        
-    except Exception as e:
-        pass  # Не показываем ошибку, чтобы не испортить пользовательский опыт
+    quote = get_support_store().random_quote()
+    print(f"\n{'='*60}")
+    print(f"🌟 {quote['quote']}")
+    print(f"   — {quote['author']}")
+    print(f"{'='*60}")
 
 def show_daily_motivation():
     """Показать ежедневную мотивацию"""
     now = datetime.now()
-    today = now.strftime("%Y-%m-%d")
-    
-    # Хэш-функция для определения цитаты на день
-    day_hash = sum(ord(c) for c in today) % 100
-    
-    try:
-        resources_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'support', 'resources')
-        quotes_file = os.path.join(resources_path, 'motivational_quotes.json')
-        
-        with open(quotes_file, 'r', encoding='utf-8') as f:
-            quotes = json.load(f)
-        
-        # Выбираем цитату, основанную на дате
-        quote = quotes[day_hash % len(quotes)]
-        print(f"\n{'='*60}")
-        print(f"🌞 УТРЕННЯЯ МОТИВАЦИЯ НА {now.strftime('%d.%m.%Y')}")
-        print(f"{'='*60}")
-        print(f"💡 {quote['quote']}")
-        print(f"   — {quote['author']}")
+    # Цитата выбирается по дате: одна и та же в течение дня
+    quote = get_support_store().daily_quote(now.date())
+    print(f"\n{'='*60}")
+    print(f"🌞 УТРЕННЯЯ МОТИВАЦИЯ НА {now.strftime('%d.%m.%Y')}")
+    print(f"{'='*60}")
+    print(f"💡 {quote['quote']}")
+    print(f"   — {quote['author']}")
+    if quote['action']:
         print(f"\n🎯 {quote['action']}")
-        print(f"{'='*60}")
-        
-    except Exception as e:
-        print(f"\n💡 Не забывай делать маленькие шаги каждый день. Они ведут к большим результатам.")
+    print(f"{'='*60}")
 
 def get_crisis_contacts():
     """Получить контакты кризисной помощи"""
-    try:
-        resources_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'support', 'resources')
-        contacts_file = os.path.join(resources_path, 'crisis_contacts.json')
-        
-        with open(contacts_file, 'r', encoding='utf-8') as f:
-            contacts = json.load(f)
-        
-        return contacts
-    except Exception as e:
-        return []
+    return get_support_store().crisis_contacts()
 
 # Интеграция с API психологических сервисов
 def integrate_crisis_api():
@@ -0,0 +1,194 @@
+"""
+Граф предварительных условий маркеров и «фронтир» доступных маркеров.
+Ребро p -> m означает, что маркер m опирается на маркер p. Условия задаются
+полем prerequisites в файлах маркеров; если поля нет, маркер уровня N
+опирается на все маркеры предыдущего уровня своего навыка.
+Граф строится один раз на версию каталога: топологический порядок и
+достижимость (множества предков как битсеты) считаются заранее, а фронтир
+пользователя обновляется инкрементально при каждой отметке.
+Методология "Объективные маркеры компетенций"
+© 2025 Ekaterina Kudelya. CC BY-ND 4.0
+"""
+import heapq
+import logging
+import threading
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional
+
+if TYPE_CHECKING:
+    # Трекер сам импортирует этот модуль
+    from src.core.tracker import SkillData
+
+logger = logging.getLogger(__name__)
+
+def level_order(level_key: str):
+    """Ключ сортировки уровней: "1", "2", ... по числу; нечисловые — после числовых."""
+    return (0, int(level_key), "") if level_key.isdigit() else (1, 0, level_key)
+
+class PrerequisiteGraph:
+    """DAG маркеров каталога.
+
+    Вершины пронумерованы в порядке каталога (навык, уровень); order —
+    топологический порядок, в котором при прочих равных сохраняется
+    порядок каталога. ancestors[i] — битсет всех маркеров, на которые
+    (прямо или транзитивно) опирается маркер i.
+    """
+
+    def __init__(self, markers: Dict[str, "SkillData"]):
+        self.ids: List[str] = []
+        self.priorities: List[str] = []
+        explicit: List[Optional[List[str]]] = []
+        implicit: List[List[int]] = []
+        for skill_data in markers.values():
+            previous_level: List[int] = []
+            for level_key in sorted(skill_data.levels, key=level_order):
+                current_level = []
+                for marker in skill_data.levels[level_key]:
+                    current_level.append(len(self.ids))
+                    self.ids.append(marker.id)
+                    self.priorities.append(marker.priority)
+                    explicit.append(marker.prerequisites)
+                    implicit.append(previous_level)
+                if current_level:
+                    previous_level = current_level
+
+        self.index: Dict[str, int] = {marker_id: i for i, marker_id in enumerate(self.ids)}
+        self.prerequisites: List[List[int]] = []
+        for i, marker_ids in enumerate(explicit):
+            if marker_ids is None:
+                self.prerequisites.append(list(implicit[i]))
+                continue
+            known = []
+            for marker_id in marker_ids:
+                if marker_id in self.index and marker_id != self.ids[i]:
+                    known.append(self.index[marker_id])
+                else:
+                    logger.warning(f"Маркер {self.ids[i]}: неизвестное предварительное условие {marker_id}")
+            self.prerequisites.append(known)
+
+        self.dependents: List[List[int]] = [[] for _ in self.ids]
+        for i, prerequisites in enumerate(self.prerequisites):
+            for p in prerequisites:
+                self.dependents[p].append(i)
+
+        self.order = self._topological_order()
+        self.position = [0] * len(self.ids)
+        for position, i in enumerate(self.order):
+            self.position[i] = position
+        self.ancestors = [0] * len(self.ids)
+        for i in self.order:
+            bits = 0
+            for p in self.prerequisites[i]:
+                bits |= self.ancestors[p] | (1 << p)
+            self.ancestors[i] = bits
+        # Маркеры, ведущие к high-priority: их стоит рекомендовать, даже если сами они не high
+        high = 0
+        for i, priority in enumerate(self.priorities):
+            if priority == "high":
+                high |= self.ancestors[i] | (1 << i)
+        self.leads_to_high = [bool(high >> i & 1) for i in range(len(self.ids))]
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def _topological_order(self) -> List[int]:
+        # Алгоритм Кана; готовые вершины берутся в порядке каталога (по номеру)
+        missing = [len(prerequisites) for prerequisites in self.prerequisites]
+        ready = [i for i, count in enumerate(missing) if count == 0]
+        heapq.heapify(ready)
+        order = []
+        while ready:
+            i = heapq.heappop(ready)
+            order.append(i)
+            for d in self.dependents[i]:
+                missing[d] -= 1
+                if missing[d] == 0:
+                    heapq.heappush(ready, d)
+        if len(order) != len(self.ids):
+            cycle = sorted(self.ids[i] for i, count in enumerate(missing) if count > 0)
+            raise ValueError(f"Цикл в предварительных условиях маркеров: {', '.join(cycle[:10])}")
+        return order
+
+    def topological_ids(self) -> List[str]:
+        return [self.ids[i] for i in self.order]
+
+    def requires(self, marker_id: str, prerequisite_id: str) -> bool:
+        """True, если marker_id прямо или транзитивно опирается на prerequisite_id."""
+        i, p = self.index.get(marker_id), self.index.get(prerequisite_id)
+        if i is None or p is None:
+            return False
+        return bool(self.ancestors[i] >> p & 1)
+
+    def all_prerequisites(self, marker_id: str) -> List[str]:
+        """Все маркеры, на которые опирается marker_id, в топологическом порядке."""
+        i = self.index.get(marker_id)
+        if i is None:
+            return []
+        bits = self.ancestors[i]
+        return [self.ids[p] for p in self.order if bits >> p & 1]
+
+class UnlockedFrontier:
+    """Невыполненные маркеры, все предварительные условия которых выполнены.
+
+    Для каждого маркера хранится число невыполненных условий; отметка о
+    выполнении или её снятие меняет счётчики только у зависимых маркеров.
+    """
+
+    def __init__(self, graph: PrerequisiteGraph, completed_ids: Iterable[str]):
+        self.graph = graph
+        self.completed = set()
+        for marker_id in completed_ids:
+            i = graph.index.get(marker_id)
+            if i is not None:
+                self.completed.add(i)
+        self.missing = [
+            sum(1 for p in prerequisites if p not in self.completed)
+            for prerequisites in graph.prerequisites
+        ]
+        self.unlocked = {
+            i for i, count in enumerate(self.missing)
+            if count == 0 and i not in self.completed
+        }
+
+    def __len__(self) -> int:
+        return len(self.unlocked)
+
+    def __contains__(self, marker_id: str) -> bool:
+        return self.graph.index.get(marker_id) in self.unlocked
+
+    def complete(self, marker_id: str) -> None:
+        i = self.graph.index.get(marker_id)
+        if i is None or i in self.completed:
+            return
+        self.completed.add(i)
+        self.unlocked.discard(i)
+        for d in self.graph.dependents[i]:
+            self.missing[d] -= 1
+            if self.missing[d] == 0 and d not in self.completed:
+                self.unlocked.add(d)
+
+    def revert(self, marker_id: str) -> None:
+        i = self.graph.index.get(marker_id)
+        if i is None or i not in self.completed:
+            return
+        self.completed.discard(i)
+        if self.missing[i] == 0:
+            self.unlocked.add(i)
+        for d in self.graph.dependents[i]:
+            self.missing[d] += 1
+            self.unlocked.discard(d)
+
+    def ids(self) -> List[str]:
+        """Доступные маркеры в топологическом порядке."""
+        return [self.graph.ids[i] for i in sorted(self.unlocked, key=self.graph.position.__getitem__)]
+
+_graph_cache: Dict[str, PrerequisiteGraph] = {}
+_graph_lock = threading.Lock()
+
+def get_prerequisite_graph(markers: Dict[str, "SkillData"], catalog_version: str) -> PrerequisiteGraph:
+    """Граф строится один раз на версию каталога и переиспользуется всеми трекерами."""
+    with _graph_lock:
+        graph = _graph_cache.get(catalog_version)
+        if graph is None:
+            graph = PrerequisiteGraph(markers)
+            _graph_cache[catalog_version] = graph
+        return graph
@@ -0,0 +1,268 @@
+"""
+Битовое представление прогресса: каждому маркеру присвоен постоянный
+порядковый номер, множество выполненных маркеров — целое число-битсет.
+Объединение, пересечение, разность и подсчёт — операции над целыми.
+Методология "Объективные маркеры компетенций"
+© 2025 Ekaterina Kudelya. CC BY-ND 4.0
+"""
+import base64
+import json
+import logging
+import os
+import threading
+from contextlib import nullcontext
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from src.core.progress_sync import progress_file_lock
+
+if TYPE_CHECKING:
+    # Трекер сам импортирует этот модуль
+    from src.core.tracker import SkillData
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_ORDINALS_FILE = "src/data/marker_ordinals.json"
+PROGRESS_FORMAT_JSON = "json"
+PROGRESS_FORMAT_BITSET = "bitset"
+PROGRESS_FORMATS = (PROGRESS_FORMAT_JSON, PROGRESS_FORMAT_BITSET)
+
+if hasattr(int, "bit_count"):
+    def _popcount(value: int) -> int:
+        return value.bit_count()
+else:  # Python < 3.10
+    def _popcount(value: int) -> int:
+        return bin(value).count("1")
+
+class MarkerOrdinals:
+    """Постоянные номера маркеров для битсетов.
+
+    Номер выдаётся один раз и не переиспользуется: новые маркеры получают
+    следующие номера, удалённые из каталога сохраняют свои. Версия растёт
+    при каждом добавлении, поэтому битсет, записанный при версии N,
+    читается любым отображением версии не ниже N.
+    """
+
+    def __init__(self, ordinals_file: Optional[str] = DEFAULT_ORDINALS_FILE):
+        self.ordinals_file = Path(ordinals_file) if ordinals_file else None
+        self.version = 0
+        self.ids: List[str] = []
+        self._ordinal_of: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._load()
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def ordinal(self, marker_id: str) -> Optional[int]:
+        return self._ordinal_of.get(marker_id)
+
+    def assign(self, marker_ids: Iterable[str]) -> bool:
+        """Выдаёт номера новым ID и сохраняет отображение; True, если оно изменилось.
+
+        Номера выдаются под блокировкой файла и после его перечитывания:
+        иначе два процесса выдали бы один номер разным маркерам.
+        """
+        marker_ids = list(dict.fromkeys(marker_ids))
+        with self._lock:
+            if all(marker_id in self._ordinal_of for marker_id in marker_ids):
+                return False
+            with self._file_lock():
+                self._load()
+                new_ids = [marker_id for marker_id in marker_ids if marker_id not in self._ordinal_of]
+                if not new_ids:
+                    return False
+                ids = self.ids + new_ids
+                # Сначала запись: номера, не попавшие в файл, не должны уйти в битсеты
+                self._save(ids, self.version + 1)
+                for ordinal, marker_id in enumerate(new_ids, start=len(self.ids)):
+                    self._ordinal_of[marker_id] = ordinal
+                self.ids = ids
+                self.version += 1
+                return True
+
+    def sync(self, markers: Dict[str, "SkillData"]) -> bool:
+        """Выдаёт номера маркерам каталога, у которых их ещё нет (по алфавиту — не зависит от порядка файлов)."""
+        return self.assign(sorted(
+            marker.id
+            for skill_data in markers.values()
+            for level_markers in skill_data.levels.values()
+            for marker in level_markers
+        ))
+
+    def skill_mask(self, skill_data: "SkillData", level: Optional[str] = None) -> "ProgressBitset":
+        """Все маркеры навыка (или одного его уровня)."""
+        levels = [skill_data.levels.get(level, [])] if level is not None else skill_data.levels.values()
+        return self.bitset(marker.id for level_markers in levels for marker in level_markers)
+
+    def bitset(self, marker_ids: Iterable[str]) -> "ProgressBitset":
+        """Битсет из ID; ID без номера получают его (чтобы ничего не терялось)."""
+        marker_ids = list(marker_ids)
+        self.assign(marker_ids)
+        bits = 0
+        for marker_id in marker_ids:
+            bits |= 1 << self._ordinal_of[marker_id]
+        return ProgressBitset(bits)
+
+    def reload(self) -> None:
+        """Перечитывает отображение из файла: номера могли выдать другие процессы."""
+        with self._lock:
+            self._load()
+
+    def _file_lock(self):
+        if self.ordinals_file is None:
+            return nullcontext()
+        # Та же блокировка-спутник .lock, что и у файлов прогресса
+        return progress_file_lock(str(self.ordinals_file))
+
+    def _load(self) -> None:
+        if self.ordinals_file is None or not self.ordinals_file.exists():
+            return
+        try:
+            with open(self.ordinals_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            ids = data["ids"]
+            if not isinstance(ids, list) or len(set(ids)) != len(ids):
+                raise ValueError("ожидается список уникальных ID")
+            version = int(data["version"])
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            # Номера нельзя выдать заново — иначе сохранённые битсеты прочтутся неверно
+            raise ValueError(f"Повреждён файл номеров маркеров {self.ordinals_file}: {e}") from e
+        if version < self.version or ids[:len(self.ids)] != self.ids:
+            raise ValueError(
+                f"Файл номеров маркеров {self.ordinals_file} (версия {version}) "
+                f"расходится с загруженным отображением (версия {self.version})"
+            )
+        self.ids = ids
+        self.version = version
+        self._ordinal_of = {marker_id: ordinal for ordinal, marker_id in enumerate(ids)}
+
+    def _save(self, ids: List[str], version: int) -> None:
+        if self.ordinals_file is None:
+            return
+        try:
+            self.ordinals_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp_file = self.ordinals_file.with_suffix(".tmp")
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump({"version": version, "ids": ids}, f, ensure_ascii=False, indent=0)
+            os.replace(tmp_file, self.ordinals_file)
+        except OSError as e:
+            logger.error(f"Ошибка сохранения номеров маркеров {self.ordinals_file}: {e}")
+            raise
+
+class ProgressBitset:
+    """Множество маркеров как целое число: бит i — маркер с номером i."""
+
+    __slots__ = ("bits",)
+
+    def __init__(self, bits: int = 0):
+        self.bits = bits
+
+    def __or__(self, other: "ProgressBitset") -> "ProgressBitset":
+        return ProgressBitset(self.bits | other.bits)
+
+    def __and__(self, other: "ProgressBitset") -> "ProgressBitset":
+        return ProgressBitset(self.bits & other.bits)
+
+    def __sub__(self, other: "ProgressBitset") -> "ProgressBitset":
+        return ProgressBitset(self.bits & ~other.bits)
+
+    def __xor__(self, other: "ProgressBitset") -> "ProgressBitset":
+        return ProgressBitset(self.bits ^ other.bits)
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, ProgressBitset) and self.bits == other.bits
+
+    def __hash__(self) -> int:
+        return hash(self.bits)
+
+    def __len__(self) -> int:
+        return _popcount(self.bits)
+
+    def __bool__(self) -> bool:
+        return self.bits != 0
+
+    def __contains__(self, ordinal: int) -> bool:
+        return bool(self.bits >> ordinal & 1)
+
+    def __repr__(self) -> str:
+        return f"ProgressBitset({len(self)} маркеров)"
+
+    def ordinals(self) -> Iterator[int]:
+        bits = self.bits
+        while bits:
+            low = bits & -bits
+            yield low.bit_length() - 1
+            bits ^= low
+
+    def ids(self, ordinals: MarkerOrdinals) -> List[str]:
+        return [ordinals.ids[ordinal] for ordinal in self.ordinals()]
+
+    def diff(self, other: "ProgressBitset") -> Tuple["ProgressBitset", "ProgressBitset"]:
+        """(добавлено, удалено) относительно other."""
+        return self - other, other - self
+
+    def encode(self) -> str:
+        """Компактная строка: base64 от байтов числа в порядке little-endian."""
+        raw = self.bits.to_bytes((self.bits.bit_length() + 7) // 8, "little")
+        return base64.b64encode(raw).decode("ascii")
+
+    @classmethod
+    def decode(cls, text: str) -> "ProgressBitset":
+        return cls(int.from_bytes(base64.b64decode(text.encode("ascii"), validate=True), "little"))
+
+_ordinals_cache: Dict[Path, MarkerOrdinals] = {}
+_ordinals_lock = threading.Lock()
+
+def get_marker_ordinals(ordinals_file: str = DEFAULT_ORDINALS_FILE) -> MarkerOrdinals:
+    """Одно отображение на файл в процессе: иначе два экземпляра могли бы выдать один номер разным маркерам."""
+    key = Path(ordinals_file).resolve()
+    with _ordinals_lock:
+        ordinals = _ordinals_cache.get(key)
+        if ordinals is None:
+            ordinals = MarkerOrdinals(str(key))
+            _ordinals_cache[key] = ordinals
+        return ordinals
+
+def union_all(bitsets: Iterable[ProgressBitset]) -> ProgressBitset:
+    bits = 0
+    for bitset in bitsets:
+        bits |= bitset.bits
+    return ProgressBitset(bits)
+
+def intersect_all(bitsets: Iterable[ProgressBitset]) -> ProgressBitset:
+    bits = None
+    for bitset in bitsets:
+        bits = bitset.bits if bits is None else bits & bitset.bits
+    return ProgressBitset(bits or 0)
+
+def progress_to_bitset(progress: Dict[str, List[str]], ordinals: MarkerOrdinals) -> Dict:
+    """Прогресс в формате JSON со списками ID -> компактный формат с битсетами.
+
+    Сохраняется множество ID (включая ID, которых нет в каталоге: им
+    выдаются номера). Порядок в списках не сохраняется: при обратном
+    преобразовании ID идут по возрастанию номера.
+    """
+    completed = ordinals.bitset(progress.get("completed_markers", []))
+    in_progress = ordinals.bitset(progress.get("in_progress_markers", []))
+    return {
+        "format": PROGRESS_FORMAT_BITSET,
+        "ordinals_version": ordinals.version,
+        "completed": completed.encode(),
+        "in_progress": in_progress.encode(),
+    }
+
+def progress_from_bitset(data: Dict, ordinals: MarkerOrdinals) -> Dict[str, List[str]]:
+    """Компактный формат -> прогресс со списками ID."""
+    if data.get("format") != PROGRESS_FORMAT_BITSET:
+        raise ValueError("Это не прогресс в битовом формате")
+    if int(data.get("ordinals_version", 0)) > ordinals.version:
+        raise ValueError(
+            f"Прогресс записан с номерами маркеров версии {data['ordinals_version']}, "
+            f"доступна версия {ordinals.version}"
+        )
+    completed = ProgressBitset.decode(data.get("completed", ""))
+    in_progress = ProgressBitset.decode(data.get("in_progress", ""))
+    if completed.bits.bit_length() > len(ordinals) or in_progress.bits.bit_length() > len(ordinals):
+        raise ValueError("В битсете есть номера, которых нет в отображении")
+    return {"completed_markers": completed.ids(ordinals), "in_progress_markers": in_progress.ids(ordinals)}
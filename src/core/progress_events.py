@@ -0,0 +1,180 @@
+"""
+История событий прогресса (начат, выполнен, отменён) с отметками времени
+и накопительные агрегаты для оценки скорости обучения.
+События дописываются в JSON Lines рядом с файлом прогресса; агрегаты
+(по неделям, навыкам и приоритетам) обновляются на каждое событие и
+хранятся вместе со смещением в журнале, поэтому историю не нужно перечитывать.
+Методология "Объективные маркеры компетенций"
+© 2025 Ekaterina Kudelya. CC BY-ND 4.0
+"""
+import json
+import logging
+import os
+import threading
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+EVENT_STARTED = "started"
+EVENT_COMPLETED = "completed"
+EVENT_REVERTED = "reverted"
+EVENTS = (EVENT_STARTED, EVENT_COMPLETED, EVENT_REVERTED)
+
+STATS_VERSION = 1
+DEFAULT_VELOCITY_WEEKS = 4
+
+def events_file_for(progress_file: str) -> Path:
+    """user_progress.json -> user_progress.events.jsonl"""
+    progress_file = Path(progress_file)
+    return progress_file.with_name(f"{progress_file.stem}.events.jsonl")
+
+def stats_file_for(events_file: Path) -> Path:
+    """user_progress.events.jsonl -> user_progress.stats.json"""
+    return events_file.with_name(events_file.name.replace(".events.jsonl", ".stats.json"))
+
+def week_key(day: date) -> str:
+    year, week, _ = day.isocalendar()
+    return f"{year}-W{week:02d}"
+
+def _empty_stats() -> Dict:
+    return {
+        "version": STATS_VERSION,
+        "offset": 0,          # сколько байт журнала уже учтено
+        "events": 0,
+        "completed": 0,       # выполнено за вычетом отмен
+        "started": 0,
+        "weekly": {},         # неделя ISO -> выполнено за вычетом отмен
+        "skills": {},
+        "priorities": {},
+        "first_event_at": None,
+        "last_event_at": None,
+    }
+
+class ProgressEventLog:
+    """Журнал событий прогресса одного профиля и его агрегаты."""
+
+    def __init__(self, events_file: str, stats_file: Optional[str] = None):
+        self.events_file = Path(events_file)
+        self.stats_file = Path(stats_file) if stats_file else stats_file_for(self.events_file)
+        self._lock = threading.Lock()
+        self.stats = self._load_stats()
+        self.refresh()
+
+    def record(self, event: str, marker_id: str, skill: Optional[str] = None, priority: Optional[str] = None,
+               level: Optional[str] = None, at: Optional[datetime] = None) -> Dict:
+        """Дописывает событие в журнал и обновляет агрегаты."""
+        if event not in EVENTS:
+            raise ValueError(f"Неизвестное событие прогресса: {event}")
+        entry = {
+            "event": event,
+            "marker_id": marker_id,
+            "skill": skill,
+            "priority": priority,
+            "level": level,
+            "at": (at or datetime.now()).isoformat(timespec="seconds"),
+        }
+        line = (json.dumps(entry, ensure_ascii=False) + "\n").encode("utf-8")
+        with self._lock:
+            # Сначала учитываем чужие записи, чтобы смещение оставалось точным
+            self._catch_up()
+            try:
+                self.events_file.parent.mkdir(parents=True, exist_ok=True)
+                with open(self.events_file, 'ab') as f:
+                    f.write(line)
+            except OSError as e:
+                logger.error(f"Ошибка записи журнала прогресса {self.events_file}: {e}")
+                return entry
+            self._apply(entry)
+            self.stats["offset"] += len(line)
+            self._save_stats()
+        return entry
+
+    def refresh(self) -> None:
+        """Учитывает события, дописанные в журнал после последнего чтения."""
+        with self._lock:
+            if self._catch_up():
+                self._save_stats()
+
+    def weekly_velocity(self, weeks: int = DEFAULT_VELOCITY_WEEKS, today: Optional[date] = None) -> float:
+        """Среднее число выполненных маркеров в неделю за последние weeks недель (включая текущую)."""
+        today = today or date.today()
+        weekly = self.stats["weekly"]
+        total = sum(weekly.get(week_key(today - timedelta(weeks=offset)), 0) for offset in range(weeks))
+        return max(0.0, total / weeks)
+
+    def eta_weeks(self, remaining: int, weeks: int = DEFAULT_VELOCITY_WEEKS,
+                  today: Optional[date] = None) -> Optional[float]:
+        """Сколько недель займут remaining маркеров при текущей скорости (None — скорость нулевая)."""
+        if remaining <= 0:
+            return 0.0
+        velocity = self.weekly_velocity(weeks, today)
+        return remaining / velocity if velocity > 0 else None
+
+    def _catch_up(self) -> bool:
+        """Применяет хвост журнала после сохранённого смещения; True, если агрегаты изменились."""
+        try:
+            size = self.events_file.stat().st_size
+        except FileNotFoundError:
+            size = 0
+        except OSError as e:
+            logger.error(f"Ошибка чтения журнала прогресса {self.events_file}: {e}")
+            return False
+        if size == self.stats["offset"]:
+            return False
+        if size < self.stats["offset"]:
+            # Журнал заменён или усечён — агрегаты пересчитываются с начала
+            logger.warning(f"Журнал прогресса {self.events_file} изменён, агрегаты пересчитываются")
+            self.stats = _empty_stats()
+        with open(self.events_file, 'rb') as f:
+            f.seek(self.stats["offset"])
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break  # незавершённая запись: учтём при следующем чтении
+                self.stats["offset"] += len(line)
+                try:
+                    self._apply(json.loads(line))
+                except (ValueError, KeyError, TypeError) as e:
+                    logger.warning(f"Пропущена повреждённая запись журнала прогресса: {e}")
+        return True
+
+    def _apply(self, entry: Dict) -> None:
+        event = entry["event"]
+        at = datetime.fromisoformat(entry["at"])
+        stats = self.stats
+        stats["events"] += 1
+        stats["first_event_at"] = stats["first_event_at"] or entry["at"]
+        stats["last_event_at"] = entry["at"]
+        if event == EVENT_STARTED:
+            stats["started"] += 1
+            return
+        delta = 1 if event == EVENT_COMPLETED else -1
+        stats["completed"] += delta
+        week = week_key(at.date())
+        stats["weekly"][week] = stats["weekly"].get(week, 0) + delta
+        for field, bucket in (("skill", "skills"), ("priority", "priorities")):
+            if entry.get(field):
+                stats[bucket][entry[field]] = stats[bucket].get(entry[field], 0) + delta
+
+    def _load_stats(self) -> Dict:
+        try:
+            with open(self.stats_file, 'r', encoding='utf-8') as f:
+                stats = json.load(f)
+            if isinstance(stats, dict) and stats.get("version") == STATS_VERSION:
+                return stats
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError) as e:
+            logger.error(f"Ошибка чтения агрегатов прогресса {self.stats_file}: {e}")
+        return _empty_stats()
+
+    def _save_stats(self) -> None:
+        try:
+            self.stats_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp_file = self.stats_file.with_suffix(".tmp")
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump(self.stats, f, ensure_ascii=False)
+            os.replace(tmp_file, self.stats_file)
+        except OSError as e:
+            logger.error(f"Ошибка сохранения агрегатов прогресса {self.stats_file}: {e}")
@@ -0,0 +1,93 @@
+"""
+Чтение файла прогресса в любом формате.
+Единственное место, где файл разбирается: битовый формат раскодируется по
+номерам маркеров, прогресс старой версии каталога мигрируется. Трекер,
+генератор портфолио и аналитика когорты читают прогресс только через него.
+Методология "Объективные маркеры компетенций"
+© 2025 Ekaterina Kudelya. CC BY-ND 4.0
+"""
+import json
+import logging
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from src.core.catalog_version import DEFAULT_MIGRATIONS_FILE, CatalogMigrations, get_catalog_migrations
+from src.core.progress_bitset import (
+    DEFAULT_ORDINALS_FILE, PROGRESS_FORMAT_BITSET, get_marker_ordinals, progress_from_bitset
+)
+
+logger = logging.getLogger(__name__)
+
+class ProgressReadError(ValueError):
+    """Файл прогресса есть, но прочитать его нельзя. Перезаписывать такой файл нельзя — прогресс потеряется."""
+
+@dataclass
+class ProgressFile:
+    progress: Dict[str, List[str]]
+    revision: int
+    stamp: Tuple[int, int, int]  # (inode, mtime_ns, размер) — по нему замечают перезапись файла
+    catalog_version: Optional[str]
+
+def read_progress_file(progress_file: str, catalog_version: Optional[str] = None,
+                       migrations: Optional[CatalogMigrations] = None,
+                       ordinals_file: str = DEFAULT_ORDINALS_FILE) -> Optional[ProgressFile]:
+    """Прогресс из файла со списками ID, приведёнными к текущему каталогу; None, если файла нет.
+
+    Прогресс, записанный при версии каталога, отличной от catalog_version,
+    переводится по таблице миграций (без catalog_version — всегда, начиная
+    с версии файла). Повреждённый или нераскодируемый файл — ProgressReadError.
+    """
+    progress_file = Path(progress_file)
+    try:
+        with open(progress_file, 'r', encoding='utf-8') as f:
+            stat = os.fstat(f.fileno())
+            stamp = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+            data = json.load(f)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        raise ProgressReadError(f"Ошибка чтения файла прогресса {progress_file}: {e}") from e
+
+    if not isinstance(data, dict):
+        raise ProgressReadError(f"Некорректная структура файла прогресса {progress_file}")
+
+    revision = data.get("revision", 0)
+    if not isinstance(revision, int):
+        logger.warning("Некорректная ревизия файла прогресса")
+        revision = 0
+
+    file_version = data.get("catalog_version")
+    if data.get("format") == PROGRESS_FORMAT_BITSET:
+        data = _decode_bitset(data, progress_file, ordinals_file)
+
+    completed = data.get("completed_markers", [])
+    in_progress = data.get("in_progress_markers", [])
+
+    if not isinstance(completed, list) or not all(isinstance(x, str) for x in completed):
+        logger.warning("Некорректные данные completed_markers")
+        completed = []
+
+    if not isinstance(in_progress, list) or not all(isinstance(x, str) for x in in_progress):
+        logger.warning("Некорректные данные in_progress_markers")
+        in_progress = []
+
+    if catalog_version is None or file_version != catalog_version:
+        migrations = migrations or get_catalog_migrations(DEFAULT_MIGRATIONS_FILE)
+        completed = migrations.migrate(completed, file_version)
+        in_progress = migrations.migrate(in_progress, file_version)
+
+    return ProgressFile(
+        {"completed_markers": completed, "in_progress_markers": in_progress}, revision, stamp, file_version
+    )
+
+def _decode_bitset(data: Dict, progress_file: Path, ordinals_file: str) -> Dict[str, List[str]]:
+    ordinals = get_marker_ordinals(ordinals_file)
+    try:
+        if int(data.get("ordinals_version", 0)) > ordinals.version:
+            # Номера новым маркерам выдал другой процесс — перечитываем отображение
+            ordinals.reload()
+        return progress_from_bitset(data, ordinals)
+    except (TypeError, ValueError) as e:
+        raise ProgressReadError(f"Не удалось раскодировать прогресс {progress_file}: {e}") from e
@@ -0,0 +1,47 @@
+"""
+Краткая сводка прогресса рядом с файлом прогресса.
+Трекер обновляет её при каждом сохранении; лёгкие режимы (режим низкой
+энергии) читают только её, не загружая каталог маркеров и трекер.
+Методология "Объективные маркеры компетенций"
+© 2025 Ekaterina Kudelya. CC BY-ND 4.0
+"""
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+SUMMARY_VERSION = 1
+
+def summary_file_for(progress_file: str) -> Path:
+    """user_progress.json -> user_progress.summary.json"""
+    progress_file = Path(progress_file)
+    return progress_file.with_name(f"{progress_file.stem}.summary.json")
+
+def write_summary(summary_file: Path, summary: Dict) -> bool:
+    try:
+        summary_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = summary_file.with_suffix(".tmp")
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump({"version": SUMMARY_VERSION, **summary}, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_file, summary_file)
+        return True
+    except OSError as e:
+        logger.error(f"Ошибка сохранения сводки прогресса {summary_file}: {e}")
+        return False
+
+def read_summary(summary_file: Path) -> Optional[Dict]:
+    """Сводка или None, если её ещё нет или она повреждена."""
+    try:
+        with open(summary_file, 'r', encoding='utf-8') as f:
+            summary = json.load(f)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        logger.error(f"Ошибка чтения сводки прогресса {summary_file}: {e}")
+        return None
+    if not isinstance(summary, dict) or summary.get("version") != SUMMARY_VERSION:
+        return None
+    return summary
@@ -0,0 +1,90 @@
+"""
+Согласованная запись прогресса из нескольких процессов.
+Писатели берут рекомендательную блокировку на файл-спутник .lock, сверяют
+ревизию файла прогресса со своей и при расхождении сливают свои изменения
+с записанными другим процессом, а не затирают их. Сам файл заменяется
+атомарно, поэтому читателям блокировка не нужна.
+Методология "Объективные маркеры компетенций"
+© 2025 Ekaterina Kudelya. CC BY-ND 4.0
+"""
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, List
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+DEFAULT_LOCK_TIMEOUT = 10.0
+LOCK_POLL_INTERVAL = 0.01
+PROGRESS_KEYS = ("completed_markers", "in_progress_markers")
+
+def lock_file_for(progress_file: str) -> Path:
+    """user_progress.json -> user_progress.lock"""
+    progress_file = Path(progress_file)
+    return progress_file.with_name(f"{progress_file.stem}.lock")
+
+def _try_lock(f) -> None:
+    if fcntl is not None:
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+    else:
+        f.seek(0)
+        msvcrt.locking(f.fileno(), msvcrt.LK_NBLCK, 1)
+
+def _unlock(f) -> None:
+    if fcntl is not None:
+        fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+    else:
+        f.seek(0)
+        msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+@contextmanager
+def progress_file_lock(progress_file: str, timeout: float = DEFAULT_LOCK_TIMEOUT) -> Iterator[None]:
+    """Монопольная блокировка записи файла прогресса (между процессами и между потоками).
+
+    Если блокировку не удалось получить за timeout секунд, выбрасывается TimeoutError.
+    """
+    lock_file = lock_file_for(progress_file)
+    lock_file.parent.mkdir(parents=True, exist_ok=True)
+    with open(lock_file, 'a+b') as f:
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                _try_lock(f)
+                break
+            except OSError:
+                if time.monotonic() >= deadline:
+                    raise TimeoutError(f"Не удалось заблокировать {lock_file} за {timeout} с")
+                time.sleep(LOCK_POLL_INTERVAL)
+        try:
+            yield
+        finally:
+            _unlock(f)
+
+def copy_progress(progress: Dict[str, List[str]]) -> Dict[str, List[str]]:
+    return {key: list(progress.get(key, [])) for key in PROGRESS_KEYS}
+
+def merge_progress(base: Dict[str, List[str]], ours: Dict[str, List[str]],
+                   theirs: Dict[str, List[str]]) -> Dict[str, List[str]]:
+    """Трёхстороннее слияние: наши изменения относительно base применяются к версии theirs.
+
+    Добавленное нами дописывается в конец, снятое нами убирается; порядок
+    берётся из theirs. Выполненный маркер не может остаться «в процессе».
+    """
+    merged = {}
+    for key in PROGRESS_KEYS:
+        base_ids, our_ids = set(base.get(key, [])), set(ours.get(key, []))
+        removed = base_ids - our_ids
+        result = [marker_id for marker_id in theirs.get(key, []) if marker_id not in removed]
+        present = set(result)
+        for marker_id in ours.get(key, []):
+            if marker_id not in base_ids and marker_id not in present:
+                result.append(marker_id)
+                present.add(marker_id)
+        merged[key] = result
+    completed = set(merged["completed_markers"])
+    merged["in_progress_markers"] = [marker_id for marker_id in merged["in_progress_markers"] if marker_id not in completed]
+    return merged
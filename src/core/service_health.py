@@ -0,0 +1,155 @@
+"""
+Состояние внешних сервисов: автоматические выключатели (circuit breaker)
+и статистика задержек и ошибок по каждому сервису.
+Методология "Объективные маркеры компетенций"
+© 2025 Ekaterina Kudelya. CC BY-ND 4.0
+"""
+import threading
+import time
+from collections import deque
+from typing import Dict, Iterable, Optional
+
+STATE_CLOSED = "closed"
+STATE_OPEN = "open"
+STATE_HALF_OPEN = "half_open"
+
+DEFAULT_FAILURE_THRESHOLD = 3
+DEFAULT_COOLDOWN = 30.0
+DEFAULT_WINDOW = 100
+
+class CircuitBreaker:
+    """Выключатель сервиса.
+
+    closed — запросы идут; после failure_threshold ошибок подряд — open:
+    запросы сразу отклоняются. Через cooldown секунд — half_open: пропускается
+    один пробный запрос; успех закрывает выключатель, ошибка снова открывает.
+    """
+
+    def __init__(self, failure_threshold: int = DEFAULT_FAILURE_THRESHOLD, cooldown: float = DEFAULT_COOLDOWN):
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.state = STATE_CLOSED
+        self.consecutive_failures = 0
+        self.opened_at: Optional[float] = None
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """Можно ли отправить запрос сейчас."""
+        with self._lock:
+            if self.state == STATE_CLOSED:
+                return True
+            if self.state == STATE_OPEN and time.monotonic() - self.opened_at >= self.cooldown:
+                self.state = STATE_HALF_OPEN
+                self._probe_in_flight = False
+            if self.state == STATE_HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return True
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.state = STATE_CLOSED
+            self.consecutive_failures = 0
+            self.opened_at = None
+            self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.consecutive_failures += 1
+            self._probe_in_flight = False
+            if self.state == STATE_HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+                self.state = STATE_OPEN
+                self.opened_at = time.monotonic()
+
+    def retry_in(self) -> float:
+        """Сколько секунд осталось до пробного запроса (0 — выключатель не открыт)."""
+        with self._lock:
+            if self.state != STATE_OPEN:
+                return 0.0
+            return max(0.0, self.cooldown - (time.monotonic() - self.opened_at))
+
+class ServiceHealth:
+    """Скользящее окно последних вызовов сервиса и его выключатель."""
+
+    def __init__(self, name: str, window: int = DEFAULT_WINDOW, breaker: Optional[CircuitBreaker] = None):
+        self.name = name
+        self.breaker = breaker or CircuitBreaker()
+        self.calls = 0
+        self.last_error: Optional[str] = None
+        self.last_success_at: Optional[float] = None
+        self._samples = deque(maxlen=window)  # (задержка в секундах, успех)
+        self._lock = threading.Lock()
+
+    def record(self, latency: float, ok: bool, error: Optional[str] = None) -> None:
+        with self._lock:
+            self.calls += 1
+            self._samples.append((latency, ok))
+            if ok:
+                self.last_success_at = time.time()
+            else:
+                self.last_error = error
+        if ok:
+            self.breaker.record_success()
+        else:
+            self.breaker.record_failure()
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            samples = list(self._samples)
+            calls, last_error, last_success_at = self.calls, self.last_error, self.last_success_at
+        latencies = sorted(latency for latency, _ in samples)
+        errors = sum(1 for _, ok in samples if not ok)
+        return {
+            "name": self.name,
+            "state": self.breaker.state,
+            "retry_in": self.breaker.retry_in(),
+            "calls": calls,
+            "error_rate": (errors / len(samples)) if samples else 0.0,
+            "p50": _percentile(latencies, 50),
+            "p95": _percentile(latencies, 95),
+            "p99": _percentile(latencies, 99),
+            "last_error": last_error,
+            "last_success_at": last_success_at,
+        }
+
+class HealthRegistry:
+    """Состояние всех сервисов, общее для экземпляров клиентов в процессе."""
+
+    def __init__(self, failure_threshold: int = DEFAULT_FAILURE_THRESHOLD,
+                 cooldown: float = DEFAULT_COOLDOWN, window: int = DEFAULT_WINDOW):
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.window = window
+        self._services: Dict[str, ServiceHealth] = {}
+        self._lock = threading.Lock()
+
+    def get(self, name: str) -> ServiceHealth:
+        with self._lock:
+            health = self._services.get(name)
+            if health is None:
+                health = ServiceHealth(name, self.window, CircuitBreaker(self.failure_threshold, self.cooldown))
+                self._services[name] = health
+            return health
+
+    def snapshot(self, names: Optional[Iterable[str]] = None) -> Dict[str, Dict]:
+        with self._lock:
+            names = list(names) if names is not None else list(self._services)
+        return {name: self.get(name).snapshot() for name in names}
+
+def _percentile(ordered: list, q: float) -> Optional[float]:
+    if not ordered:
+        return None
+    index = min(len(ordered) - 1, max(0, int(round(q / 100 * (len(ordered) - 1)))))
+    return ordered[index]
+
+_shared_registry: Optional[HealthRegistry] = None
+_shared_lock = threading.Lock()
+
+def get_health_registry() -> HealthRegistry:
+    """Общий на процесс реестр: выключатель открывается для всех пользователей сервиса."""
+    global _shared_registry
+    with _shared_lock:
+        if _shared_registry is None:
+            _shared_registry = HealthRegistry()
+        return _shared_registry
@@ -0,0 +1,134 @@
+"""
+Общее хранилище ресурсов поддержки: мотивационные цитаты, кризисные контакты
+и руководство сообщества. Каждый файл читается и проверяется один раз и
+перечитывается только после изменения (по mtime и размеру).
+Методология "Объективные маркеры компетенций"
+© 2025 Ekaterina Kudelya. CC BY-ND 4.0
+"""
+import json
+import logging
+import random
+import threading
+from datetime import date
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+SUPPORT_DIR = PROJECT_ROOT / "support"
+QUOTES_FILE = "resources/motivational_quotes.json"
+CONTACTS_FILE = "resources/crisis_contacts.json"
+COMMUNITY_GUIDE_FILE = "community_guide.md"
+
+# Показываются, даже если файл контактов недоступен
+EMERGENCY_CONTACTS = [
+    {"name": "Единая служба спасения", "phone": "112", "website": "https://112.ru",
+     "description": "Экстренная помощь в любой чрезвычайной ситуации"},
+    {"name": "Телефон доверия для взрослых", "phone": "8-800-333-44-34", "website": "https://psytel.ru",
+     "description": "Бесплатная анонимная психологическая поддержка"},
+    {"name": "Детский телефон доверия", "phone": "8-800-2000-122", "website": "https://телефондоверия.рф",
+     "description": "Психологическая помощь детям и подросткам"},
+]
+
+FALLBACK_QUOTE = {
+    "quote": "Маленькие шаги каждый день ведут к большим результатам",
+    "author": "IT Compass",
+    "action": "Сделайте сегодня один маленький шаг",
+}
+
+class SupportResourceStore:
+    """Ресурсы поддержки из каталога support/.
+
+    Разобранные и проверенные данные хранятся вместе с (mtime, размер) файла;
+    при каждом обращении выполняется только stat(). Цитаты хранятся списком,
+    поэтому случайная и «цитата дня» выбираются за O(1).
+    """
+
+    def __init__(self, support_dir: Optional[str] = None):
+        self.support_dir = Path(support_dir) if support_dir else SUPPORT_DIR
+        self._entries: Dict[str, Tuple[Tuple[int, int], Any]] = {}
+        self._lock = threading.Lock()
+
+    def quotes(self) -> List[Dict]:
+        return self._resource(QUOTES_FILE, _parse_quotes) or [FALLBACK_QUOTE]
+
+    def random_quote(self) -> Dict:
+        return random.choice(self.quotes())
+
+    def daily_quote(self, day: Optional[date] = None) -> Dict:
+        """Цитата дня: одна и та же в течение дня."""
+        quotes = self.quotes()
+        return quotes[(day or date.today()).toordinal() % len(quotes)]
+
+    def crisis_contacts(self) -> List[Dict]:
+        return self._resource(CONTACTS_FILE, _parse_contacts) or EMERGENCY_CONTACTS
+
+    def community_guide(self) -> Optional[str]:
+        return self._resource(COMMUNITY_GUIDE_FILE, lambda path: path.read_text(encoding='utf-8'))
+
+    def _resource(self, name: str, parse: Callable[[Path], Any]) -> Any:
+        """Данные файла; None, если файл недоступен или не прошёл проверку."""
+        path = self.support_dir / name
+        try:
+            stat = path.stat()
+        except OSError as e:
+            logger.error(f"Ресурс поддержки недоступен {path}: {e}")
+            return None
+        signature = (stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            cached = self._entries.get(name)
+            if cached is not None and cached[0] == signature:
+                return cached[1]
+            try:
+                value = parse(path)
+            except (OSError, ValueError) as e:
+                logger.error(f"Ошибка загрузки ресурса поддержки {path}: {e}")
+                value = None
+            self._entries[name] = (signature, value)
+            return value
+
+def _load_list(path: Path) -> List:
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    if not isinstance(data, list):
+        raise ValueError("ожидается список")
+    return data
+
+def _parse_quotes(path: Path) -> List[Dict]:
+    quotes = []
+    for item in _load_list(path):
+        if not isinstance(item, dict) or not str(item.get("quote") or "").strip():
+            logger.warning(f"Пропущена некорректная цитата в {path}: {item!r}")
+            continue
+        quotes.append({
+            "quote": item["quote"],
+            "author": item.get("author") or "Неизвестный",
+            "action": item.get("action") or "",
+        })
+    return quotes
+
+def _parse_contacts(path: Path) -> List[Dict]:
+    contacts = []
+    for item in _load_list(path):
+        if not isinstance(item, dict) or not item.get("name") or not item.get("phone"):
+            logger.warning(f"Пропущен некорректный контакт в {path}: {item!r}")
+            continue
+        contacts.append({
+            "name": item["name"],
+            "phone": item["phone"],
+            "website": item.get("website") or "",
+            "description": item.get("description") or "",
+        })
+    return contacts
+
+_shared_store: Optional[SupportResourceStore] = None
+_shared_lock = threading.Lock()
+
+def get_support_store() -> SupportResourceStore:
+    """Общее на процесс хранилище ресурсов поддержки."""
+    global _shared_store
+    with _shared_lock:
+        if _shared_store is None:
+            _shared_store = SupportResourceStore()
+        return _shared_store
@@ -5,10 +5,28 @@
 """
 import json
 import logging
+import os
+import threading
+from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from typing import Dict, Iterable, List, Optional, Any, Tuple
 from dataclasses import dataclass
 
+from src.core.progress_file import ProgressFile, ProgressReadError, read_progress_file
+from src.core.progress_events import (
+    DEFAULT_VELOCITY_WEEKS, EVENT_COMPLETED, EVENT_REVERTED, EVENT_STARTED, ProgressEventLog, events_file_for
+)
+from src.core.progress_bitset import (
+    DEFAULT_ORDINALS_FILE, PROGRESS_FORMAT_BITSET, PROGRESS_FORMAT_JSON, PROGRESS_FORMATS,
+    MarkerOrdinals, ProgressBitset, get_marker_ordinals, progress_to_bitset
+)
+from src.core.catalog_version import (
+    DEFAULT_MIGRATIONS_FILE, catalog_version as compute_catalog_version, get_catalog_migrations
+)
+from src.core.prerequisites import PrerequisiteGraph, UnlockedFrontier, get_prerequisite_graph, level_order
+from src.core.progress_summary import read_summary, summary_file_for, write_summary
+from src.core.progress_sync import copy_progress, merge_progress, progress_file_lock
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
@@ -23,6 +41,8 @@ class Marker:
     skill_name: Optional[str] = None
     methodology_author: str = "Ekaterina Kudelya"
     methodology_license: str = "CC BY-ND 4.0"
+    # None — условия не заданы (маркер опирается на предыдущий уровень навыка), [] — без условий
+    prerequisites: Optional[List[str]] = None
 
 @dataclass
 class SkillData:
@@ -30,114 +50,300 @@ class SkillData:
     description: str
     levels: Dict[str, List[Marker]]
 
+def load_markers(markers_dir: Path) -> Dict[str, SkillData]:
+    """Загружает каталог маркеров из директории с JSON-файлами навыков.
+    
+    Каталог не меняется во время работы, поэтому его можно разделять
+    между несколькими трекерами.
+    """
+    markers_dir = Path(markers_dir)
+    if not markers_dir.exists():
+        logger.warning(f"Директория маркеров не найдена: {markers_dir}")
+        return {}
+    
+    markers = {}
+    try:
+        for file_path in markers_dir.glob("*.json"):
+            try:
+                with open(file_path, 'r', encoding='utf-8') as f:
+                    skill_data_raw = json.load(f)
+                
+                skill_name = skill_data_raw.get("skill_name", file_path.stem.capitalize())
+                levels = _parse_skill_levels(skill_data_raw.get("levels", {}))
+                
+                markers[skill_name] = SkillData(
+                    skill_name=skill_name,
+                    description=skill_data_raw.get("description", ""),
+                    levels=levels
+                )
+                logger.info(f"Загружен навык: {skill_name}")
+                
+            except json.JSONDecodeError as e:
+                logger.error(f"Ошибка парсинга JSON в файле {file_path}: {e}")
+            except Exception as e:
+                logger.error(f"Неожиданная ошибка при загрузке {file_path}: {e}")
+                
+    except Exception as e:
+        logger.error(f"Критическая ошибка при загрузке маркеров: {e}")
+        
+    return markers
+
+def _parse_prerequisites(marker_data: Dict[str, Any]) -> Optional[List[str]]:
+    prerequisites = marker_data.get("prerequisites")
+    if prerequisites is None:
+        return None
+    if not isinstance(prerequisites, list) or not all(isinstance(x, str) for x in prerequisites):
+        logger.warning(f"Некорректные prerequisites в маркере {marker_data.get('id')}: ожидается список ID")
+        return None
+    return prerequisites
+
+def _parse_skill_levels(levels_data: Dict[str, Any]) -> Dict[str, List[Marker]]:
+    levels = {}
+    for level_key, markers_list in levels_data.items():
+        levels[level_key] = []
+        for marker_data in markers_list:
+            try:
+                marker = Marker(
+                    id=marker_data["id"],
+                    marker=marker_data["marker"],
+                    validation=marker_data.get("validation", ""),
+                    priority=marker_data.get("priority", "medium"),
+                    resources=marker_data.get("resources", []),
+                    smart_criteria=marker_data.get("smart_criteria", {}),
+                    skill_name=marker_data.get("skill_name"),
+                    methodology_author=marker_data.get("methodology_author", "Ekaterina Kudelya"),
+                    methodology_license=marker_data.get("methodology_license", "CC BY-ND 4.0"),
+                    prerequisites=_parse_prerequisites(marker_data)
+                )
+                levels[level_key].append(marker)
+            except KeyError as e:
+                logger.warning(f"Отсутствует ключ {e} в маркере: {marker_data}")
+                continue
+    return levels
+
 class CareerTracker:
-    def __init__(self, markers_dir: str = "src/data/markers", progress_file: str = "src/data/user_progress.json"):
+    def __init__(self, markers_dir: str = "src/data/markers", progress_file: str = "src/data/user_progress.json",
+                 markers: Optional[Dict[str, SkillData]] = None,
+                 progress_format: str = PROGRESS_FORMAT_JSON, ordinals_file: str = DEFAULT_ORDINALS_FILE,
+                 catalog_version: Optional[str] = None, migrations_file: str = DEFAULT_MIGRATIONS_FILE):
+        if progress_format not in PROGRESS_FORMATS:
+            raise ValueError(f"Неизвестный формат прогресса: {progress_format}")
         self.markers_dir = Path(markers_dir)
         self.progress_file = Path(progress_file)
+        # Формат записи; читаются оба формата независимо от настройки
+        self.progress_format = progress_format
+        self.ordinals_file = ordinals_file
+        self._ordinals: Optional[MarkerOrdinals] = None
         self._markers_cache: Optional[Dict[str, SkillData]] = None
         self._all_markers_cache: Optional[Dict[str, Marker]] = None
-        self.markers = self._load_all_markers()
+        self._marker_lookup: Optional[Dict[str, Tuple[str, str, Marker]]] = None
+        self._frontier: Optional[UnlockedFrontier] = None
+        # Уже загруженный каталог можно передать извне, чтобы не читать его повторно
+        self.markers = markers if markers is not None else self._load_all_markers()
+        # Версия каталога записывается в файл прогресса; прогресс старых версий мигрируется при чтении
+        self.catalog_version = catalog_version or compute_catalog_version(self.markers)
+        self.migrations = get_catalog_migrations(migrations_file)
         self.progress = self._load_progress()
+        # Сводка для лёгких режимов: последнее достижение хранится только в ней
+        self.summary_file = summary_file_for(self.progress_file)
+        self._last_completed = (read_summary(self.summary_file) or {}).get("last_completed")
+        # Журнал событий с отметками времени и накопительными агрегатами для скорости и прогноза
+        self.events = ProgressEventLog(str(events_file_for(self.progress_file)))
+        # Один трекер профиля может использоваться несколькими потоками (сессии веб-интерфейса)
+        self.lock = threading.RLock()
     
     def _load_all_markers(self) -> Dict[str, SkillData]:
-        if not self.markers_dir.exists():
-            logger.warning(f"Директория маркеров не найдена: {self.markers_dir}")
-            return {}
-        
-        markers = {}
-        try:
-            for file_path in self.markers_dir.glob("*.json"):
-                try:
-                    with open(file_path, 'r', encoding='utf-8') as f:
-                        skill_data_raw = json.load(f)
-                    
-                    skill_name = skill_data_raw.get("skill_name", file_path.stem.capitalize())
-                    levels = self._parse_skill_levels(skill_data_raw.get("levels", {}))
-                    
-                    markers[skill_name] = SkillData(
-                        skill_name=skill_name,
-                        description=skill_data_raw.get("description", ""),
-                        levels=levels
-                    )
-                    logger.info(f"Загружен навык: {skill_name}")
-                    
-                except json.JSONDecodeError as e:
-                    logger.error(f"Ошибка парсинга JSON в файле {file_path}: {e}")
-                except Exception as e:
-                    logger.error(f"Неожиданная ошибка при загрузке {file_path}: {e}")
-                    
-        except Exception as e:
-            logger.error(f"Критическая ошибка при загрузке маркеров: {e}")
-            
-        return markers
+        return load_markers(self.markers_dir)
     
     def _parse_skill_levels(self, levels_data: Dict[str, Any]) -> Dict[str, List[Marker]]:
-        levels = {}
-        for level_key, markers_list in levels_data.items():
-            levels[level_key] = []
-            for marker_data in markers_list:
-                try:
-                    marker = Marker(
-                        id=marker_data["id"],
-                        marker=marker_data["marker"],
-                        validation=marker_data.get("validation", ""),
-                        priority=marker_data.get("priority", "medium"),
-                        resources=marker_data.get("resources", []),
-                        smart_criteria=marker_data.get("smart_criteria", {}),
-                        skill_name=marker_data.get("skill_name"),
-                        methodology_author=marker_data.get("methodology_author", "Ekaterina Kudelya"),
-                        methodology_license=marker_data.get("methodology_license", "CC BY-ND 4.0")
-                    )
-                    levels[level_key].append(marker)
-                except KeyError as e:
-                    logger.warning(f"Отсутствует ключ {e} в маркере: {marker_data}")
-                    continue
-        return levels
+        return _parse_skill_levels(levels_data)
     
     def _load_progress(self) -> Dict[str, List[str]]:
-        if not self.progress_file.exists():
-            logger.info("Файл прогресса не найден, создаётся новый")
-            return {"completed_markers": [], "in_progress_markers": []}
-        
+        self._revision, self._file_stamp, self._file_catalog_version = 0, None, None
+        progress = {"completed_markers": [], "in_progress_markers": []}
         try:
-            with open(self.progress_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-            
-            if not isinstance(data, dict):
-                logger.warning("Некорректная структура файла прогресса")
-                return {"completed_markers": [], "in_progress_markers": []}
-            
-            completed = data.get("completed_markers", [])
-            in_progress = data.get("in_progress_markers", [])
-            
-            if not isinstance(completed, list) or not all(isinstance(x, str) for x in completed):
-                logger.warning("Некорректные данные completed_markers")
-                completed = []
-                
-            if not isinstance(in_progress, list) or not all(isinstance(x, str) for x in in_progress):
-                logger.warning("Некорректные данные in_progress_markers")
-                in_progress = []
-            
-            logger.info(f"Загружен прогресс: {len(completed)} выполнено, {len(in_progress)} в процессе")
-            return {"completed_markers": completed, "in_progress_markers": in_progress}
-            
-        except json.JSONDecodeError as e:
-            logger.error(f"Ошибка парсинга файла прогресса: {e}")
-            return {"completed_markers": [], "in_progress_markers": []}
-        except Exception as e:
-            logger.error(f"Неожиданная ошибка при загрузке прогресса: {e}")
-            return {"completed_markers": [], "in_progress_markers": []}
+            loaded = self._read_progress_file()
+        except ProgressReadError as e:
+            # Сохранение откажет, пока файл не станет читаемым: пустой прогресс не затрёт его
+            logger.error(f"{e}; файл не будет перезаписан")
+            loaded = None
+        if loaded is None:
+            if not self.progress_file.exists():
+                logger.info("Файл прогресса не найден, создаётся новый")
+        else:
+            progress = loaded.progress
+            self._revision, self._file_stamp, self._file_catalog_version = loaded.revision, loaded.stamp, loaded.catalog_version
+            logger.info(
+                f"Загружен прогресс: {len(progress['completed_markers'])} выполнено, "
+                f"{len(progress['in_progress_markers'])} в процессе"
+            )
+        unknown = [
+            marker_id for key in ("completed_markers", "in_progress_markers")
+            for marker_id in progress[key] if self._find_marker(marker_id) is None
+        ]
+        if unknown:
+            logger.warning(
+                f"В прогрессе {len(unknown)} ID, которых нет в каталоге и в таблице миграций: {', '.join(unknown[:5])}"
+            )
+        # Состояние файла при последней синхронизации — база для слияния при конфликте
+        self._base_progress = copy_progress(progress)
+        return progress
     
-    def _save_progress(self) -> bool:
+    def _read_progress_file(self) -> Optional[ProgressFile]:
+        """Файл прогресса, приведённый к текущей версии каталога; None, если файла нет.
+        
+        Нечитаемый файл — ProgressReadError: такой файл нельзя перезаписывать.
+        """
+        return read_progress_file(self.progress_file, self.catalog_version, self.migrations, self.ordinals_file)
+    
+    def _file_changed(self) -> bool:
         try:
-            self.progress_file.parent.mkdir(parents=True, exist_ok=True)
-            with open(self.progress_file, 'w', encoding='utf-8') as f:
-                json.dump(self.progress, f, ensure_ascii=False, indent=2)
-            logger.info("Прогресс успешно сохранён")
+            stat = self.progress_file.stat()
+        except FileNotFoundError:
+            return self._file_stamp is not None
+        except OSError:
             return True
-        except Exception as e:
-            logger.error(f"Ошибка сохранения прогресса: {e}")
+        return (stat.st_ino, stat.st_mtime_ns, stat.st_size) != self._file_stamp
+    
+    def _sync_with_file(self) -> bool:
+        """Подтягивает запись другого процесса, сохраняя несохранённые локальные изменения. True, если прогресс изменился.
+        
+        Нечитаемый файл — ProgressReadError: слить с ним нечего, и записывать поверх него нельзя.
+        """
+        loaded = self._read_progress_file()
+        if loaded is None:
+            progress, revision, stamp, file_version = {"completed_markers": [], "in_progress_markers": []}, 0, None, None
+        else:
+            progress, revision, stamp, file_version = loaded.progress, loaded.revision, loaded.stamp, loaded.catalog_version
+        self._file_stamp = stamp
+        if revision == self._revision and stamp is not None:
             return False
+        merged = merge_progress(self._base_progress, self.progress, progress)
+        changed = merged != self.progress
+        self.progress = merged
+        self._revision = revision
+        self._file_catalog_version = file_version
+        self._base_progress = copy_progress(progress)
+        if changed:
+            self._frontier = None
+            logger.info(f"Прогресс обновлён из файла (ревизия {revision})")
+        return changed
+    
+    def refresh(self) -> bool:
+        """Перечитывает прогресс, если файл изменил другой процесс.
+        
+        Обычно это один stat(): файл читается, только если изменились его
+        inode (файл заменяется атомарно), время или размер. Возвращает True, если прогресс в памяти изменился.
+        """
+        with self.lock:
+            if not self._file_changed():
+                return False
+            try:
+                changed = self._sync_with_file()
+            except ProgressReadError as e:
+                logger.error(str(e))
+                return False
+            if changed:
+                self._last_completed = (read_summary(self.summary_file) or {}).get("last_completed", self._last_completed)
+            return changed
+    
+    def _save_progress(self) -> bool:
+        """Сохраняет прогресс под блокировкой файла.
+        
+        Если с последней синхронизации файл записал другой процесс (ревизия
+        не совпадает), наши изменения сливаются с его версией, а не затирают её.
+        При ошибке состояние синхронизации возвращается к прежнему: иначе
+        после отката изменений вызывающим следующее сохранение сочло бы
+        версию другого процесса уже учтённой и затёрло бы её.
+        """
+        with self.lock:
+            synced = (self._base_progress, self._revision, self._file_stamp, self._file_catalog_version)
+            try:
+                self.progress_file.parent.mkdir(parents=True, exist_ok=True)
+                with progress_file_lock(self.progress_file):
+                    # Под блокировкой ревизия сверяется всегда: stat() мог не заметить быструю перезапись
+                    self._sync_with_file()
+                    revision = self._revision + 1
+                    if self.progress_format == PROGRESS_FORMAT_BITSET:
+                        data = progress_to_bitset(self.progress, self.ordinals)
+                    else:
+                        data = dict(self.progress)
+                    data["revision"] = revision
+                    data["catalog_version"] = self.catalog_version
+                    tmp_file = self.progress_file.with_suffix(".tmp")
+                    with open(tmp_file, 'w', encoding='utf-8') as f:
+                        json.dump(data, f, ensure_ascii=False, indent=2)
+                    os.replace(tmp_file, self.progress_file)
+                    stat = self.progress_file.stat()
+                    self._file_stamp = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+                    self._revision = revision
+                    self._file_catalog_version = self.catalog_version
+                    self._base_progress = copy_progress(self.progress)
+                    write_summary(self.summary_file, self.progress_summary())
+                logger.info("Прогресс успешно сохранён")
+                return True
+            except Exception as e:
+                logger.error(f"Ошибка сохранения прогресса: {e}")
+                self._base_progress, self._revision, self._file_stamp, self._file_catalog_version = synced
+                return False
+    
+    def upgrade_progress_file(self) -> bool:
+        """Перезаписывает файл прогресса, записанный при другой версии каталога; True, если файл обновлён."""
+        with self.lock:
+            if self._file_stamp is None or self._file_catalog_version == self.catalog_version:
+                return False
+            return self._save_progress()
+    
+    @property
+    def ordinals(self) -> MarkerOrdinals:
+        """Постоянные номера маркеров (общие на процесс), дополненные маркерами каталога."""
+        if self._ordinals is None:
+            ordinals = get_marker_ordinals(self.ordinals_file)
+            ordinals.sync(self.markers)
+            self._ordinals = ordinals
+        return self._ordinals
+    
+    def completed_bitset(self) -> ProgressBitset:
+        with self.lock:
+            return self.ordinals.bitset(self.progress["completed_markers"])
+    
+    def remaining_in_skill(self, skill_name: str, level: Optional[str] = None) -> List[str]:
+        """Невыполненные маркеры навыка (или уровня) — разность битсетов."""
+        skill_data = self.markers.get(skill_name)
+        if skill_data is None:
+            return []
+        return (self.ordinals.skill_mask(skill_data, level) - self.completed_bitset()).ids(self.ordinals)
+    
+    def progress_summary(self) -> Dict[str, Any]:
+        """Итоги, проценты по навыкам и последнее достижение — то, что пишется в сводку."""
+        completed_ids = set(self.progress["completed_markers"])
+        skills = {}
+        total_completed = 0
+        total_markers = 0
+        for skill_name, skill_data in self.markers.items():
+            skill_total = sum(len(level_markers) for level_markers in skill_data.levels.values())
+            if skill_total == 0:
+                continue
+            completed_count = sum(
+                1 for level_markers in skill_data.levels.values() for marker in level_markers
+                if marker.id in completed_ids
+            )
+            skills[skill_name] = {
+                "completed": completed_count,
+                "total": skill_total,
+                "percentage": round(completed_count / skill_total * 100, 1),
+            }
+            total_completed += completed_count
+            total_markers += skill_total
+        
+        return {
+            "completed": total_completed,
+            "total": total_markers,
+            "percentage": round(total_completed / total_markers * 100, 1) if total_markers else 0.0,
+            "in_progress": len(self.progress["in_progress_markers"]),
+            "skills": skills,
+            "last_completed": self._last_completed,
+        }
     
     def show_progress(self) -> None:
         print("\n📊 ВАШ ПРОГРЕСС:")
@@ -186,44 +392,216 @@ class CareerTracker:
             print("❌ ID маркера не может быть пустым")
             return False
         
-        if marker_id in self.progress["completed_markers"]:
-            print(f"ℹ️ Маркер {marker_id} уже отмечен как выполненный")
-            return True
-        
-        if not self._marker_exists(marker_id):
-            print(f"❌ Маркер {marker_id} не найден.")
-            return False
-        
-        self.progress["completed_markers"].append(marker_id)
-        
-        if marker_id in self.progress["in_progress_markers"]:
-            self.progress["in_progress_markers"].remove(marker_id)
+        with self.lock:
+            if marker_id in self.progress["completed_markers"]:
+                print(f"ℹ️ Маркер {marker_id} уже отмечен как выполненный")
+                return True
+            
+            found = self._find_marker(marker_id)
+            if found is None:
+                print(f"❌ Маркер {marker_id} не найден.")
+                return False
+            
+            self.progress["completed_markers"].append(marker_id)
+            skill_name, level_key, marker = found
+            self._last_completed = {
+                "id": marker_id,
+                "marker": marker.marker,
+                "skill": skill_name,
+                "completed_at": datetime.now().isoformat(timespec="seconds"),
+            }
+            
+            if marker_id in self.progress["in_progress_markers"]:
+                self.progress["in_progress_markers"].remove(marker_id)
+            
+            if self._save_progress():
+                self._record_event(EVENT_COMPLETED, marker_id)
+                if self._frontier is not None:
+                    self._frontier.complete(marker_id)
+                print(f"✅ Маркер {marker_id} отмечен как выполненный! 🎉")
+                return True
+            else:
+                print(f"❌ Ошибка при сохранении прогресса")
+                return False
+    
+    def mark_completed_batch(self, marker_ids: Iterable[str]) -> Dict[str, str]:
+        """Отмечает несколько маркеров одним сохранением, без вывода в консоль.
         
-        if self._save_progress():
-            print(f"✅ Маркер {marker_id} отмечен как выполненный! 🎉")
+        Статус для каждого ID: completed, already_completed, not_found или
+        error (прогресс не удалось сохранить — изменения отменены).
+        """
+        results: Dict[str, str] = {}
+        newly_completed = []
+        with self.lock:
+            previous = {key: list(value) for key, value in self.progress.items()}
+            previous_last = self._last_completed
+            completed_ids = set(self.progress["completed_markers"])
+            for marker_id in marker_ids:
+                marker_id = marker_id.strip()
+                if marker_id in results:
+                    continue
+                if marker_id in completed_ids:
+                    results[marker_id] = "already_completed"
+                    continue
+                found = self._find_marker(marker_id)
+                if found is None:
+                    results[marker_id] = "not_found"
+                    continue
+                self.progress["completed_markers"].append(marker_id)
+                completed_ids.add(marker_id)
+                if marker_id in self.progress["in_progress_markers"]:
+                    self.progress["in_progress_markers"].remove(marker_id)
+                results[marker_id] = "completed"
+                newly_completed.append(found)
+            
+            if not newly_completed:
+                return results
+            skill_name, _, marker = newly_completed[-1]
+            self._last_completed = {
+                "id": marker.id,
+                "marker": marker.marker,
+                "skill": skill_name,
+                "completed_at": datetime.now().isoformat(timespec="seconds"),
+            }
+            if not self._save_progress():
+                self.progress = previous
+                self._last_completed = previous_last
+                return {marker_id: "error" if status == "completed" else status for marker_id, status in results.items()}
+            for _, _, marker in newly_completed:
+                self._record_event(EVENT_COMPLETED, marker.id)
+                if self._frontier is not None:
+                    self._frontier.complete(marker.id)
+        return results
+    
+    def mark_started(self, marker_id: str) -> bool:
+        """Отмечает маркер как начатый (в процессе)."""
+        marker_id = marker_id.strip()
+        with self.lock:
+            found = self._find_marker(marker_id)
+            if found is None:
+                print(f"❌ Маркер {marker_id} не найден.")
+                return False
+            if marker_id in self.progress["completed_markers"] or marker_id in self.progress["in_progress_markers"]:
+                return True
+            
+            self.progress["in_progress_markers"].append(marker_id)
+            if not self._save_progress():
+                return False
+            self._record_event(EVENT_STARTED, marker_id)
             return True
-        else:
-            print(f"❌ Ошибка при сохранении прогресса")
-            return False
+    
+    def revert_completed(self, marker_id: str) -> bool:
+        """Снимает отметку о выполнении маркера."""
+        marker_id = marker_id.strip()
+        with self.lock:
+            if marker_id not in self.progress["completed_markers"]:
+                print(f"ℹ️ Маркер {marker_id} не отмечен как выполненный")
+                return False
+            
+            self.progress["completed_markers"].remove(marker_id)
+            if self._last_completed and self._last_completed.get("id") == marker_id:
+                self._last_completed = None
+            if not self._save_progress():
+                return False
+            self._record_event(EVENT_REVERTED, marker_id)
+            if self._frontier is not None:
+                self._frontier.revert(marker_id)
+            print(f"↩️ Отметка о выполнении маркера {marker_id} снята")
+            return True
+    
+    def _record_event(self, event: str, marker_id: str) -> None:
+        found = self._find_marker(marker_id)
+        if found is None:
+            self.events.record(event, marker_id)
+            return
+        skill_name, level_key, marker = found
+        self.events.record(event, marker_id, skill=skill_name, priority=marker.priority, level=level_key)
+    
+    def velocity(self, weeks: int = DEFAULT_VELOCITY_WEEKS) -> float:
+        """Выполненных маркеров в неделю за последние weeks недель."""
+        return self.events.weekly_velocity(weeks)
+    
+    def level_forecast(self, weeks: int = DEFAULT_VELOCITY_WEEKS) -> List[Dict[str, Any]]:
+        """Для каждого навыка: текущий уровень, сколько маркеров осталось и прогноз в неделях.
+        
+        Прогноз — остаток уровня, делённый на общую скорость за последние
+        weeks недель; None, если скорость нулевая. Полностью пройденные
+        навыки не попадают в список.
+        """
+        self.events.refresh()
+        with self.lock:
+            completed_ids = set(self.progress["completed_markers"])
+        forecast = []
+        for skill_name, skill_data in self.markers.items():
+            for level_key in sorted(skill_data.levels, key=level_order):
+                remaining = sum(1 for marker in skill_data.levels[level_key] if marker.id not in completed_ids)
+                if remaining:
+                    forecast.append({
+                        "skill_name": skill_name,
+                        "level": level_key,
+                        "remaining": remaining,
+                        "eta_weeks": self.events.eta_weeks(remaining, weeks),
+                    })
+                    break
+        return forecast
     
     def _marker_exists(self, marker_id: str) -> bool:
-        for skill_data in self.markers.values():
-            for level_markers in skill_data.levels.values():
-                for marker in level_markers:
-                    if marker.id == marker_id:
-                        return True
-        return False
+        return self._find_marker(marker_id) is not None
+    
+    def _find_marker(self, marker_id: str) -> Optional[Tuple[str, str, Marker]]:
+        # Каталог не меняется во время работы: словарь (навык, уровень, маркер) строится один раз
+        if self._marker_lookup is None:
+            self._marker_lookup = {
+                marker.id: (skill_name, level_key, marker)
+                for skill_name, skill_data in self.markers.items()
+                for level_key, level_markers in skill_data.levels.items()
+                for marker in level_markers
+            }
+        return self._marker_lookup.get(marker_id)
+    
+    def completed_markers(self) -> List[Tuple[str, Marker]]:
+        """Выполненные маркеры каталога (навык, маркер) в порядке отметки."""
+        with self.lock:
+            completed_ids = list(self.progress["completed_markers"])
+        found = (self._find_marker(marker_id) for marker_id in completed_ids)
+        return [(skill_name, marker) for skill_name, _, marker in filter(None, found)]
+    
+    @property
+    def prerequisite_graph(self) -> PrerequisiteGraph:
+        """Граф предварительных условий каталога (общий для всех трекеров этой версии каталога)."""
+        return get_prerequisite_graph(self.markers, self.catalog_version)
+    
+    @property
+    def frontier(self) -> UnlockedFrontier:
+        """Доступные маркеры; строится при первом обращении и дальше обновляется при каждой отметке."""
+        with self.lock:
+            if self._frontier is None:
+                self._frontier = UnlockedFrontier(self.prerequisite_graph, self.progress["completed_markers"])
+            return self._frontier
+    
+    def next_markers(self) -> List[Tuple[str, Marker]]:
+        """Невыполненные маркеры, все предварительные условия которых выполнены (топологический порядок)."""
+        with self.lock:
+            unlocked = self.frontier.ids()
+        return [(skill_name, marker) for skill_name, _, marker in map(self._find_marker, unlocked)]
+    
+    def recommended_markers(self) -> List[Tuple[str, Marker]]:
+        """Доступные маркеры с высоким приоритетом и те, что открывают путь к ним.
+        
+        Продвинутые маркеры не предлагаются, пока не выполнены их
+        предварительные условия.
+        """
+        graph = self.prerequisite_graph
+        return [
+            (skill_name, marker) for skill_name, marker in self.next_markers()
+            if graph.leads_to_high[graph.index[marker.id]]
+        ]
     
     def show_recommendations(self, limit: int = 5) -> None:
         print("\n🎯 РЕКОМЕНДАЦИИ (high priority):")
         print("-" * 50)
         
-        high_priority_markers = []
-        for skill_name, skill_data in self.markers.items():
-            for level_markers in skill_data.levels.values():
-                for marker in level_markers:
-                    if (marker.id not in self.progress["completed_markers"] and marker.priority == "high"):
-                        high_priority_markers.append((skill_name, marker))
+        high_priority_markers = self.recommended_markers()
         
         if not high_priority_markers:
             print("🎉 Поздравляем! Все high-priority маркеры выполнены!")
@@ -232,6 +610,8 @@ class CareerTracker:
         shown_count = 0
         for skill_name, marker in high_priority_markers[:limit]:
             print(f"• {skill_name}: {marker.marker}")
+            if marker.priority != "high":
+                print(" 🔓 Открывает путь к high-priority маркерам")
             
             if marker.resources:
                 print(f" 📎 Ресурсы: {', '.join(marker.resources[:2])}")
@@ -281,4 +661,4 @@ class CareerTracker:
             "levels": skill_data.levels
         }
 
-__all__ = ['CareerTracker', 'Marker', 'SkillData']
+__all__ = ['CareerTracker', 'Marker', 'SkillData', 'load_markers']
@@ -0,0 +1,89 @@
+"""
+Пул трекеров для многопользовательских интерфейсов IT Compass.
+Методология "Объективные маркеры компетенций"
+© 2025 Ekaterina Kudelya. CC BY-ND 4.0
+"""
+import logging
+import re
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Optional
+
+from src.core.catalog_version import catalog_version
+from src.core.progress_bitset import PROGRESS_FORMAT_JSON
+from src.core.tracker import CareerTracker, SkillData, load_markers
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PROFILE = "default"
+
+class TrackerPool:
+    """Хранит трекеры пользователей поверх одного общего каталога маркеров.
+
+    Каталог загружается один раз, а прогресс каждого профиля читается лениво
+    при первом обращении. Число трекеров в памяти ограничено: давно не
+    использовавшиеся вытесняются (LRU). Прогресс сохраняется на диск при
+    каждом изменении, поэтому вытеснение ничего не теряет.
+    """
+
+    def __init__(self, markers_dir: str = "src/data/markers",
+                 default_progress_file: str = "src/data/user_progress.json",
+                 profiles_dir: str = "src/data/profiles",
+                 default_portfolio_file: str = "docs/my_portfolio.md",
+                 markers: Optional[Dict[str, SkillData]] = None,
+                 max_size: int = 64,
+                 progress_format: str = PROGRESS_FORMAT_JSON):
+        self.markers_dir = Path(markers_dir)
+        self.default_progress_file = Path(default_progress_file)
+        self.profiles_dir = Path(profiles_dir)
+        self.default_portfolio_file = Path(default_portfolio_file)
+        self.markers = markers if markers is not None else load_markers(self.markers_dir)
+        self.catalog_version = catalog_version(self.markers)
+        self.max_size = max_size
+        self.progress_format = progress_format
+        self._trackers: "OrderedDict[str, CareerTracker]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, profile_id: str = DEFAULT_PROFILE) -> CareerTracker:
+        profile_id = normalize_profile_id(profile_id)
+        with self._lock:
+            tracker = self._trackers.get(profile_id)
+            if tracker is None:
+                tracker = CareerTracker(
+                    markers_dir=str(self.markers_dir),
+                    progress_file=str(self.progress_file_for(profile_id)),
+                    markers=self.markers,
+                    progress_format=self.progress_format,
+                    catalog_version=self.catalog_version
+                )
+                self._trackers[profile_id] = tracker
+                while len(self._trackers) > self.max_size:
+                    evicted_id, _ = self._trackers.popitem(last=False)
+                    logger.info(f"Трекер профиля '{evicted_id}' выгружен из памяти")
+                return tracker
+            self._trackers.move_to_end(profile_id)
+        # Файл мог изменить другой процесс (CLI, интеграция): обычно это один stat()
+        tracker.refresh()
+        return tracker
+
+    def progress_file_for(self, profile_id: str) -> Path:
+        profile_id = normalize_profile_id(profile_id)
+        if profile_id == DEFAULT_PROFILE:
+            return self.default_progress_file
+        return self.profiles_dir / f"{profile_id}.json"
+
+    def portfolio_file_for(self, profile_id: str) -> Path:
+        """Портфолио профиля: у каждого свой файл, чтобы генерации не перезаписывали друг друга."""
+        profile_id = normalize_profile_id(profile_id)
+        if profile_id == DEFAULT_PROFILE:
+            return self.default_portfolio_file
+        return self.profiles_dir / f"{profile_id}_portfolio.md"
+
+    def __len__(self) -> int:
+        return len(self._trackers)
+
+def normalize_profile_id(profile_id: Optional[str]) -> str:
+    """Приводит имя профиля к безопасному имени файла."""
+    profile_id = re.sub(r"[^\w\-]", "_", (profile_id or "").strip().lower())
+    return profile_id or DEFAULT_PROFILE
@@ -18,6 +18,7 @@ sys.path.insert(0, str(project_root))
 
 try:
     from src.core.tracker import CareerTracker
+    from src.core.progress_events import DEFAULT_VELOCITY_WEEKS
     from src.utils.portfolio_gen import generate_portfolio
 except ImportError as e:
     print(f"❌ Ошибка импорта модулей: {e}")
@@ -101,6 +102,8 @@ class ITCompassApp:
     
     def handle_choice(self, choice: str) -> bool:
         try:
+            # Прогресс мог изменить веб-интерфейс или интеграция — подтягиваем перед действием
+            self.tracker.refresh()
             if choice == "1":
                 self.show_progress()
             elif choice == "2":
@@ -236,6 +239,23 @@ class ITCompassApp:
             print(f"\n📊 ОБЩАЯ СТАТИСТИКА:")
             print(f"Выполнено: {total_completed} из {total_markers} маркеров")
             print(f"Общий прогресс: {overall:.1f}%")
+        
+        self._show_velocity()
+    
+    def _show_velocity(self, limit: int = 5):
+        """Скорость и прогноз по уровням — из накопленных агрегатов, без перечитывания истории."""
+        velocity = self.tracker.velocity()
+        print(f"\n🚀 СКОРОСТЬ: {velocity:.1f} маркеров в неделю (последние {DEFAULT_VELOCITY_WEEKS} нед.)")
+        forecast = self.tracker.level_forecast()
+        if not forecast:
+            return
+        if velocity <= 0:
+            print("ℹ️ Прогноз появится после первых выполненных маркеров")
+            return
+        print("⏳ Ближайшие уровни:")
+        for item in sorted(forecast, key=lambda item: item["eta_weeks"])[:limit]:
+            print(f" {item['skill_name']} — уровень {item['level']}: осталось {item['remaining']}, "
+                  f"≈ {item['eta_weeks']:.1f} нед.")
     
     def show_settings(self):
         print("\n⚙️ НАСТРОЙКИ И ИНФОРМАЦИЯ")
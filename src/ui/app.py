@@ -7,13 +7,16 @@ IT Compass - Streamlit Web Interface for Dashboard Visualization
 import streamlit as st
 from pathlib import Path
 import sys
+import uuid
 
 # Добавляем src в путь для импорта
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 try:
-    from src.core.tracker import CareerTracker
-    from src.utils.portfolio_gen import generate_portfolio
+    from src.core.tracker_pool import TrackerPool, DEFAULT_PROFILE, normalize_profile_id
+    from src.core.progress_events import DEFAULT_VELOCITY_WEEKS
+    from src.utils.portfolio_gen import PortfolioGenerator
+    from src.utils.jobs import JobRunner, JOB_DONE, JOB_FAILED
 except ImportError as e:
     st.error(f"❌ Ошибка импорта модулей: {e}")
     st.error("Убедитесь, что вы находитесь в корневой директории проекта")
@@ -29,15 +32,214 @@ st.set_page_config(
 
 # --- Инициализация Трекера ---
 @st.cache_resource
+def get_tracker_pool():
+    """Общий каталог маркеров и LRU-пул трекеров профилей для всех сессий."""
+    try:
+        return TrackerPool()
+    except Exception as e:
+        st.error(f"❌ Не удалось загрузить каталог маркеров: {e}")
+        st.error("Проверьте наличие файлов маркеров в src/data/markers/")
+        return None
+
+def get_profile_id() -> str:
+    """Профиль текущей сессии.
+    
+    Новая сессия получает собственный гостевой профиль (или профиль из
+    параметра ?profile= в адресе), поэтому разные пользователи не делят
+    прогресс, пока сами не введут одинаковое имя профиля в сайдбаре.
+    """
+    if "profile_id" not in st.session_state:
+        st.session_state["profile_id"] = st.query_params.get("profile") or f"guest-{uuid.uuid4().hex[:8]}"
+    return normalize_profile_id(st.session_state["profile_id"])
+
 def get_tracker():
-    """Кэшируем трекер для производительности."""
+    """Трекер профиля текущей сессии; прогресс не разделяется между профилями."""
+    pool = get_tracker_pool()
+    if pool is None:
+        return None
     try:
-        return CareerTracker()
+        return pool.get(get_profile_id())
     except Exception as e:
         st.error(f"❌ Не удалось инициализировать CareerTracker: {e}")
-        st.error("Проверьте наличие файлов маркеров в src/data/markers/")
         return None
 
+SKILL_GRID_COLUMNS = 4
+SKILL_PAGE_SIZES = [8, 16, 32, 64]
+SKILL_STATUS_FILTERS = ["Все", "Не начаты", "В процессе", "Завершены"]
+
+def _collect_skill_stats(completed_ids: set) -> list:
+    """Считает прогресс по каждому навыку без отрисовки виджетов."""
+    stats = []
+    for skill_name, skill_data in tracker.markers.items():
+        total = 0
+        completed = 0
+        for level_markers in skill_data.levels.values():
+            total += len(level_markers)
+            completed += sum(1 for marker in level_markers if marker.id in completed_ids)
+        stats.append({
+            "skill_name": skill_name,
+            "description": skill_data.description,
+            "completed": completed,
+            "total": total,
+            "percentage": (completed / total * 100) if total > 0 else 0.0,
+        })
+    return stats
+
+def _filter_skill_stats(stats: list, query: str, status: str, sort_by: str) -> list:
+    """Фильтрует и сортирует навыки по строке поиска и статусу."""
+    query = query.strip().lower()
+    filtered = []
+    for stat in stats:
+        if query and query not in stat["skill_name"].lower() and query not in stat["description"].lower():
+            continue
+        if status == "Не начаты" and stat["completed"] > 0:
+            continue
+        if status == "В процессе" and not (0 < stat["completed"] < stat["total"]):
+            continue
+        if status == "Завершены" and (stat["total"] == 0 or stat["completed"] < stat["total"]):
+            continue
+        filtered.append(stat)
+    
+    if sort_by == "Прогресс ↓":
+        filtered.sort(key=lambda stat: (-stat["percentage"], stat["skill_name"]))
+    elif sort_by == "Прогресс ↑":
+        filtered.sort(key=lambda stat: (stat["percentage"], stat["skill_name"]))
+    else:
+        filtered.sort(key=lambda stat: stat["skill_name"].lower())
+    return filtered
+
+def render_skill_grid(skill_stats: list):
+    """Отображает постраничную сетку навыков с поиском и фильтрами.
+    
+    В браузер отправляются виджеты только текущей страницы.
+    """
+    if not skill_stats:
+        st.info("Нет навыков для отображения")
+        return
+    
+    filter_col, status_col, sort_col, size_col = st.columns([3, 2, 2, 1])
+    with filter_col:
+        query = st.text_input("🔍 Поиск навыка", key="skill_query", placeholder="Например: Python")
+    with status_col:
+        status = st.selectbox("Статус", SKILL_STATUS_FILTERS, key="skill_status")
+    with sort_col:
+        sort_by = st.selectbox("Сортировка", ["По названию", "Прогресс ↓", "Прогресс ↑"], key="skill_sort")
+    with size_col:
+        page_size = st.selectbox("На странице", SKILL_PAGE_SIZES, index=1, key="skill_page_size")
+    
+    filtered = _filter_skill_stats(skill_stats, query, status, sort_by)
+    if not filtered:
+        st.info("Навыки по заданным условиям не найдены")
+        return
+    
+    total_pages = (len(filtered) + page_size - 1) // page_size
+    if total_pages > 1:
+        # После смены фильтра страниц может стать меньше — не выходим за границу
+        if st.session_state.get("skill_page", 1) > total_pages:
+            st.session_state["skill_page"] = total_pages
+        page = st.number_input(f"Страница (всего {total_pages})", min_value=1, max_value=total_pages,
+                               value=1, step=1, key="skill_page")
+    else:
+        page = 1
+    page = min(int(page), total_pages)
+    
+    page_stats = filtered[(page - 1) * page_size:page * page_size]
+    st.caption(f"Показано {len(page_stats)} из {len(filtered)} навыков")
+    
+    for row_start in range(0, len(page_stats), SKILL_GRID_COLUMNS):
+        cols = st.columns(SKILL_GRID_COLUMNS)
+        for col, stat in zip(cols, page_stats[row_start:row_start + SKILL_GRID_COLUMNS]):
+            with col:
+                if stat["total"] > 0:
+                    st.markdown(f"**{stat['skill_name']}**")
+                    st.progress(stat["percentage"] / 100)
+                    st.caption(f"{stat['percentage']:.0f}% ({stat['completed']}/{stat['total']})")
+                else:
+                    st.info(f"**{stat['skill_name']}**\n\n(нет маркеров)")
+                if st.button("Подробнее", key=f"skill_details_{stat['skill_name']}", use_container_width=True):
+                    st.session_state["selected_skill"] = stat["skill_name"]
+
+def render_skill_details(skill_name: str, completed_ids: set):
+    """Отображает маркеры выбранного навыка по уровням (загружается по запросу)."""
+    skill_data = tracker.markers[skill_name]
+    
+    st.markdown("---")
+    header_col, close_col = st.columns([5, 1])
+    with header_col:
+        st.subheader(f"🔎 {skill_name}")
+        if skill_data.description:
+            st.caption(skill_data.description)
+    with close_col:
+        if st.button("✖ Закрыть", key="skill_details_close", use_container_width=True):
+            st.session_state.pop("selected_skill", None)
+            st.rerun()
+    
+    for level_key, level_markers in skill_data.levels.items():
+        level_completed = sum(1 for marker in level_markers if marker.id in completed_ids)
+        with st.expander(f"Уровень {level_key} — {level_completed}/{len(level_markers)}"):
+            for marker in level_markers:
+                status_icon = "✅" if marker.id in completed_ids else "⬜"
+                st.markdown(f"{status_icon} `{marker.id}` — {marker.marker}")
+                if marker.validation:
+                    st.caption(f"🔍 Валидация: {marker.validation}")
+
+@st.cache_resource
+def get_job_runner():
+    """Общий для всех сессий пул фоновых задач."""
+    return JobRunner(max_workers=2)
+
+def submit_job(action: str, func, *args, **kwargs):
+    """Запускает задачу в фоне и запоминает её в сессии."""
+    job = get_job_runner().submit(action, func, *args, **kwargs)
+    st.session_state.setdefault("jobs", {})[action] = job.id
+    return job
+
+def render_job_status(action: str, success_message: str, failure_message: str):
+    """Показывает статус фоновой задачи текущей сессии, не блокируя страницу."""
+    job_id = st.session_state.get("jobs", {}).get(action)
+    if not job_id:
+        return
+    
+    job = get_job_runner().get(job_id)
+    if job is None:
+        st.session_state["jobs"].pop(action, None)
+        return
+    
+    if job.is_active:
+        st.info("⏳ Задача выполняется в фоне, можно продолжать работу")
+        if st.button("🔄 Проверить статус", key=f"job_refresh_{action}", use_container_width=True):
+            st.rerun()
+    elif job.status == JOB_DONE and job.result:
+        st.success(success_message)
+        if not st.session_state.get(f"job_celebrated_{job.id}"):
+            st.session_state[f"job_celebrated_{job.id}"] = True
+            st.balloons()
+    elif job.status == JOB_FAILED:
+        st.error(f"❌ Ошибка: {job.error}")
+    else:
+        st.error(failure_message)
+
+def render_velocity(limit: int = 5):
+    """Скорость и прогноз до следующего уровня по накопленным агрегатам журнала событий."""
+    forecast = tracker.level_forecast()
+    velocity = tracker.velocity()
+    st.metric(f"🚀 Скорость (последние {DEFAULT_VELOCITY_WEEKS} нед.)", f"{velocity:.1f} маркеров/нед.")
+    if not forecast:
+        return
+    if velocity <= 0:
+        st.caption("Прогноз до следующего уровня появится после первых выполненных маркеров.")
+        return
+    nearest = sorted(forecast, key=lambda item: item["eta_weeks"])[:limit]
+    st.table([
+        {
+            "Навык": item["skill_name"],
+            "Уровень": item["level"],
+            "Осталось": item["remaining"],
+            "Прогноз, нед.": round(item["eta_weeks"], 1),
+        }
+        for item in nearest
+    ])
+
 def render_progress_dashboard():
     """Отображает прогресс в виде дашборда."""
     st.header("🧭 Ваш Карьерный Прогресс: Объективные Маркеры")
@@ -49,12 +251,11 @@ def render_progress_dashboard():
     st.markdown("---")
     
     # Общий прогресс
-    total_completed = len(tracker.progress.get("completed_markers", []))
-    total_markers = sum(
-        len(marker) for skill_data in tracker.markers.values()
-        for level_markers in skill_data.levels.values()
-        for marker in level_markers
-    )
+    with tracker.lock:
+        completed_ids = set(tracker.progress.get("completed_markers", []))
+    skill_stats = _collect_skill_stats(completed_ids)
+    total_completed = sum(stat["completed"] for stat in skill_stats)
+    total_markers = sum(stat["total"] for stat in skill_stats)
     
     if total_markers > 0:
         overall_percentage = (total_completed / total_markers) * 100
@@ -65,36 +266,17 @@ def render_progress_dashboard():
             st.metric("🎯 Всего маркеров", f"{total_markers}")
         with col3:
             st.metric("📊 Общий прогресс", f"{overall_percentage:.1f}%")
+        render_velocity()
     
     st.markdown("---")
     
     # Прогресс по навыкам
     st.subheader("📈 Детализация по направлениям")
+    render_skill_grid(skill_stats)
     
-    # Автоматически создаем колонки
-    skills = list(tracker.markers.keys())
-    if skills:
-        cols = st.columns(len(skills))
-        
-        for i, skill_name in enumerate(skills):
-            skill_data = tracker.markers[skill_name]
-            completed = 0
-            total = 0
-            
-            for level_markers in skill_data.levels.values():
-                total += len(level_markers)
-                for marker in level_markers:
-                    if marker.id in tracker.progress["completed_markers"]:
-                        completed += 1
-            
-            with cols[i]:
-                if total > 0:
-                    percentage = (completed / total) * 100
-                    st.markdown(f"**{skill_name}**")
-                    st.progress(percentage / 100)
-                    st.caption(f"{percentage:.0f}% ({completed}/{total})")
-                else:
-                    st.info(f"**{skill_name}**\n\n(нет маркеров)")
+    selected_skill = st.session_state.get("selected_skill")
+    if selected_skill in tracker.markers:
+        render_skill_details(selected_skill, completed_ids)
     
     st.markdown("---")
     
@@ -104,27 +286,22 @@ def render_progress_dashboard():
     col1, col2 = st.columns(2)
     
     with col1:
+        portfolio_job = f"generate_portfolio:{get_profile_id()}"
+        portfolio_file = get_tracker_pool().portfolio_file_for(get_profile_id())
         if st.button("📄 Сгенерировать портфолио", use_container_width=True):
-            try:
-                success = generate_portfolio()
-                if success:
-                    st.balloons()
-                    st.success("✅ Портфолио обновлено! Файл: `docs/my_portfolio.md`")
-                else:
-                    st.error("❌ Не удалось создать портфолио")
-            except Exception as e:
-                st.error(f"❌ Ошибка: {e}")
+            generator = PortfolioGenerator(progress_file=str(tracker.progress_file), output_file=str(portfolio_file))
+            submit_job(portfolio_job, generator.generate_portfolio)
+        render_job_status(
+            portfolio_job,
+            f"✅ Портфолио обновлено! Файл: `{portfolio_file.as_posix()}`",
+            "❌ Не удалось создать портфолио",
+        )
     
     with col2:
         if st.button("🎯 Показать рекомендации", use_container_width=True):
             st.info("Рекомендации по развитию (high priority):")
-            high_priority = []
-            for skill_name, skill_data in tracker.markers.items():
-                for level_markers in skill_data.levels.values():
-                    for marker in level_markers:
-                        if (marker.id not in tracker.progress["completed_markers"] 
-                            and marker.priority == "high"):
-                            high_priority.append((skill_name, marker))
+            # Только доступные маркеры: продвинутые — после их предварительных условий
+            high_priority = tracker.recommended_markers()
             
             if high_priority:
                 for skill_name, marker in high_priority[:5]:  # Показываем первые 5
@@ -164,7 +341,7 @@ def render_documentation():
         
         if st.button("📋 Посмотреть портфолио", use_container_width=True):
             try:
-                with open("docs/my_portfolio.md", "r", encoding="utf-8") as f:
+                with open(get_tracker_pool().portfolio_file_for(get_profile_id()), "r", encoding="utf-8") as f:
                     st.markdown(f.read())
             except:
                 st.warning("Портфолио ещё не сгенерировано")
@@ -270,6 +447,12 @@ def main():
         index=0
     )
     
+    st.sidebar.text_input("👤 Профиль", key="profile_id",
+                          help="Прогресс хранится отдельно для каждого профиля. "
+                               f"Сохраните ссылку с ?profile=, чтобы вернуться к своему; '{DEFAULT_PROFILE}' — прогресс из CLI")
+    # Профиль в адресе: перезагрузка страницы не создаёт новый гостевой профиль
+    st.query_params["profile"] = get_profile_id()
+    
     # Информация о проекте
     st.sidebar.markdown("---")
     st.sidebar.markdown("### ℹ️ О проекте")
@@ -299,4 +482,3 @@ if tracker is None:
 
 if __name__ == "__main__":
     main()
-```
@@ -0,0 +1,196 @@
+"""
+Аналитика прогресса группы пользователей (когорты) на NumPy.
+Прогресс многих профилей загружается в булеву матрицу пользователи × маркеры,
+столбцы которой упорядочены по каталогу (навык, уровень); распределения,
+перцентили, «застревания» и совместное выполнение считаются векторно.
+Методология "Объективные маркеры компетенций"
+© 2025 Ekaterina Kudelya. CC BY-ND 4.0
+"""
+import logging
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.core.catalog_version import catalog_version as compute_catalog_version
+from src.core.progress_bitset import DEFAULT_ORDINALS_FILE
+from src.core.progress_file import ProgressReadError, read_progress_file
+from src.core.tracker import SkillData
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PERCENTILES = (25, 50, 75, 90)
+DEFAULT_BINS = 10
+
+class CohortMatrix:
+    """Выполненные маркеры когорты: completed[u, m] — пользователь u выполнил маркер m.
+
+    Столбцы идут по каталогу: навык за навыком, внутри навыка — уровень за
+    уровнем. Поэтому суммы по навыкам и уровням считаются одним
+    np.add.reduceat по границам групп, без матрицы принадлежности.
+    """
+
+    def __init__(self, markers: Dict[str, SkillData]):
+        self.marker_ids: List[str] = []
+        self.skill_names: List[str] = []
+        self.levels: List[Tuple[str, str]] = []  # (навык, уровень) для каждой группы столбцов
+        skill_starts, level_starts = [], []
+        for skill_name, skill_data in markers.items():
+            skill_start = len(self.marker_ids)
+            for level_key, level_markers in skill_data.levels.items():
+                if not level_markers:
+                    continue
+                level_starts.append(len(self.marker_ids))
+                self.levels.append((skill_name, level_key))
+                self.marker_ids.extend(marker.id for marker in level_markers)
+            if len(self.marker_ids) > skill_start:
+                skill_starts.append(skill_start)
+                self.skill_names.append(skill_name)
+
+        self.column_of = {marker_id: column for column, marker_id in enumerate(self.marker_ids)}
+        self.skill_starts = np.array(skill_starts, dtype=np.intp)
+        self.level_starts = np.array(level_starts, dtype=np.intp)
+        self.skill_sizes = np.diff(np.append(self.skill_starts, len(self.marker_ids)))
+        self.level_sizes = np.diff(np.append(self.level_starts, len(self.marker_ids)))
+        self.users: List[str] = []
+        self.completed = np.zeros((0, len(self.marker_ids)), dtype=bool)
+        self.unknown_markers = 0
+
+    def __len__(self) -> int:
+        return len(self.users)
+
+    def load(self, progress: Dict[str, Iterable[str]]) -> "CohortMatrix":
+        """Заполняет матрицу из {пользователь: выполненные ID}; неизвестные ID пропускаются."""
+        self.users = list(progress)
+        rows, columns = [], []
+        unknown = 0
+        for row, completed_ids in enumerate(progress.values()):
+            for marker_id in completed_ids:
+                column = self.column_of.get(marker_id)
+                if column is None:
+                    unknown += 1
+                    continue
+                rows.append(row)
+                columns.append(column)
+        self.completed = np.zeros((len(self.users), len(self.marker_ids)), dtype=bool)
+        self.completed[np.array(rows, dtype=np.intp), np.array(columns, dtype=np.intp)] = True
+        self.unknown_markers = unknown
+        if unknown:
+            logger.warning(f"Пропущено {unknown} отметок о маркерах, которых нет в каталоге")
+        return self
+
+    def user_totals(self) -> np.ndarray:
+        """Число выполненных маркеров у каждого пользователя."""
+        return self.completed.sum(axis=1, dtype=np.int32)
+
+    def skill_counts(self) -> np.ndarray:
+        """Выполнено маркеров: пользователи × навыки."""
+        return _group_sums(self.completed, self.skill_starts)
+
+    def level_counts(self) -> np.ndarray:
+        """Выполнено маркеров: пользователи × (навык, уровень)."""
+        return _group_sums(self.completed, self.level_starts)
+
+    def skill_completion(self) -> np.ndarray:
+        """Доля выполненных маркеров навыка у каждого пользователя (пользователи × навыки)."""
+        return self.skill_counts() / np.maximum(self.skill_sizes, 1).astype(np.float32)
+
+    def skill_strength(self) -> List[Dict]:
+        """Навыки по средней доле выполнения в когорте, от сильных к слабым."""
+        completion = self.skill_completion()
+        mean = completion.mean(axis=0) if len(self) else np.zeros(len(self.skill_names))
+        started = (completion > 0).mean(axis=0) if len(self) else np.zeros(len(self.skill_names))
+        order = np.argsort(-mean, kind="stable")
+        return [
+            {"skill_name": self.skill_names[i], "mean_completion": float(mean[i]), "started_share": float(started[i])}
+            for i in order
+        ]
+
+    def skill_distribution(self, bins: int = DEFAULT_BINS) -> np.ndarray:
+        """Гистограммы доли выполнения по навыкам: навыки × bins, значения — число пользователей.
+
+        Корзина i — доля в [i / bins, (i + 1) / bins); полностью выполненный навык — в последней.
+        """
+        completion = self.skill_completion()
+        bucket = np.minimum((completion * bins).astype(np.intp), bins - 1)
+        flat = np.arange(len(self.skill_names)) * bins + bucket
+        return np.bincount(flat.ravel(), minlength=len(self.skill_names) * bins).reshape(len(self.skill_names), bins)
+
+    def level_stats(self) -> List[Dict]:
+        """Для каждого уровня навыка: доля начавших, доля завершивших и доля «застрявших».
+
+        «Застрял» — начал уровень (выполнен хотя бы один маркер), но не завершил его.
+        """
+        counts = self.level_counts()
+        users = max(1, len(self))
+        started = (counts > 0).sum(axis=0)
+        finished = (counts == self.level_sizes).sum(axis=0)
+        return [
+            {
+                "skill_name": skill_name,
+                "level": level_key,
+                "markers": int(self.level_sizes[i]),
+                "started_share": float(started[i] / users),
+                "finished_share": float(finished[i] / users),
+                "stalled_share": float((started[i] - finished[i]) / users),
+            }
+            for i, (skill_name, level_key) in enumerate(self.levels)
+        ]
+
+    def percentiles(self, q: Sequence[float] = DEFAULT_PERCENTILES) -> Dict[str, np.ndarray]:
+        """Перцентили числа выполненных маркеров (total) и доли выполнения по навыкам (skills: len(q) × навыки)."""
+        if not len(self):
+            return {"total": np.zeros(len(q)), "skills": np.zeros((len(q), len(self.skill_names)))}
+        return {
+            "total": np.percentile(self.user_totals(), q),
+            "skills": np.percentile(self.skill_completion(), q, axis=0),
+        }
+
+    def skill_co_completion(self, threshold: float = 0.5) -> np.ndarray:
+        """Навыки × навыки: сколько пользователей выполнили не меньше threshold каждого из двух навыков."""
+        strong = (self.skill_completion() >= threshold).astype(np.float32)
+        return (strong.T @ strong).astype(np.int64)
+
+    def marker_co_completion(self, marker_ids: Optional[Sequence[str]] = None) -> Tuple[List[str], np.ndarray]:
+        """Маркеры × маркеры: сколько пользователей выполнили оба маркера.
+
+        Полная матрица для большого каталога квадратична по числу маркеров,
+        поэтому обычно передают подмножество marker_ids.
+        """
+        marker_ids = list(marker_ids) if marker_ids is not None else self.marker_ids
+        columns = np.array([self.column_of[marker_id] for marker_id in marker_ids], dtype=np.intp)
+        selected = self.completed[:, columns].astype(np.float32)
+        return marker_ids, (selected.T @ selected).astype(np.int64)
+
+def _group_sums(completed: np.ndarray, starts: np.ndarray) -> np.ndarray:
+    if not len(starts) or not completed.shape[0]:
+        return np.zeros((completed.shape[0], len(starts)), dtype=np.int32)
+    return np.add.reduceat(completed.view(np.uint8), starts, axis=1, dtype=np.int32)
+
+def profile_progress_files(profiles_dir: str, default_progress_file: Optional[str] = None) -> Dict[str, Path]:
+    """Файлы прогресса профилей: {профиль: путь}. Сводки и агрегаты рядом с ними пропускаются."""
+    files = {
+        path.stem: path for path in sorted(Path(profiles_dir).glob("*.json"))
+        if len(path.suffixes) == 1
+    }
+    if default_progress_file and Path(default_progress_file).exists():
+        files.setdefault("default", Path(default_progress_file))
+    return files
+
+def read_completed(progress_files: Dict[str, Path], catalog_version: Optional[str] = None,
+                   ordinals_file: str = DEFAULT_ORDINALS_FILE) -> Dict[str, List[str]]:
+    """Выполненные маркеры из файлов прогресса (любого формата); повреждённые файлы пропускаются."""
+    progress = {}
+    for user_id, path in progress_files.items():
+        try:
+            loaded = read_progress_file(path, catalog_version, ordinals_file=ordinals_file)
+        except ProgressReadError as e:
+            logger.error(str(e))
+            continue
+        progress[user_id] = loaded.progress["completed_markers"] if loaded is not None else []
+    return progress
+
+def load_cohort(markers: Dict[str, SkillData], progress_files: Dict[str, Path],
+                ordinals_file: str = DEFAULT_ORDINALS_FILE) -> CohortMatrix:
+    """Матрица когорты из файлов прогресса."""
+    return CohortMatrix(markers).load(read_completed(progress_files, compute_catalog_version(markers), ordinals_file))
@@ -0,0 +1,112 @@
+"""
+Фоновое выполнение долгих задач для IT Compass.
+Методология "Объективные маркеры компетенций"
+© 2025 Ekaterina Kudelya. CC BY-ND 4.0
+"""
+import logging
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+JOB_PENDING = "pending"
+JOB_RUNNING = "running"
+JOB_DONE = "done"
+JOB_FAILED = "failed"
+
+@dataclass
+class Job:
+    id: str
+    key: str
+    status: str = JOB_PENDING
+    submitted_at: float = 0.0
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    result: Any = None
+    error: Optional[str] = None
+
+    @property
+    def is_active(self) -> bool:
+        return self.status in (JOB_PENDING, JOB_RUNNING)
+
+    @property
+    def duration(self) -> Optional[float]:
+        if self.started_at is None:
+            return None
+        return (self.finished_at or time.time()) - self.started_at
+
+class JobRunner:
+    """Пул потоков с реестром задач.
+
+    Задачи с одинаковым ключом дедуплицируются: пока задача выполняется,
+    повторная отправка возвращает уже существующую.
+    """
+
+    def __init__(self, max_workers: int = 2, max_finished: int = 100):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="it-compass-job")
+        self._jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self._active_by_key: Dict[str, str] = {}
+        self._latest_by_key: Dict[str, str] = {}
+        self._max_finished = max_finished
+        self._lock = threading.Lock()
+
+    def submit(self, key: str, func: Callable[..., Any], *args, **kwargs) -> Job:
+        with self._lock:
+            active_id = self._active_by_key.get(key)
+            if active_id is not None:
+                logger.info(f"Задача '{key}' уже выполняется, повторный запуск пропущен")
+                return self._jobs[active_id]
+
+            job = Job(id=uuid.uuid4().hex, key=key, submitted_at=time.time())
+            self._jobs[job.id] = job
+            self._active_by_key[key] = job.id
+            self._latest_by_key[key] = job.id
+            self._evict_finished()
+
+        self._executor.submit(self._run, job, func, args, kwargs)
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def latest(self, key: str) -> Optional[Job]:
+        with self._lock:
+            job_id = self._latest_by_key.get(key)
+            return self._jobs.get(job_id) if job_id else None
+
+    def shutdown(self, wait: bool = True) -> None:
+        self._executor.shutdown(wait=wait)
+
+    def _run(self, job: Job, func: Callable[..., Any], args: tuple, kwargs: dict) -> None:
+        with self._lock:
+            job.status = JOB_RUNNING
+            job.started_at = time.time()
+        try:
+            result = func(*args, **kwargs)
+        except Exception as e:
+            logger.error(f"Ошибка фоновой задачи '{job.key}': {e}")
+            with self._lock:
+                job.status = JOB_FAILED
+                job.error = str(e)
+        else:
+            with self._lock:
+                job.status = JOB_DONE
+                job.result = result
+        finally:
+            with self._lock:
+                job.finished_at = time.time()
+                if self._active_by_key.get(job.key) == job.id:
+                    del self._active_by_key[job.key]
+
+    def _evict_finished(self) -> None:
+        finished = [job_id for job_id, job in self._jobs.items() if not job.is_active]
+        for job_id in finished[:max(0, len(finished) - self._max_finished)]:
+            job = self._jobs.pop(job_id)
+            if self._latest_by_key.get(job.key) == job_id:
+                del self._latest_by_key[job.key]
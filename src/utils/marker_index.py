@@ -0,0 +1,128 @@
+"""
+Локальный поиск маркеров-кандидатов (BM25) для сокращения промптов.
+Методология "Объективные маркеры компетенций"
+© 2025 Ekaterina Kudelya. CC BY-ND 4.0
+"""
+import math
+import re
+import threading
+from collections import Counter, defaultdict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from src.core.tracker import Marker, SkillData
+
+# Текст приводится к нижнему регистру до поиска, поэтому IGNORECASE не нужен (и заметно медленнее)
+_TOKEN_RE = re.compile(r"[a-zа-яё0-9][a-zа-яё0-9+#]*")
+# Грубый стемминг: у длинных слов оставляем префикс, чтобы "скрипт"/"скрипта"/"скриптов" совпадали
+STEM_LENGTH = 6
+STOP_WORDS = {
+    "и", "в", "во", "на", "с", "со", "по", "для", "или", "не", "из", "к", "от", "до", "за", "это",
+    "как", "что", "the", "a", "an", "and", "or", "of", "to", "in", "for", "on", "with", "is",
+}
+
+def iter_words(text: str) -> List[str]:
+    """Слова текста в нижнем регистре без стоп-слов."""
+    return [word for word in _TOKEN_RE.findall(text.lower().replace("ё", "е")) if word not in STOP_WORDS]
+
+def tokenize(text: str) -> List[str]:
+    """Нормализует текст в список стемов (регистр, стоп-слова, префикс)."""
+    return [word[:STEM_LENGTH] for word in iter_words(text)]
+
+def marker_document(skill_name: str, skill_data: SkillData, marker: Marker) -> str:
+    """Текст маркера, по которому ведётся поиск."""
+    return " ".join((skill_name, skill_data.description, marker.marker, marker.validation))
+
+class MarkerIndex:
+    """BM25-индекс по тексту маркеров каталога.
+
+    IDF и длины документов считаются один раз при построении; поиск
+    проходит только по спискам вхождений терминов запроса.
+    """
+
+    def __init__(self, markers: Dict[str, SkillData], k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self.entries: List[Tuple[str, Marker]] = []
+        doc_lengths = []
+        postings: Dict[str, List[Tuple[int, int]]] = defaultdict(list)
+
+        for skill_name, skill_data in markers.items():
+            for level_markers in skill_data.levels.values():
+                for marker in level_markers:
+                    doc_id = len(self.entries)
+                    self.entries.append((skill_name, marker))
+                    terms = Counter(tokenize(marker_document(skill_name, skill_data, marker)))
+                    doc_lengths.append(sum(terms.values()))
+                    for term, tf in terms.items():
+                        postings[term].append((doc_id, tf))
+
+        doc_count = len(self.entries)
+        avg_length = (sum(doc_lengths) / doc_count) if doc_count else 0.0
+        self.idf = {
+            term: math.log(1 + (doc_count - len(docs) + 0.5) / (len(docs) + 0.5))
+            for term, docs in postings.items()
+        }
+        # Нормировку длины документа тоже считаем заранее
+        norms = [k1 * (1 - b + b * length / avg_length) if avg_length else k1 for length in doc_lengths]
+        self.postings = {
+            term: [(doc_id, tf * (k1 + 1) / (tf + norms[doc_id])) for doc_id, tf in docs]
+            for term, docs in postings.items()
+        }
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def search(self, text: str, limit: int) -> List[Tuple[str, Marker, float]]:
+        """Возвращает до limit маркеров с ненулевой релевантностью, лучшие первыми."""
+        scores: Dict[int, float] = defaultdict(float)
+        for term in set(tokenize(text)):
+            idf = self.idf.get(term)
+            if idf is None:
+                continue
+            for doc_id, weight in self.postings[term]:
+                scores[doc_id] += idf * weight
+
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))[:limit]
+        return [(self.entries[doc_id][0], self.entries[doc_id][1], score) for doc_id, score in ranked]
+
+_index_cache: Dict[str, MarkerIndex] = {}
+_index_lock = threading.Lock()
+
+def get_marker_index(markers: Dict[str, SkillData], catalog_version: str) -> MarkerIndex:
+    """Индекс строится один раз на версию каталога и переиспользуется."""
+    with _index_lock:
+        index = _index_cache.get(catalog_version)
+        if index is None:
+            index = MarkerIndex(markers)
+            _index_cache[catalog_version] = index
+        return index
+
+def evaluate_recall(index: MarkerIndex, samples: Iterable[Dict], limits: Iterable[int],
+                    full_prompt_chars: Optional[int] = None) -> List[Dict]:
+    """Считает полноту отбора кандидатов на размеченной выборке.
+
+    Каждый пример — словарь с ключами "text" и "marker_ids" (ожидаемые маркеры).
+    Для каждого лимита возвращает среднюю полноту и средний размер
+    списка маркеров в промпте.
+    """
+    samples = list(samples)
+    report = []
+    for limit in limits:
+        found = 0
+        expected = 0
+        prompt_chars = 0
+        for sample in samples:
+            candidates = index.search(sample["text"], limit)
+            candidate_ids = {marker.id for _, marker, _ in candidates}
+            labelled = set(sample.get("marker_ids", []))
+            found += len(labelled & candidate_ids)
+            expected += len(labelled)
+            prompt_chars += sum(len(marker.id) + len(marker.marker) + 6 for _, marker, _ in candidates)
+        avg_chars = prompt_chars / len(samples) if samples else 0.0
+        report.append({
+            "limit": limit,
+            "recall": (found / expected) if expected else 0.0,
+            "avg_prompt_chars": avg_chars,
+            "prompt_ratio": (avg_chars / full_prompt_chars) if full_prompt_chars else None,
+        })
+    return report
@@ -0,0 +1,113 @@
+"""
+Агрегация совпадений с маркерами перед применением к трекеру.
+Методология "Объективные маркеры компетенций"
+© 2025 Ekaterina Kudelya. CC BY-ND 4.0
+"""
+from typing import Dict, Iterable, List, Union
+
+from src.utils.offline_matcher import CONFIDENCE_HIGH, CONFIDENCE_LOW, CONFIDENCE_MEDIUM
+
+# Вероятность, которую приписываем одному совпадению с данной уверенностью
+CONFIDENCE_SCORES = {
+    CONFIDENCE_HIGH: 0.85,
+    CONFIDENCE_MEDIUM: 0.6,
+    CONFIDENCE_LOW: 0.3,
+    "high": 0.85,
+    "medium": 0.6,
+    "low": 0.3,
+}
+UNKNOWN_CONFIDENCE_SCORE = 0.3
+
+METHOD_NOISY_OR = "noisy_or"
+METHOD_MAX = "max"
+DEFAULT_METHOD = METHOD_NOISY_OR
+DEFAULT_MIN_CONFIDENCE = 0.5
+DEFAULT_MAX_SNIPPETS = 3
+
+def confidence_score(confidence) -> float:
+    """Числовая уверенность совпадения (0..1) по метке или числу."""
+    if isinstance(confidence, (int, float)) and not isinstance(confidence, bool):
+        return min(1.0, max(0.0, float(confidence)))
+    if isinstance(confidence, str):
+        return CONFIDENCE_SCORES.get(confidence.strip().lower(), UNKNOWN_CONFIDENCE_SCORE)
+    return UNKNOWN_CONFIDENCE_SCORE
+
+def confidence_label(score: float) -> str:
+    if score >= CONFIDENCE_SCORES[CONFIDENCE_HIGH]:
+        return CONFIDENCE_HIGH
+    if score >= CONFIDENCE_SCORES[CONFIDENCE_MEDIUM]:
+        return CONFIDENCE_MEDIUM
+    return CONFIDENCE_LOW
+
+def parse_threshold(value: Union[str, float, None]) -> float:
+    """Порог уверенности: число 0..1 или метка ("средняя", "high" и т.п.)."""
+    if value is None or value == "":
+        return DEFAULT_MIN_CONFIDENCE
+    try:
+        return min(1.0, max(0.0, float(value)))
+    except (TypeError, ValueError):
+        label = str(value).strip().lower()
+        if label not in CONFIDENCE_SCORES:
+            raise ValueError(f"Неизвестный порог уверенности: {value}")
+        return CONFIDENCE_SCORES[label]
+
+def aggregate_matches(matches: Iterable[Dict], method: str = DEFAULT_METHOD,
+                      min_confidence: float = DEFAULT_MIN_CONFIDENCE,
+                      max_snippets: int = DEFAULT_MAX_SNIPPETS) -> List[Dict]:
+    """Группирует совпадения по matched_marker_id и объединяет свидетельства.
+
+    Уверенность объединяется как максимум (method="max") или noisy-OR:
+    1 - П(1 - p_i), т.е. несколько независимых слабых свидетельств
+    вместе дают высокую уверенность. Для каждого маркера сохраняются
+    до max_snippets лучших фрагментов текста; маркеры с итоговой
+    уверенностью ниже min_confidence отбрасываются.
+    Результат отсортирован по убыванию уверенности.
+    """
+    if method not in (METHOD_NOISY_OR, METHOD_MAX):
+        raise ValueError(f"Неизвестный метод агрегации: {method}")
+
+    groups: Dict[str, Dict] = {}
+    for match in matches:
+        marker_id = match.get("matched_marker_id") if isinstance(match, dict) else None
+        if not marker_id:
+            continue
+        score = confidence_score(match.get("confidence"))
+        group = groups.get(marker_id)
+        if group is None:
+            group = groups[marker_id] = {
+                "max": 0.0, "miss": 1.0, "count": 0, "snippets": {}, "sources": {}, "comment": None
+            }
+        group["count"] += 1
+        group["miss"] *= 1 - score
+        if score > group["max"] or group["comment"] is None:
+            group["comment"] = match.get("comment")
+        group["max"] = max(group["max"], score)
+
+        snippet = (match.get("context_snippet") or "").strip()
+        if snippet and score > group["snippets"].get(snippet, -1.0):
+            group["snippets"][snippet] = score
+        source = match.get("source_file")
+        if source:
+            group["sources"][source] = None
+
+    aggregated = []
+    for marker_id, group in groups.items():
+        score = group["max"] if method == METHOD_MAX else 1 - group["miss"]
+        if score < min_confidence:
+            continue
+        # Лучшие фрагменты; при равной уверенности — в порядке появления
+        evidence = sorted(group["snippets"], key=lambda snippet: -group["snippets"][snippet])[:max_snippets]
+        aggregated.append({
+            "matched_marker_id": marker_id,
+            "confidence": confidence_label(score),
+            "score": round(score, 4),
+            "count": group["count"],
+            "context_snippet": evidence[0] if evidence else "",
+            "evidence": evidence,
+            "sources": list(group["sources"]),
+            "comment": group["comment"],
+        })
+
+    aggregated.sort(key=lambda item: (-item["score"], item["matched_marker_id"]))
+    return aggregated
+
@@ -0,0 +1,93 @@
+"""
+Разбиение заметок на фрагменты под бюджет токенов reasoning-модели.
+Методология "Объективные маркеры компетенций"
+© 2025 Ekaterina Kudelya. CC BY-ND 4.0
+"""
+import math
+import re
+from typing import Iterable, Iterator, List
+
+# Грубая оценка: для смешанного русско-английского текста ~3 символа на токен
+DEFAULT_CHARS_PER_TOKEN = 3
+DEFAULT_CHUNK_TOKENS = 3000
+
+_HEADING_RE = re.compile(r"^\s{0,3}(#{1,6}\s|={3,}|-{3,}$)")
+_BLANK_LINES_RE = re.compile(r"\n\s*\n")
+
+def estimate_tokens(text: str, chars_per_token: int = DEFAULT_CHARS_PER_TOKEN) -> int:
+    """Оценивает число токенов в тексте без обращения к токенизатору."""
+    return math.ceil(len(text) / chars_per_token) if text else 0
+
+def split_blocks(text: str) -> List[str]:
+    """Делит текст на абзацы; заголовок Markdown всегда начинает новый блок."""
+    blocks = []
+    for paragraph in _BLANK_LINES_RE.split(text):
+        current: List[str] = []
+        for line in paragraph.splitlines():
+            if current and _HEADING_RE.match(line):
+                blocks.append("\n".join(current))
+                current = []
+            current.append(line)
+        if current:
+            block = "\n".join(current).strip("\n")
+            if block.strip():
+                blocks.append(block)
+    return blocks
+
+def iter_chunks(blocks: Iterable[str], max_tokens: int = DEFAULT_CHUNK_TOKENS,
+                chars_per_token: int = DEFAULT_CHARS_PER_TOKEN) -> Iterator[str]:
+    """Жадно собирает блоки во фрагменты, не превышающие бюджет токенов.
+
+    Границы проходят по абзацам и заголовкам; слишком длинный абзац
+    режется по строкам, а строка — по символам.
+    """
+    max_chars = max(1, max_tokens * chars_per_token)
+    current: List[str] = []
+    current_len = 0
+
+    for block in blocks:
+        for piece in _split_oversized(block, max_chars):
+            # +2 — разделитель абзацев при склейке
+            extra = len(piece) + (2 if current else 0)
+            starts_section = bool(_HEADING_RE.match(piece)) and current_len >= max_chars // 2
+            if current and (current_len + extra > max_chars or starts_section):
+                yield "\n\n".join(current)
+                current = []
+                current_len = 0
+                extra = len(piece)
+            current.append(piece)
+            current_len += extra
+
+    if current:
+        yield "\n\n".join(current)
+
+def split_into_chunks(text: str, max_tokens: int = DEFAULT_CHUNK_TOKENS,
+                      chars_per_token: int = DEFAULT_CHARS_PER_TOKEN) -> List[str]:
+    """Разбивает текст заметок на фрагменты под бюджет токенов."""
+    return list(iter_chunks(split_blocks(text), max_tokens, chars_per_token))
+
+def _split_oversized(block: str, max_chars: int) -> Iterator[str]:
+    if len(block) <= max_chars:
+        yield block
+        return
+
+    current: List[str] = []
+    current_len = 0
+    for line in block.splitlines():
+        while len(line) > max_chars:
+            if current:
+                yield "\n".join(current)
+                current = []
+                current_len = 0
+            yield line[:max_chars]
+            line = line[max_chars:]
+        extra = len(line) + (1 if current else 0)
+        if current and current_len + extra > max_chars:
+            yield "\n".join(current)
+            current = []
+            current_len = 0
+            extra = len(line)
+        current.append(line)
+        current_len += extra
+    if current:
+        yield "\n".join(current)
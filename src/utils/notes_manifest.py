@@ -0,0 +1,166 @@
+"""
+Манифест обработанных файлов архива заметок для инкрементального анализа.
+Методология "Объективные маркеры компетенций"
+© 2025 Ekaterina Kudelya. CC BY-ND 4.0
+"""
+import hashlib
+import json
+import logging
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_VERSION = 1
+DEFAULT_MANIFEST_DIR = "src/data/cache/manifests"
+HASH_BLOCK_SIZE = 1024 * 1024
+
+@dataclass
+class ScannedFile:
+    path: Path
+    relative_path: str
+    size: int
+    mtime_ns: int
+    sha256: Optional[str] = None
+
+def scan_notes(directory: Path, suffixes: Iterable[str]) -> Iterator[Tuple[Path, os.stat_result]]:
+    """Обходит директорию через os.scandir, отбирая файлы по расширению.
+
+    Скрытые директории (например, .git) пропускаются. Порядок обхода стабилен.
+    """
+    suffixes = tuple(suffix.lower() for suffix in suffixes)
+    stack = [str(directory)]
+    while stack:
+        current = stack.pop()
+        try:
+            with os.scandir(current) as it:
+                entries = sorted(it, key=lambda entry: entry.name)
+        except OSError as e:
+            logger.warning(f"Не удалось прочитать директорию {current}: {e}")
+            continue
+
+        subdirs = []
+        for entry in entries:
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    if not entry.name.startswith("."):
+                        subdirs.append(entry.path)
+                elif entry.is_file() and entry.name.lower().endswith(suffixes):
+                    yield Path(entry.path), entry.stat()
+            except OSError as e:
+                logger.warning(f"Не удалось прочитать {entry.path}: {e}")
+        stack.extend(reversed(subdirs))
+
+def file_digest(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(HASH_BLOCK_SIZE), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+def default_manifest_path(directory: Path, manifest_dir: str = DEFAULT_MANIFEST_DIR) -> Path:
+    """Отдельный манифест на каждую директорию архива, вне самого архива."""
+    key = hashlib.sha1(str(Path(directory).resolve()).encode("utf-8")).hexdigest()[:16]
+    return Path(manifest_dir) / f"{key}.json"
+
+class NotesManifest:
+    """Путь, размер, mtime и хэш содержимого каждого обработанного файла
+    вместе с найденными в нём совпадениями."""
+
+    def __init__(self, manifest_file: Path, root: Path, analysis_key: str = ""):
+        self.manifest_file = Path(manifest_file)
+        self.root = Path(root)
+        # Версия анализа (каталог, модель, промпт): при её смене результаты считаются устаревшими
+        self.analysis_key = analysis_key
+        self.files: Dict[str, Dict] = {}
+        self._dirty = False
+        self._load()
+
+    def plan(self, suffixes: Iterable[str]) -> List[ScannedFile]:
+        """Сканирует архив и возвращает файлы, которые нужно проанализировать.
+
+        Файлы с неизменными размером и mtime не читаются вовсе; при изменившемся
+        mtime, но прежнем хэше обновляются только метаданные. Записи удалённых
+        файлов удаляются из манифеста.
+        """
+        seen = set()
+        changed = []
+        for path, stat in scan_notes(self.root, suffixes):
+            relative_path = path.relative_to(self.root).as_posix()
+            seen.add(relative_path)
+            entry = self.files.get(relative_path)
+            if entry and entry["size"] == stat.st_size and entry["mtime_ns"] == stat.st_mtime_ns:
+                continue
+
+            scanned = ScannedFile(path, relative_path, stat.st_size, stat.st_mtime_ns)
+            try:
+                scanned.sha256 = file_digest(path)
+            except OSError as e:
+                logger.warning(f"Не удалось прочитать {path}: {e}")
+                continue
+
+            if entry and entry["sha256"] == scanned.sha256:
+                entry["size"] = scanned.size
+                entry["mtime_ns"] = scanned.mtime_ns
+                self._dirty = True
+            else:
+                changed.append(scanned)
+
+        deleted = [relative_path for relative_path in self.files if relative_path not in seen]
+        for relative_path in deleted:
+            del self.files[relative_path]
+            self._dirty = True
+        if deleted:
+            logger.info(f"Удалено из манифеста: {len(deleted)} файлов")
+        return changed
+
+    def record(self, scanned: ScannedFile, matches: List[Dict]) -> None:
+        self.files[scanned.relative_path] = {
+            "size": scanned.size,
+            "mtime_ns": scanned.mtime_ns,
+            "sha256": scanned.sha256,
+            "matches": matches,
+        }
+        self._dirty = True
+
+    def all_matches(self) -> List[Dict]:
+        """Совпадения по всем файлам архива в порядке путей."""
+        matches = []
+        for relative_path in sorted(self.files):
+            for match in self.files[relative_path]["matches"]:
+                match = dict(match)
+                match["source_file"] = str(self.root / relative_path)
+                matches.append(match)
+        return matches
+
+    def save(self) -> bool:
+        if not self._dirty:
+            return True
+        try:
+            self.manifest_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp_file = self.manifest_file.with_suffix(".tmp")
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump({"version": MANIFEST_VERSION, "root": str(self.root.resolve()),
+                           "analysis_key": self.analysis_key, "files": self.files}, f, ensure_ascii=False)
+            os.replace(tmp_file, self.manifest_file)
+            self._dirty = False
+            return True
+        except Exception as e:
+            logger.error(f"Ошибка сохранения манифеста {self.manifest_file}: {e}")
+            return False
+
+    def _load(self) -> None:
+        if not self.manifest_file.exists():
+            return
+        try:
+            with open(self.manifest_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if (data.get("version") == MANIFEST_VERSION and data.get("analysis_key") == self.analysis_key
+                    and isinstance(data.get("files"), dict)):
+                self.files = data["files"]
+            else:
+                logger.warning(f"Манифест {self.manifest_file} устарел, архив будет проанализирован заново")
+        except (json.JSONDecodeError, OSError) as e:
+            logger.error(f"Ошибка чтения манифеста {self.manifest_file}: {e}")
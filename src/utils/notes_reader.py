@@ -0,0 +1,194 @@
+"""
+Потоковое чтение файлов заметок с ограниченным потреблением памяти.
+Методология "Объективные маркеры компетенций"
+© 2025 Ekaterina Kudelya. CC BY-ND 4.0
+"""
+import codecs
+import json
+import logging
+from pathlib import Path
+from typing import Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+SNIFF_SIZE = 8192
+DEFAULT_BLOCK_SIZE = 64 * 1024
+READ_SIZE = 64 * 1024
+# Ключи, значения которых в экспортах чатов (ChatGPT, Telegram и т.п.) содержат текст сообщений
+JSON_TEXT_KEYS = {"text", "content", "message", "body", "parts"}
+MAX_JSON_STRING = 1024 * 1024
+
+_BOMS = [
+    (codecs.BOM_UTF8, "utf-8-sig"),
+    (codecs.BOM_UTF16_LE, "utf-16"),
+    (codecs.BOM_UTF16_BE, "utf-16"),
+]
+
+def detect_encoding(path: Path) -> Optional[str]:
+    """Определяет кодировку по началу файла; None — файл похож на бинарный."""
+    with open(path, 'rb') as f:
+        head = f.read(SNIFF_SIZE)
+    if not head:
+        return "utf-8"
+
+    for bom, encoding in _BOMS:
+        if head.startswith(bom):
+            return encoding
+    if b"\0" in head:
+        return None
+
+    try:
+        # Последний символ может быть обрезан на границе чтения
+        codecs.getincrementaldecoder("utf-8")().decode(head, final=False)
+        return "utf-8"
+    except UnicodeDecodeError:
+        pass
+
+    text = head.decode("cp1251", errors="replace")
+    control = sum(1 for ch in text if ord(ch) < 32 and ch not in "\t\n\r\f")
+    if control / len(text) > 0.05:
+        return None
+    return "cp1251"
+
+def iter_text_blocks(path: Path, encoding: str = "utf-8", block_size: int = DEFAULT_BLOCK_SIZE) -> Iterator[str]:
+    """Читает файл блоками около block_size символов, выровненными по абзацам.
+
+    Блок закрывается на пустой строке после набора block_size символов;
+    если абзац слишком длинный — на границе строки после 4 * block_size.
+    Очень длинные строки читаются частями, поэтому память ограничена
+    независимо от размера файла.
+    """
+    lines: List[str] = []
+    size = 0
+    with open(path, 'r', encoding=encoding, errors='replace', newline=None) as f:
+        while True:
+            line = f.readline(block_size)
+            if not line:
+                break
+            lines.append(line)
+            size += len(line)
+            at_paragraph = not line.strip()
+            if (size >= block_size and at_paragraph) or size >= 4 * block_size:
+                yield "".join(lines)
+                lines = []
+                size = 0
+    if lines:
+        yield "".join(lines)
+
+def iter_json_messages(path: Path, encoding: str = "utf-8") -> Iterator[str]:
+    """Потоково извлекает тексты сообщений из JSON-экспорта чата.
+
+    Документ не загружается целиком: разбор идёт по символам, в памяти
+    держится только текущая строка. Отдаются строковые значения ключей
+    из JSON_TEXT_KEYS, а также строки-элементы массивов под этими ключами.
+    """
+    # Стек контейнеров: [тип, ожидается_ключ, захват_строк_массива]
+    stack: List[list] = []
+    last_key: Optional[str] = None
+    in_string = False
+    escape = False
+    overflow = False
+    buffer: List[str] = []
+    buffer_len = 0
+
+    with open(path, 'r', encoding=encoding, errors='replace') as f:
+        for block in iter(lambda: f.read(READ_SIZE), ""):
+            i = 0
+            start = 0
+            n = len(block)
+            while i < n:
+                if in_string:
+                    if escape:
+                        escape = False
+                        i += 1
+                        continue
+                    # Внутри строки перескакиваем сразу к кавычке или escape-символу
+                    quote = block.find('"', i)
+                    backslash = block.find("\\", i, quote if quote != -1 else n)
+                    if backslash != -1:
+                        escape = True
+                        i = backslash + 1
+                        continue
+                    if quote == -1:
+                        break
+                    in_string = False
+                    if buffer_len < MAX_JSON_STRING:
+                        buffer.append(block[start:quote])
+                    value = _decode_json_string("".join(buffer), overflow)
+                    buffer = []
+                    buffer_len = 0
+                    overflow = False
+                    i = quote + 1
+                    if stack and stack[-1][0] == "{" and stack[-1][1]:
+                        last_key = value
+                    elif value and _captures_string(stack, last_key):
+                        yield value
+                    continue
+
+                ch = block[i]
+                i += 1
+                if ch == '"':
+                    in_string = True
+                    start = i
+                elif ch == "{" or ch == "[":
+                    capture = ch == "[" and last_key in JSON_TEXT_KEYS
+                    stack.append([ch, ch == "{", capture])
+                    last_key = None
+                elif ch == "}" or ch == "]":
+                    if stack:
+                        stack.pop()
+                    last_key = None
+                elif ch == ":":
+                    if stack:
+                        stack[-1][1] = False
+                elif ch == ",":
+                    if stack and stack[-1][0] == "{":
+                        stack[-1][1] = True
+                        last_key = None
+
+            if in_string:
+                piece = block[start:]
+                if buffer_len < MAX_JSON_STRING:
+                    buffer.append(piece)
+                    buffer_len += len(piece)
+                else:
+                    overflow = True
+
+def iter_note_blocks(path: Path, block_size: int = DEFAULT_BLOCK_SIZE) -> Iterator[str]:
+    """Текстовые блоки файла заметок с учётом его типа.
+
+    Бинарные файлы пропускаются. Для .json сначала пробуется извлечение
+    сообщений чата; если их нет, файл читается как обычный текст.
+    """
+    path = Path(path)
+    encoding = detect_encoding(path)
+    if encoding is None:
+        logger.info(f"Пропущен бинарный файл: {path}")
+        return
+
+    if path.suffix.lower() == ".json":
+        found = False
+        for message in iter_json_messages(path, encoding):
+            found = True
+            yield message
+        if found:
+            return
+
+    yield from iter_text_blocks(path, encoding, block_size)
+
+def _captures_string(stack: List[list], last_key: Optional[str]) -> bool:
+    if not stack:
+        return False
+    container = stack[-1]
+    if container[0] == "{":
+        return last_key in JSON_TEXT_KEYS
+    return container[2]
+
+def _decode_json_string(raw: str, truncated: bool) -> str:
+    if truncated:
+        # Обрезанная строка могла закончиться посреди escape-последовательности
+        raw = raw.rstrip("\\")
+    try:
+        return json.loads(f'"{raw}"', strict=False)
+    except json.JSONDecodeError:
+        return raw.replace('\\"', '"').replace("\\n", "\n")
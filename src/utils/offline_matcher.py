@@ -0,0 +1,196 @@
+"""
+Офлайн-сопоставление заметок с маркерами без обращения к API.
+TF-IDF по словам и символьным n-граммам, косинусное сходство на NumPy.
+Методология "Объективные маркеры компетенций"
+© 2025 Ekaterina Kudelya. CC BY-ND 4.0
+"""
+import math
+import threading
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.core.tracker import Marker, SkillData
+from src.utils.marker_index import marker_document
+from src.utils.text_features import MAX_NGRAM, feature_counts, featurize, stem_features
+
+CONFIDENCE_HIGH = "высокая"
+CONFIDENCE_MEDIUM = "средняя"
+CONFIDENCE_LOW = "низкая"
+
+DEFAULT_THRESHOLDS = {CONFIDENCE_HIGH: 0.35, CONFIDENCE_MEDIUM: 0.22, CONFIDENCE_LOW: 0.12}
+DEFAULT_TOP_K = 3
+DEFAULT_BATCH_SIZE = 256
+SNIPPET_LENGTH = 200
+
+class OfflineMatcher:
+    """Ранжирует маркеры каталога по косинусному сходству с фрагментами заметок.
+
+    Признаки — стемы слов и символьные n-граммы (устойчивы к русским
+    окончаниям), извлекаются векторно модулем text_features. Матрица
+    маркеров (K × V) строится один раз; фрагменты векторизуются пакетами
+    в плотную матрицу (B × V), и сходство считается одним умножением матриц.
+    """
+
+    def __init__(self, markers: Dict[str, SkillData], thresholds: Optional[Dict[str, float]] = None,
+                 top_k: int = DEFAULT_TOP_K, ngram: int = MAX_NGRAM):
+        self.thresholds = dict(thresholds or DEFAULT_THRESHOLDS)
+        self.top_k = top_k
+        self.ngram = ngram
+        self.entries: List[Tuple[str, Marker]] = []
+
+        texts = []
+        snippet_texts = []
+        for skill_name, skill_data in markers.items():
+            for level_markers in skill_data.levels.values():
+                for marker in level_markers:
+                    self.entries.append((skill_name, marker))
+                    snippet_texts.append(f"{skill_name} {marker.marker} {marker.validation}")
+                    texts.append(marker_document(skill_name, skill_data, marker))
+
+        # Стемы маркеров для выбора строки-цитаты: матрица вхождений (стемы × маркеры)
+        stem_rows, stem_keys = stem_features(snippet_texts)
+        self._stem_keys = np.unique(stem_keys)
+        self._stem_matrix = np.zeros((len(self._stem_keys), len(snippet_texts)), dtype=np.float32)
+        self._stem_matrix[np.searchsorted(self._stem_keys, stem_keys), stem_rows] = 1
+
+        documents = feature_counts(texts, ngram)
+        # Словарь признаков — отсортированные ключи: поиск столбца через searchsorted
+        self.feature_keys = np.unique(np.concatenate([keys for keys, _ in documents])) if documents \
+            else np.zeros(0, dtype=np.uint64)
+        vocab_size = len(self.feature_keys)
+
+        doc_count = max(1, len(documents))
+        df = np.zeros(vocab_size, dtype=np.float32)
+        matrix = np.zeros((len(documents), vocab_size), dtype=np.float32)
+        for row, (keys, counts) in enumerate(documents):
+            columns = np.searchsorted(self.feature_keys, keys)
+            df[columns] += 1
+            matrix[row, columns] = 1 + np.log(counts)
+        self.idf = (np.log((1 + doc_count) / (1 + df)) + 1).astype(np.float32)
+        # Признак, которого нет в каталоге, считаем самым редким
+        self.oov_idf = float(math.log(1 + doc_count) + 1)
+
+        matrix *= self.idf
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        self.marker_matrix = matrix / np.maximum(norms, 1e-12)
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def vectorize(self, chunks: Sequence[str]) -> np.ndarray:
+        """TF-IDF-векторы фрагментов, нормированные с учётом признаков вне каталога."""
+        vocab_size = len(self.feature_keys)
+        rows, keys = featurize(chunks, self.ngram)
+
+        # Ключи сопоставляются со словарём один раз на уникальный ключ
+        unique_keys, inverse = np.unique(keys, return_inverse=True)
+        unique_columns = np.searchsorted(self.feature_keys, unique_keys)
+        unique_known = unique_columns < vocab_size
+        unique_known[unique_known] = self.feature_keys[unique_columns[unique_known]] == unique_keys[unique_known]
+        known = unique_known[inverse]
+
+        # Частоты известных признаков — одним bincount по плоским индексам (строка * V + столбец)
+        flat = rows[known] * vocab_size + unique_columns[inverse[known]]
+        counts = np.bincount(flat, minlength=len(chunks) * vocab_size)
+        matrix = counts.reshape(len(chunks), vocab_size).astype(np.float32)
+        nonzero = matrix > 0
+        matrix[nonzero] = 1 + np.log(matrix[nonzero])
+        matrix *= self.idf
+
+        # Признаки вне каталога не влияют на скалярное произведение, но входят в норму
+        pairs, pair_counts = np.unique(rows[~known] * len(unique_keys) + inverse[~known], return_counts=True)
+        weights = ((1 + np.log(pair_counts)) * self.oov_idf) ** 2
+        oov_mass = np.bincount(pairs // max(1, len(unique_keys)), weights=weights, minlength=len(chunks))
+
+        norms = np.sqrt((matrix ** 2).sum(axis=1) + oov_mass)
+        return matrix / np.maximum(norms, 1e-12).astype(np.float32)[:, None]
+
+    def score(self, chunks: Sequence[str]) -> np.ndarray:
+        """Матрица косинусного сходства (фрагменты × маркеры)."""
+        if not chunks or not self.entries:
+            return np.zeros((len(chunks), len(self.entries)), dtype=np.float32)
+        return self.vectorize(chunks) @ self.marker_matrix.T
+
+    def match(self, chunks: Sequence[str], batch_size: int = DEFAULT_BATCH_SIZE) -> List[List[Dict]]:
+        """Совпадения для каждого фрагмента в формате ответа reasoning-модели."""
+        results: List[List[Dict]] = []
+        low = self.thresholds[CONFIDENCE_LOW]
+        for start in range(0, len(chunks), batch_size):
+            batch = chunks[start:start + batch_size]
+            scores = self.score(batch)
+            top_k = min(self.top_k, scores.shape[1])
+            if top_k == 0:
+                results.extend([] for _ in batch)
+                continue
+            top = np.argpartition(-scores, top_k - 1, axis=1)[:, :top_k]
+            candidates = [[int(col) for col in sorted(top[row], key=lambda col: -scores[row, col])
+                           if scores[row, col] >= low] for row in range(len(batch))]
+            # Строки разбираем только у фрагментов с совпадениями — одним вызовом на пакет
+            lines = [chunk.splitlines() if cols else [] for chunk, cols in zip(batch, candidates)]
+            line_offsets = np.cumsum([0] + [len(chunk_lines) for chunk_lines in lines])
+            overlap = self._line_overlap([line for chunk_lines in lines for line in chunk_lines])
+            for row, chunk in enumerate(batch):
+                chunk_overlap = overlap[line_offsets[row]:line_offsets[row + 1]]
+                results.append([self._build_match(chunk, lines[row], chunk_overlap[:, col], col, float(scores[row, col]))
+                                for col in candidates[row]])
+        return results
+
+    def analyze(self, notes_content: str) -> List[Dict]:
+        return self.match([notes_content])[0]
+
+    def confidence(self, score: float) -> Optional[str]:
+        for level in (CONFIDENCE_HIGH, CONFIDENCE_MEDIUM, CONFIDENCE_LOW):
+            if score >= self.thresholds[level]:
+                return level
+        return None
+
+    def _line_overlap(self, lines: List[str]) -> np.ndarray:
+        """Число общих стемов каждой строки с каждым маркером (строки × маркеры)."""
+        rows, keys = stem_features(lines)
+        columns = np.searchsorted(self._stem_keys, keys)
+        known = columns < len(self._stem_keys)
+        known[known] = self._stem_keys[columns[known]] == keys[known]
+        # Каждый стем считается в строке один раз
+        incidence = np.zeros((len(lines), len(self._stem_keys)), dtype=np.float32)
+        incidence[rows[known], columns[known]] = 1
+        return incidence @ self._stem_matrix
+
+    def _build_match(self, chunk: str, lines: List[str], overlap: np.ndarray, col: int, score: float) -> Dict:
+        skill_name, marker = self.entries[col]
+        return {
+            "matched_marker_id": marker.id,
+            "context_snippet": self._best_snippet(chunk, lines, overlap),
+            "confidence": self.confidence(score),
+            "comment": f"Офлайн-сопоставление ({skill_name}): косинусное сходство {score:.2f}",
+        }
+
+    def _best_snippet(self, chunk: str, lines: List[str], overlap: np.ndarray) -> str:
+        """Строка фрагмента, больше всего пересекающаяся с текстом маркера."""
+        best = int(np.argmax(overlap)) if len(lines) else 0
+        best_line = lines[best].strip() if len(lines) and overlap[best] > 0 else ""
+        snippet = best_line or chunk.strip()
+        return snippet if len(snippet) <= SNIPPET_LENGTH else snippet[:SNIPPET_LENGTH] + "..."
+
+_matcher_cache: Dict[str, OfflineMatcher] = {}
+_matcher_lock = threading.Lock()
+
+def get_offline_matcher(markers: Dict[str, SkillData], catalog_version: str) -> OfflineMatcher:
+    """Матрица каталога строится один раз на версию каталога."""
+    with _matcher_lock:
+        matcher = _matcher_cache.get(catalog_version)
+        if matcher is None:
+            matcher = OfflineMatcher(markers)
+            _matcher_cache[catalog_version] = matcher
+        return matcher
+
+# Матчер рабочего процесса: передаётся один раз через initializer пула процессов
+_worker_matcher: Optional[OfflineMatcher] = None
+
+def init_worker(matcher: OfflineMatcher) -> None:
+    global _worker_matcher
+    _worker_matcher = matcher
+
+def match_in_worker(chunks: List[str]) -> List[List[Dict]]:
+    """Задача для ProcessPoolExecutor: сопоставляет фрагменты матчером процесса."""
+    return _worker_matcher.match(chunks)
@@ -9,13 +9,19 @@ from pathlib import Path
 from typing import Dict, List, Optional
 from datetime import datetime
 
+from src.core.progress_bitset import DEFAULT_ORDINALS_FILE
+from src.core.progress_file import ProgressReadError, read_progress_file
+
 logger = logging.getLogger(__name__)
 
 class PortfolioGenerator:
-    def __init__(self, markers_dir: str = "src/data/markers", progress_file: str = "src/data/user_progress.json", output_file: str = "docs/my_portfolio.md"):
+    def __init__(self, markers_dir: str = "src/data/markers", progress_file: str = "src/data/user_progress.json", output_file: str = "docs/my_portfolio.md",
+                 ordinals_file: str = DEFAULT_ORDINALS_FILE):
         self.markers_dir = Path(markers_dir)
         self.progress_file = Path(progress_file)
         self.output_file = Path(output_file)
+        # Нужен для прогресса в битовом формате
+        self.ordinals_file = ordinals_file
         self._markers_cache: Optional[Dict[str, Dict]] = None
     
     def generate_portfolio(self) -> bool:
@@ -43,25 +49,15 @@ class PortfolioGenerator:
             return False
     
     def _load_progress(self) -> Optional[Dict]:
-        if not self.progress_file.exists():
-            print("⚠️ Файл прогресса отсутствует.")
-            return None
-        
         try:
-            with open(self.progress_file, 'r', encoding='utf-8') as f:
-                progress = json.load(f)
-            
-            if not isinstance(progress, dict):
-                logger.error("Некорректная структура файла прогресса")
-                return None
-                
-            return progress
-        except json.JSONDecodeError as e:
-            logger.error(f"Ошибка парсинга файла прогресса: {e}")
+            loaded = read_progress_file(self.progress_file, ordinals_file=self.ordinals_file)
+        except ProgressReadError as e:
+            logger.error(str(e))
             return None
-        except Exception as e:
-            logger.error(f"Неожиданная ошибка при загрузке прогресса: {e}")
+        if loaded is None:
+            print("⚠️ Файл прогресса отсутствует.")
             return None
+        return loaded.progress
     
     def _load_all_markers(self) -> Dict[str, Dict]:
         if self._markers_cache is not None:
@@ -140,6 +136,10 @@ class PortfolioGenerator:
         
         return lines
     
+    def render(self, completed_markers: List[Dict]) -> str:
+        """Текст портфолио в Markdown без записи в файл."""
+        return '\n'.join(self._create_portfolio_content(completed_markers))
+    
     def _group_markers_by_skill(self, markers: List[Dict]) -> Dict[str, List[Dict]]:
         grouped = {}
         for marker in markers:
@@ -0,0 +1,80 @@
+"""
+Упаковка нескольких небольших фрагментов заметок в один запрос к reasoning-модели.
+Методология "Объективные маркеры компетенций"
+© 2025 Ekaterina Kudelya. CC BY-ND 4.0
+"""
+import re
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+
+DEFAULT_PACK_MAX_ITEMS = 20
+# Разделители фрагмента в промпте, в токенах (с запасом)
+SECTION_OVERHEAD_TOKENS = 20
+
+PACK_SECTION_RE = re.compile(
+    r"<<<ФРАГМЕНТ (\d+)(?: \| [^>\n]*)?>>>\n(.*?)\n<<<КОНЕЦ ФРАГМЕНТА \1>>>", re.DOTALL
+)
+
+def iter_packs(items: Iterable[T], size: Callable[[T], int], max_size: int,
+               max_items: int = DEFAULT_PACK_MAX_ITEMS) -> Iterator[List[T]]:
+    """Собирает элементы в пачки размером не больше max_size (next-fit).
+
+    Порядок элементов сохраняется, в памяти держится только текущая пачка.
+    Элемент больше max_size уходит отдельной пачкой. Элементы нулевого
+    размера (служебные отметки) не занимают места и попадают в текущую пачку.
+    """
+    current: List[T] = []
+    current_size = 0
+    current_count = 0
+    for item in items:
+        item_size = size(item)
+        if item_size and current_count and (current_size + item_size > max_size or current_count >= max_items):
+            yield current
+            current = []
+            current_size = 0
+            current_count = 0
+        current.append(item)
+        if item_size:
+            current_size += item_size
+            current_count += 1
+    if current:
+        yield current
+
+def format_pack(sections: List[Tuple[str, str]]) -> str:
+    """Текст заметок для промпта: пронумерованные фрагменты с подписями (обычно имя файла)."""
+    parts = []
+    for number, (label, text) in enumerate(sections, 1):
+        header = f"<<<ФРАГМЕНТ {number} | {label}>>>" if label else f"<<<ФРАГМЕНТ {number}>>>"
+        parts.append(f"{header}\n{text}\n<<<КОНЕЦ ФРАГМЕНТА {number}>>>")
+    return "\n\n".join(parts)
+
+def split_pack_matches(matches: List[Dict], count: int) -> Tuple[List[List[Dict]], int]:
+    """Раскладывает совпадения ответа по фрагментам пачки по полю "source".
+
+    Возвращает списки совпадений для каждого фрагмента и число совпадений,
+    которые не удалось отнести ни к одному фрагменту. Если фрагмент один,
+    совпадения без "source" относятся к нему.
+    """
+    per_item: List[List[Dict]] = [[] for _ in range(count)]
+    unattributed = 0
+    for match in matches:
+        source = _source_number(match.get("source")) if isinstance(match, dict) else None
+        if source is None and count == 1 and isinstance(match, dict):
+            source = 1
+        if source is None or not 1 <= source <= count:
+            unattributed += 1
+            continue
+        per_item[source - 1].append({key: value for key, value in match.items() if key != "source"})
+    return per_item, unattributed
+
+def _source_number(value) -> Optional[int]:
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, int):
+        return value
+    if isinstance(value, str):
+        digits = re.search(r"\d+", value)
+        if digits:
+            return int(digits.group())
+    return None
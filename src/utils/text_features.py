@@ -0,0 +1,155 @@
+"""
+Векторизованное извлечение признаков текста для офлайн-сопоставления.
+Разбиение на слова, стемы и символьные n-граммы считаются на массивах
+кодов символов NumPy, без цикла Python по словам.
+Методология "Объективные маркеры компетенций"
+© 2025 Ekaterina Kudelya. CC BY-ND 4.0
+"""
+from typing import List, Sequence, Tuple
+
+import numpy as np
+
+from src.utils.marker_index import STEM_LENGTH, STOP_WORDS
+
+# Код символа Unicode занимает не больше 21 бита: n-грамма до трёх символов
+# упаковывается в uint64 без потерь
+CODE_BITS = 21
+MAX_NGRAM = 3
+# Старший бит отличает ключи стемов от ключей n-грамм
+STEM_FLAG = np.uint64(1 << 63)
+WORD_START = ord("<")
+WORD_END = ord(">")
+
+_HASH_MUL_1 = np.uint64(0x9E3779B97F4A7C15)
+_HASH_MUL_2 = np.uint64(0xC2B2AE3D27D4EB4F)
+
+def _char_table() -> Tuple[np.ndarray, np.ndarray]:
+    """Таблицы по кодам символов: может ли символ начинать слово / входить в слово.
+
+    Совпадают с регулярным выражением marker_index: [a-zа-яё0-9][a-zа-яё0-9+#]*
+    """
+    size = 0x452
+    starts = np.zeros(size, dtype=bool)
+    for first, last in (("a", "z"), ("0", "9"), ("а", "я")):
+        starts[ord(first):ord(last) + 1] = True
+    starts[ord("ё")] = True
+    inner = starts.copy()
+    inner[ord("+")] = True
+    inner[ord("#")] = True
+    return starts, inner
+
+_STARTS, _INNER = _char_table()
+
+def _lookup(table: np.ndarray, codes: np.ndarray) -> np.ndarray:
+    inside = codes < len(table)
+    return inside & table[np.where(inside, codes, 0)]
+
+def _pack(chars: np.ndarray) -> np.ndarray:
+    """Упаковывает строки матрицы кодов (N × k, k ≤ 3) в uint64."""
+    key = np.zeros(len(chars), dtype=np.uint64)
+    for column in range(chars.shape[1]):
+        key = (key << np.uint64(CODE_BITS)) | chars[:, column].astype(np.uint64)
+    return key
+
+def _stem_keys(codes: np.ndarray, starts: np.ndarray, lengths: np.ndarray) -> np.ndarray:
+    """Ключи стемов (первые STEM_LENGTH символов слова)."""
+    offsets = np.arange(STEM_LENGTH)
+    positions = starts[:, None] + offsets
+    chars = np.where(offsets < lengths[:, None], codes[np.minimum(positions, len(codes) - 1)], 0)
+    head = _pack(chars[:, :MAX_NGRAM])
+    tail = _pack(chars[:, MAX_NGRAM:2 * MAX_NGRAM])
+    with np.errstate(over="ignore"):
+        return ((head * _HASH_MUL_1) ^ (tail * _HASH_MUL_2) ^ (head >> np.uint64(29))) | STEM_FLAG
+
+def _words(codes: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Начала и длины слов в массиве кодов."""
+    inner = _lookup(_INNER, codes)
+    if not inner.any():
+        empty = np.zeros(0, dtype=np.int64)
+        return empty, empty
+
+    # Серии символов слова; слово начинается с первого допустимого первого символа серии
+    edges = np.diff(np.concatenate(([False], inner, [False])).astype(np.int8))
+    run_ends = np.flatnonzero(edges == -1)
+    run_of = np.cumsum(edges[:-1] == 1) - 1
+    candidates = np.flatnonzero(_lookup(_STARTS, codes))
+    candidate_runs = run_of[candidates]
+    first = np.concatenate(([True], candidate_runs[1:] != candidate_runs[:-1])) if len(candidates) else \
+        np.zeros(0, dtype=bool)
+    starts = candidates[first]
+    return starts, run_ends[candidate_runs[first]] - starts
+
+def _stop_keys() -> np.ndarray:
+    words = sorted(STOP_WORDS)
+    text = " ".join(words)
+    codes = np.frombuffer(text.encode("utf-32-le"), dtype=np.uint32).astype(np.int64)
+    starts, lengths = _words(codes)
+    return np.unique(_stem_keys(codes, starts, lengths))
+
+_STOP_KEYS = _stop_keys()
+_STOP_MAX_LENGTH = max(len(word) for word in STOP_WORDS)
+
+def _tokenize(texts: Sequence[str]) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Слова текстов без стоп-слов: коды символов, начала, длины, ключи стемов и номера текстов."""
+    normalized = [text.lower().replace("ё", "е") for text in texts]
+    # Тексты склеиваются через перевод строки — он не входит в слова
+    joined = "\n".join(normalized)
+    codes = np.frombuffer(joined.encode("utf-32-le"), dtype=np.uint32).astype(np.int32)
+    text_of = np.repeat(np.arange(len(texts)), [len(text) + 1 for text in normalized])
+
+    starts, lengths = _words(codes)
+    stems = _stem_keys(codes, starts, lengths)
+    keep = ~((lengths <= _STOP_MAX_LENGTH) & np.isin(stems, _STOP_KEYS))
+    starts, lengths, stems = starts[keep], lengths[keep], stems[keep]
+    return codes, starts, lengths, stems, text_of[starts]
+
+def stem_features(texts: Sequence[str]) -> Tuple[np.ndarray, np.ndarray]:
+    """Стемы слов текстов: для каждого слова — (номер текста, ключ стема)."""
+    if not texts:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.uint64)
+    _, _, _, stems, word_rows = _tokenize(texts)
+    return word_rows, stems
+
+def featurize(texts: Sequence[str], ngram: int = MAX_NGRAM) -> Tuple[np.ndarray, np.ndarray]:
+    """Признаки текстов: для каждого вхождения — (номер текста, ключ признака).
+
+    Признаки слова те же, что в прежней версии на словарях: стем (первые
+    STEM_LENGTH символов) и, для слов длиннее ngram, символьные n-граммы
+    слова с границами "<" и ">". Текст приводится к нижнему регистру,
+    "ё" заменяется на "е", стоп-слова отбрасываются.
+    """
+    if not 1 <= ngram <= MAX_NGRAM:
+        raise ValueError(f"Поддерживаются n-граммы длиной от 1 до {MAX_NGRAM}")
+    if not texts:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.uint64)
+    codes, starts, lengths, stems, word_rows = _tokenize(texts)
+
+    # N-граммы слова "<слово>": слова с границами выписываются подряд в один массив,
+    # n-граммы — окна этого массива, не выходящие за границы слова
+    long_words = np.flatnonzero(lengths > ngram)
+    padded_lengths = lengths[long_words] + 2
+    segment_starts = np.cumsum(padded_lengths) - padded_lengths
+    offsets = np.arange(int(padded_lengths.sum())) - np.repeat(segment_starts, padded_lengths)
+    word_lengths = np.repeat(padded_lengths, padded_lengths) - 2
+    inside = codes[np.clip(np.repeat(starts[long_words], padded_lengths) + offsets - 1, 0, len(codes) - 1)]
+    padded = np.where(offsets == 0, WORD_START, np.where(offsets == word_lengths + 1, WORD_END, inside))
+    window_starts = np.flatnonzero(offsets <= word_lengths + 2 - ngram)
+    grams = np.zeros(len(window_starts), dtype=np.uint64)
+    for column in range(ngram):
+        grams = (grams << np.uint64(CODE_BITS)) | padded[window_starts + column].astype(np.uint64)
+    word_of = np.repeat(long_words, padded_lengths + 1 - ngram)
+
+    rows = np.concatenate((word_rows, word_rows[word_of]))
+    keys = np.concatenate((stems, grams))
+    return rows, keys
+
+def feature_counts(texts: Sequence[str], ngram: int = MAX_NGRAM) -> List[Tuple[np.ndarray, np.ndarray]]:
+    """Для каждого текста: уникальные ключи признаков и их частоты."""
+    rows, keys = featurize(texts, ngram)
+    result = []
+    order = np.argsort(rows, kind="stable")
+    bounds = np.searchsorted(rows[order], np.arange(len(texts) + 1))
+    for row in range(len(texts)):
+        row_keys = keys[order[bounds[row]:bounds[row + 1]]]
+        result.append(np.unique(row_keys, return_counts=True))
+    return result
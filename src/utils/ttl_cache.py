@@ -0,0 +1,84 @@
+"""
+Дисковый кэш ответов внешних сервисов со сроком жизни (TTL)
+и отдачей устаревших данных на время обновления (stale-while-revalidate).
+Методология "Объективные маркеры компетенций"
+© 2025 Ekaterina Kudelya. CC BY-ND 4.0
+"""
+import json
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TTL = 6 * 3600            # свежие данные: 6 часов
+DEFAULT_MAX_STALE = 7 * 24 * 3600  # устаревшие, но пригодные для показа: неделя
+
+@dataclass
+class CacheEntry:
+    value: Any
+    stored_at: float
+    fresh: bool
+
+    @property
+    def age(self) -> float:
+        return max(0.0, time.time() - self.stored_at)
+
+class DiskTTLCache:
+    """Небольшой JSON-кэш в одном файле.
+
+    get() возвращает свежую запись или устаревшую (в пределах max_stale)
+    с fresh=False — вызывающий показывает её сразу и обновляет в фоне.
+    Файл читается один раз и перезаписывается атомарно при каждом put().
+    """
+
+    def __init__(self, cache_file: str, ttl: float = DEFAULT_TTL, max_stale: float = DEFAULT_MAX_STALE):
+        self.cache_file = Path(cache_file)
+        self.ttl = ttl
+        self.max_stale = max_stale
+        self._entries: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+        self._load()
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is None:
+            return None
+        age = time.time() - entry["stored_at"]
+        if age > self.ttl + self.max_stale:
+            return None
+        return CacheEntry(entry["value"], entry["stored_at"], fresh=age <= self.ttl)
+
+    def put(self, key: str, value: Any) -> None:
+        with self._lock:
+            self._entries[key] = {"value": value, "stored_at": time.time()}
+            self._save()
+
+    def _save(self) -> None:
+        try:
+            self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp_file = self.cache_file.with_suffix(".tmp")
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump(self._entries, f, ensure_ascii=False)
+            os.replace(tmp_file, self.cache_file)
+        except Exception as e:
+            logger.error(f"Ошибка сохранения кэша {self.cache_file}: {e}")
+
+    def _load(self) -> None:
+        if not self.cache_file.exists():
+            return
+        try:
+            with open(self.cache_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if isinstance(data, dict):
+                self._entries = {
+                    key: entry for key, entry in data.items()
+                    if isinstance(entry, dict) and "value" in entry and isinstance(entry.get("stored_at"), (int, float))
+                }
+        except (json.JSONDecodeError, OSError) as e:
+            logger.error(f"Ошибка чтения кэша {self.cache_file}: {e}")
@@ -1,13 +1,26 @@
 import time
 import sys
+from pathlib import Path
 from typing import Dict, Any, List
 
+# Add the project root to the path to allow imports
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.core.progress_summary import read_summary, summary_file_for
+from src.core.support_resources import get_support_store
+
+DEFAULT_PROGRESS_FILE = project_root / "src" / "data" / "user_progress.json"
+
 class LowEnergyMode:
     """Специальный режим для работы в состоянии низкой энергии"""
     
-    def __init__(self):
+    def __init__(self, progress_file: str = str(DEFAULT_PROGRESS_FILE)):
         self.enabled = False
+        # Читаем только сводку прогресса: трекер и каталог маркеров не загружаются
+        self.summary_file = summary_file_for(progress_file)
         self.last_interaction = time.time()
+        self.resources = get_support_store()
         self.simple_menu = [
             "1. Посмотреть прогресс",
             "2. Простое упражнение",
@@ -83,12 +96,24 @@ class LowEnergyMode:
     
     def show_progress(self):
         """Показать упрощённый прогресс"""
+        summary = read_summary(self.summary_file)
+        
         print("\n" + "="*40)
         print("📊 ВАШ ТЕКУЩИЙ ПРОГРЕСС")
         print("="*40)
-        print("✅ Основные компетенции: 2 из 17")
-        print("✅ Прогресс обучения: 12%")
-        print("✅ Последнее достижение: 'Запуск приложения'")
+        if summary is None:
+            print("ℹ️ Прогресс пока не сохранялся — отметьте первый маркер в основном режиме")
+        else:
+            started = sum(1 for skill in summary["skills"].values() if skill["completed"])
+            print(f"✅ Выполнено маркеров: {summary['completed']} из {summary['total']} ({summary['percentage']:.0f}%)")
+            print(f"✅ Навыков в работе: {started} из {len(summary['skills'])}")
+            top_skills = sorted(summary["skills"].items(), key=lambda item: -item[1]["percentage"])[:3]
+            for skill_name, skill in top_skills:
+                if skill["completed"]:
+                    print(f"   • {skill_name}: {skill['percentage']:.0f}%")
+            last = summary.get("last_completed")
+            if last:
+                print(f"✅ Последнее достижение: '{last['marker']}' ({last['completed_at'][:10]})")
         print("\n💡 Совет: Сегодня отлично подойдут простые упражнения для поддержания прогресса")
         print("="*40)
         input("\nНажмите Enter, чтобы продолжить...")
@@ -112,6 +137,15 @@ class LowEnergyMode:
         print("✅ Упражнение выполнено! Как вы себя чувствуете?")
         input("\nНажмите Enter, чтобы продолжить...")
     
+    def show_quote(self):
+        """Показать мотивационную цитату"""
+        quote = self.resources.random_quote()
+        print("\n" + "="*40)
+        print(f"🌟 {quote['quote']}")
+        print(f"   — {quote['author']}")
+        print("="*40)
+        input("\nНажмите Enter, чтобы продолжить...")
+    
     def run(self):
         """Запустить режим низкой энергии"""
         while self.is_active():
@@ -124,14 +158,7 @@ class LowEnergyMode:
                 self.show_simple_exercise()
             
             elif choice == '3':
-                # Здесь можно добавить импорт из mental_support.py
-                try:
-                    from core.mental_support import show_random_quote_on_startup
-                    show_random_quote_on_startup()
-                    input("\nНажмите Enter, чтобы продолжить...")
-                except:
-                    print("\n💡 Помните: маленькие шаги приводят к большим результатам")
-                    input("\nНажмите Enter, чтобы продолжить...")
+                self.show_quote()
             
             elif choice == '4':
                 self.deactivate()
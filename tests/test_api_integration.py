@@ -0,0 +1,100 @@
+import sys
+sys.path.append('.')
+
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from src.core.api_integration import CrisisAPIService
+from src.core.service_health import STATE_CLOSED, STATE_HALF_OPEN, STATE_OPEN, HealthRegistry
+
+class FakeResponse:
+    def __init__(self, status_code, data=None):
+        self.status_code = status_code
+        self._data = data
+    
+    def json(self):
+        return self._data
+
+class FakeHttp:
+    """Отвечает после задержки; release() отпускает «зависшие» запросы."""
+    
+    def __init__(self, delay=0.0, status_code=200, tag="first"):
+        self.delay = delay
+        self.tag = tag
+        self.status_code = status_code
+        self.calls = 0
+        self.unblocked = threading.Event()
+    
+    def _respond(self, url):
+        self.calls += 1
+        self.unblocked.wait(self.delay)
+        return FakeResponse(self.status_code, {"url": url, "tag": self.tag})
+    
+    def get(self, url, **kwargs):
+        return self._respond(url)
+    
+    def post(self, url, **kwargs):
+        return self._respond(url)
+
+def test_unreachable_services_fall_back_within_deadline():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        service = CrisisAPIService(cache_file=str(Path(temp_dir) / "cache.json"), deadline=0.2, health=HealthRegistry())
+        service.http = FakeHttp(delay=5)
+        
+        started = time.monotonic()
+        results = service.fetch_all()
+        assert time.monotonic() - started < 1.0
+        
+        assert results["psyhelp_hotline"] == service.crisis_contacts()
+        assert any(contact["phone"] == "112" for contact in results["psyhelp_hotline"])
+        assert "error" in results["mindful_meditations"] and "error" in results["psyhelp_find"]
+        service.http.unblocked.set()
+        service.close(wait=True)
+
+def test_stale_entries_are_served_while_revalidating_and_persisted():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        cache_file = str(Path(temp_dir) / "cache.json")
+        with CrisisAPIService(cache_file=cache_file, deadline=1.0, health=HealthRegistry()) as service:
+            service.http = FakeHttp()
+            first = service.get_meditations()
+        assert first["tag"] == "first"
+        
+        # Новый экземпляр читает кэш с диска; запись устарела, сервис «завис»
+        service = CrisisAPIService(cache_file=cache_file, deadline=1.0, health=HealthRegistry())
+        service.cache.ttl = 0
+        service.http = FakeHttp(delay=5, tag="refreshed")
+        started = time.monotonic()
+        assert service.get_meditations() == first
+        assert time.monotonic() - started < 0.5
+        
+        service.http.unblocked.set()
+        service.close(wait=True)
+        assert service.cache.get("mindful_meditations").value["tag"] == "refreshed"
+        with CrisisAPIService(cache_file=cache_file, health=HealthRegistry()) as reopened:
+            assert reopened.cache.get("mindful_meditations").value["tag"] == "refreshed"
+
+def test_open_circuit_fails_fast_without_calling_the_service():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        health = HealthRegistry(failure_threshold=2, cooldown=60)
+        service = CrisisAPIService(cache_file=str(Path(temp_dir) / "cache.json"), health=health)
+        service.http = FakeHttp(status_code=503)
+        
+        for _ in range(2):
+            assert service.get_hotlines() == service.crisis_contacts()
+        assert health.get("psyhelp_hotline").breaker.state == STATE_OPEN
+        
+        assert service.get_hotlines() == service.crisis_contacts()
+        assert service.http.calls == 2
+        snapshot = health.snapshot(["psyhelp_hotline"])["psyhelp_hotline"]
+        assert snapshot["error_rate"] == 1.0 and snapshot["p95"] is not None
+        
+        # После паузы пропускается один пробный запрос; успех закрывает выключатель
+        breaker = health.get("psyhelp_hotline").breaker
+        breaker.cooldown = 0
+        assert breaker.allow() and breaker.state == STATE_HALF_OPEN
+        assert not breaker.allow()
+        breaker.record_success()
+        assert breaker.state == STATE_CLOSED
+        service.close(wait=True)
@@ -0,0 +1,108 @@
+import sys
+sys.path.append('.')
+
+import http.client
+import json
+import threading
+import time
+from urllib.parse import urlsplit
+
+import pytest
+
+from src.api.server import CompassService, start_api_server
+from src.core.tracker_pool import TrackerPool
+
+@pytest.fixture
+def api(tmp_path):
+    pool = TrackerPool(
+        default_progress_file=str(tmp_path / "progress.json"),
+        profiles_dir=str(tmp_path / "profiles"),
+    )
+    service = CompassService(pool, io_workers=2)
+    server, url = start_api_server(service)
+    parts = urlsplit(url)
+    connection = http.client.HTTPConnection(parts.hostname, parts.port, timeout=10)
+
+    def request(method, path, body=None):
+        payload = json.dumps(body).encode("utf-8") if body is not None else None
+        connection.request(method, path, body=payload)
+        response = connection.getresponse()
+        data = response.read().decode("utf-8")
+        is_json = response.getheader("Content-Type", "").startswith("application/json")
+        return response.status, json.loads(data) if is_json else data
+
+    yield request, pool, url
+    connection.close()
+    server.shutdown()
+    service.close()
+
+def test_marks_progress_and_portfolio_over_one_connection(api):
+    request, pool, _ = api
+    status, body = request("POST", "/users/alice/marks", {"marker_ids": ["python_1_1", "python_1_1", "no_such_marker"]})
+    assert status == 200
+    assert body == {"results": {"python_1_1": "completed", "no_such_marker": "not_found"}, "completed": 1}
+
+    status, body = request("POST", "/users/alice/marks", {"marker_id": "python_1_1"})
+    assert body["results"] == {"python_1_1": "already_completed"}
+
+    status, progress = request("GET", "/users/alice/progress")
+    assert status == 200 and progress["completed"] == 1
+    assert progress["skills"]["Python"]["completed"] == 1
+    assert pool.progress_file_for("alice").exists()
+    assert request("GET", "/users/bob/progress")[1]["completed"] == 0
+
+    status, portfolio = request("GET", "/users/alice/portfolio")
+    assert status == 200 and portfolio.startswith("# ")
+    assert pool.get("alice").markers["Python"].levels["1"][0].marker in portfolio
+
+def test_recommendations_search_and_errors(api):
+    request, pool, _ = api
+    status, body = request("GET", "/users/alice/recommendations?limit=2")
+    assert status == 200 and len(body["markers"]) == 2 and body["total"] >= 2
+    assert all(marker["priority"] == "high" for marker in body["markers"])
+
+    status, body = request("GET", "/search?q=git&limit=3")
+    assert status == 200 and 0 < len(body["markers"]) <= 3
+
+    assert request("GET", "/search")[0] == 400
+    assert request("GET", "/users/alice/recommendations?limit=x")[0] == 400
+    assert request("POST", "/users/alice/marks", {"marker_ids": "python_1_1"})[0] == 400
+    assert request("GET", "/users/alice/marks")[0] == 405
+    assert request("GET", "/nowhere")[0] == 404
+    assert request("GET", "/health")[1]["status"] == "ok"
+
+def test_held_tracker_lock_does_not_stall_other_requests(api):
+    request, pool, url = api
+    assert request("GET", "/users/alice/progress")[0] == 200
+    parts = urlsplit(url)
+    held, release = threading.Event(), threading.Event()
+
+    def hold_lock():
+        # Как долгое сохранение: блокировка трекера alice занята
+        with pool.get("alice").lock:
+            held.set()
+            release.wait(10)
+
+    def blocked_request(results):
+        connection = http.client.HTTPConnection(parts.hostname, parts.port, timeout=10)
+        connection.request("GET", "/users/alice/progress")
+        results.append(connection.getresponse().status)
+        connection.close()
+
+    holder = threading.Thread(target=hold_lock)
+    holder.start()
+    assert held.wait(5)
+    results = []
+    waiter = threading.Thread(target=blocked_request, args=(results,))
+    waiter.start()
+    time.sleep(0.2)
+    try:
+        started = time.monotonic()
+        assert request("GET", "/health")[1]["status"] == "ok"
+        assert request("GET", "/users/bob/progress")[0] == 200
+        assert time.monotonic() - started < 1.0 and not results
+    finally:
+        release.set()
+        holder.join()
+        waiter.join()
+    assert results == [200]
@@ -0,0 +1,48 @@
+import sys
+sys.path.append('.')
+
+import json
+
+from src.core.catalog_version import CatalogMigrations, catalog_version
+from src.core.tracker import CareerTracker, Marker, SkillData
+
+def make_marker(marker_id):
+    return Marker(marker_id, f"маркер {marker_id}", "", "high", [], {})
+
+def test_version_ignores_order_but_tracks_moves_between_levels():
+    catalog = {"Git": SkillData("Git", "", {"1": [make_marker("a"), make_marker("b")], "2": [make_marker("c")]})}
+    reordered = {"Git": SkillData("Git", "", {"2": [make_marker("c")], "1": [make_marker("b"), make_marker("a")]})}
+    moved = {"Git": SkillData("Git", "", {"1": [make_marker("a")], "2": [make_marker("b"), make_marker("c")]})}
+    assert catalog_version(catalog) == catalog_version(reordered)
+    assert catalog_version(catalog) != catalog_version(moved)
+
+def test_steps_compose_from_recorded_version(tmp_path):
+    migrations = CatalogMigrations(str(tmp_path / "migrations.json"))
+    migrations.record("v1")
+    migrations.record("v2", renamed={"a": "b", "x": "y"})
+    migrations.record("v3", renamed={"b": "c"}, removed=["y", "gone"])
+
+    assert migrations.migrate(["a", "x", "gone", "keep", "c"], None) == ["c", "keep"]
+    assert migrations.migrate(["b", "y", "keep"], "v2") == ["c", "keep"]
+    assert migrations.migrate(["a", "b"], "v3") == ["a", "b"]
+    assert len(CatalogMigrations(str(tmp_path / "migrations.json"))) == 3
+
+def test_tracker_migrates_old_progress_and_records_version(tmp_path):
+    migrations_file = tmp_path / "migrations.json"
+    progress_file = tmp_path / "progress.json"
+    progress_file.write_text(json.dumps({
+        "completed_markers": ["python_basics_old", "removed_marker"],
+        "in_progress_markers": [],
+    }), encoding="utf-8")
+
+    tracker = CareerTracker(progress_file=str(progress_file), migrations_file=str(migrations_file))
+    tracker.migrations.record(tracker.catalog_version, renamed={"python_basics_old": "python_1_1"},
+                              removed=["removed_marker"])
+    tracker = CareerTracker(progress_file=str(progress_file), migrations_file=str(migrations_file))
+    assert tracker.progress["completed_markers"] == ["python_1_1"]
+
+    assert tracker.upgrade_progress_file()
+    data = json.loads(progress_file.read_text(encoding="utf-8"))
+    assert data["catalog_version"] == tracker.catalog_version
+    assert data["completed_markers"] == ["python_1_1"]
+    assert not CareerTracker(progress_file=str(progress_file), migrations_file=str(migrations_file)).upgrade_progress_file()
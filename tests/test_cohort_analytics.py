@@ -0,0 +1,52 @@
+import sys
+sys.path.append('.')
+
+import json
+
+import numpy as np
+
+from src.core.tracker import Marker, SkillData
+from src.utils.cohort_analytics import CohortMatrix, load_cohort, profile_progress_files
+
+def make_markers():
+    def level(prefix, count):
+        return [Marker(f"{prefix}_{i}", "маркер", "", "high", [], {}) for i in range(count)]
+    return {
+        "Git": SkillData("Git", "", {"1": level("git_1", 2), "2": level("git_2", 2)}),
+        "Python": SkillData("Python", "", {"1": level("python_1", 4)}),
+    }
+
+def test_cohort_counts_distributions_and_co_completion():
+    cohort = CohortMatrix(make_markers()).load({
+        "alice": ["git_1_0", "git_1_1", "git_2_0", "python_1_0"],
+        "bob": ["git_1_0", "python_1_0", "python_1_1", "python_1_2", "python_1_3", "removed_marker"],
+        "carol": [],
+    })
+
+    assert cohort.completed.shape == (3, 8) and cohort.unknown_markers == 1
+    assert cohort.user_totals().tolist() == [4, 5, 0]
+    assert cohort.skill_counts().tolist() == [[3, 1], [1, 4], [0, 0]]
+    assert cohort.level_counts().tolist() == [[2, 1, 1], [1, 0, 4], [0, 0, 0]]
+    assert [item["skill_name"] for item in cohort.skill_strength()] == ["Python", "Git"]
+
+    # Git: 0.75, 0.25, 0 → корзины 3, 1, 0 из 4; Python: 0.25, 1.0, 0 → 1, 3 (последняя), 0
+    assert cohort.skill_distribution(bins=4).tolist() == [[1, 1, 0, 1], [1, 1, 0, 1]]
+
+    git_1, git_2, python_1 = cohort.level_stats()
+    assert git_1["finished_share"] == 1 / 3 and git_1["stalled_share"] == 1 / 3
+    assert git_2["stalled_share"] == 1 / 3 and python_1["finished_share"] == 1 / 3
+
+    assert np.allclose(cohort.percentiles(q=(50,))["total"], [4])
+    assert cohort.skill_co_completion(threshold=0.5).tolist() == [[1, 0], [0, 1]]
+    ids, pairs = cohort.marker_co_completion(["git_1_0", "python_1_0"])
+    assert pairs.tolist() == [[2, 2], [2, 2]]
+
+def test_profiles_are_loaded_skipping_sidecar_files(tmp_path):
+    (tmp_path / "alice.json").write_text(json.dumps({"completed_markers": ["git_1_0"]}), encoding="utf-8")
+    (tmp_path / "alice.summary.json").write_text(json.dumps({"version": 1}), encoding="utf-8")
+    (tmp_path / "broken.json").write_text("{", encoding="utf-8")
+
+    files = profile_progress_files(str(tmp_path))
+    assert sorted(files) == ["alice", "broken"]
+    cohort = load_cohort(make_markers(), files)
+    assert cohort.users == ["alice"] and cohort.user_totals().tolist() == [1]
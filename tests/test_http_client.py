@@ -0,0 +1,86 @@
+import sys
+sys.path.append('.')
+
+import time
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+import pytest
+import requests
+
+from src.core import http_client
+from src.core.http_client import HttpClient, TokenBucket
+
+class FakeResponse:
+    def __init__(self, status_code, headers=None):
+        self.status_code = status_code
+        self.headers = headers or {}
+    
+    def close(self):
+        pass
+
+class FakeSession:
+    """Отдаёт заранее заданные ответы (или исключения) по порядку."""
+    
+    def __init__(self, outcomes):
+        self.outcomes = list(outcomes)
+        self.calls = 0
+    
+    def request(self, method, url, **kwargs):
+        self.calls += 1
+        outcome = self.outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    delays = []
+    monkeypatch.setattr(http_client.time, "sleep", delays.append)
+    return delays
+
+def make_client(outcomes, max_retries=3):
+    client = HttpClient(max_retries=max_retries, backoff_base=0.5, backoff_max=4.0)
+    client.session = FakeSession(outcomes)
+    return client
+
+def test_429_honours_retry_after_seconds(sleeps):
+    client = make_client([FakeResponse(429, {"Retry-After": "2"}), FakeResponse(200)])
+    assert client.get("https://api.example.com/v1").status_code == 200
+    assert sleeps == [2.0]
+
+def test_429_honours_retry_after_http_date(sleeps):
+    retry_at = format_datetime(datetime.now(timezone.utc) + timedelta(seconds=30), usegmt=True)
+    client = make_client([FakeResponse(429, {"Retry-After": retry_at}), FakeResponse(200)])
+    assert client.get("https://api.example.com/v1").status_code == 200
+    assert len(sleeps) == 1 and 25 <= sleeps[0] <= 30
+
+def test_5xx_retries_stop_after_max_retries(sleeps):
+    client = make_client([FakeResponse(503)] * 5, max_retries=2)
+    response = client.get("https://api.example.com/v1")
+    assert response.status_code == 503
+    assert client.session.calls == 3
+    assert len(sleeps) == 2 and all(0 <= delay <= 4.0 for delay in sleeps)
+
+def test_non_retryable_status_is_returned_immediately(sleeps):
+    client = make_client([FakeResponse(404)])
+    assert client.get("https://api.example.com/v1").status_code == 404
+    assert sleeps == []
+
+def test_connection_error_is_reraised_after_last_attempt(sleeps):
+    client = make_client([requests.ConnectionError("down")] * 3, max_retries=2)
+    with pytest.raises(requests.ConnectionError):
+        client.get("https://api.example.com/v1")
+    assert client.session.calls == 3 and len(sleeps) == 2
+
+def test_connection_error_then_success(sleeps):
+    client = make_client([requests.Timeout("slow"), FakeResponse(200)])
+    assert client.post("https://api.example.com/v1", json={}).status_code == 200
+
+def test_token_bucket_spaces_out_calls():
+    bucket = TokenBucket(rate=20, burst=1)
+    started = time.monotonic()
+    for _ in range(5):
+        bucket.acquire()
+    # Первый токен есть сразу, остальные четыре — по одному каждые 50 мс
+    assert time.monotonic() - started >= 0.18
@@ -0,0 +1,36 @@
+import threading
+import sys
+sys.path.append('.')
+
+from src.utils.jobs import JobRunner, JOB_DONE, JOB_FAILED
+
+def _wait(runner, job_id, timeout=5.0):
+    import time
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        job = runner.get(job_id)
+        if not job.is_active:
+            return job
+        time.sleep(0.01)
+    raise AssertionError("Задача не завершилась вовремя")
+
+def test_duplicate_submission_is_deduplicated():
+    runner = JobRunner(max_workers=2)
+    release = threading.Event()
+    first = runner.submit("portfolio", release.wait, 5)
+    second = runner.submit("portfolio", release.wait, 5)
+    assert first.id == second.id
+    
+    release.set()
+    job = _wait(runner, first.id)
+    assert job.status == JOB_DONE
+    assert runner.submit("portfolio", lambda: 1).id != first.id
+    runner.shutdown()
+
+def test_failed_job_records_error():
+    runner = JobRunner(max_workers=1)
+    job = runner.submit("broken", lambda: 1 / 0)
+    job = _wait(runner, job.id)
+    assert job.status == JOB_FAILED
+    assert "division" in job.error
+    runner.shutdown()
@@ -0,0 +1,11 @@
+import sys
+sys.path.append('.')
+
+from src.core.tracker import load_markers
+from src.utils.marker_index import MarkerIndex
+
+def test_marker_index_ranks_relevant_markers_first():
+    index = MarkerIndex(load_markers("src/data/markers"))
+    results = index.search("Написала Dockerfile и собрала образ по инструкции", limit=3)
+    assert results[0][1].id == "docker_1_1"
+    assert index.search("zzzz qqqq", limit=3) == []
@@ -0,0 +1,21 @@
+import sys
+sys.path.append('.')
+
+from src.utils.match_aggregator import aggregate_matches, parse_threshold
+
+def test_aggregate_matches_merges_duplicates_and_applies_threshold():
+    matches = [
+        {"matched_marker_id": "git_1_1", "confidence": "низкая", "context_snippet": "git init", "source_file": "a.md"},
+        {"matched_marker_id": "git_1_1", "confidence": "низкая", "context_snippet": "git commit", "source_file": "b.md"},
+        {"matched_marker_id": "python_1_1", "confidence": "высокая", "context_snippet": "скрипт", "source_file": "a.md"},
+        {"matched_marker_id": "python_1_1", "confidence": "средняя", "context_snippet": "скрипт", "source_file": "a.md"},
+        {"matched_marker_id": "docker_1_1", "confidence": "низкая", "context_snippet": "docker"},
+    ]
+    
+    aggregated = aggregate_matches(matches, min_confidence=0.5)
+    assert [item["matched_marker_id"] for item in aggregated] == ["python_1_1", "git_1_1"]
+    assert aggregated[0]["count"] == 2 and aggregated[0]["evidence"] == ["скрипт"]
+    assert aggregated[1]["score"] == 0.51 and aggregated[1]["sources"] == ["a.md", "b.md"]
+    
+    assert [item["matched_marker_id"] for item in aggregate_matches(matches, method="max", min_confidence=0.5)] == ["python_1_1"]
+    assert parse_threshold("средняя") == 0.6
@@ -0,0 +1,24 @@
+import sys
+sys.path.append('.')
+
+from src.utils.notes_chunker import estimate_tokens, split_into_chunks
+
+def test_chunks_respect_token_budget_and_keep_text():
+    paragraphs = [f"Абзац {i}: " + "слово " * 40 for i in range(30)]
+    text = "\n\n".join(paragraphs)
+    chunks = split_into_chunks(text, max_tokens=200, chars_per_token=3)
+    
+    assert len(chunks) > 1
+    assert all(len(chunk) <= 600 for chunk in chunks)
+    assert "\n\n".join(chunks) == "\n\n".join(p.strip("\n") for p in paragraphs)
+
+def test_heading_starts_new_chunk_when_chunk_is_half_full():
+    text = "# Первый\n" + "a" * 80 + "\n# Второй\n" + "b" * 10
+    chunks = split_into_chunks(text, max_tokens=50, chars_per_token=3)
+    assert chunks[0].startswith("# Первый")
+    assert chunks[1].startswith("# Второй")
+
+def test_oversized_line_is_hard_split():
+    chunks = split_into_chunks("x" * 1000, max_tokens=100, chars_per_token=3)
+    assert [len(chunk) for chunk in chunks] == [300, 300, 300, 100]
+    assert estimate_tokens("x" * 10, chars_per_token=3) == 4
@@ -0,0 +1,32 @@
+import sys
+sys.path.append('.')
+
+import os
+import tempfile
+from pathlib import Path
+
+from src.utils.notes_manifest import NotesManifest
+
+def test_manifest_reports_only_new_changed_and_drops_deleted_files():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        root = Path(temp_dir) / "notes"
+        (root / "sub").mkdir(parents=True)
+        (root / "a.md").write_text("первая заметка", encoding="utf-8")
+        (root / "sub" / "b.txt").write_text("вторая заметка", encoding="utf-8")
+        (root / "image.png").write_bytes(b"\x89PNG")
+        manifest_file = Path(temp_dir) / "manifest.json"
+        
+        manifest = NotesManifest(manifest_file, root, analysis_key="v1")
+        changed = manifest.plan([".md", ".txt"])
+        assert [scanned.relative_path for scanned in changed] == ["a.md", "sub/b.txt"]
+        for scanned in changed:
+            manifest.record(scanned, [{"matched_marker_id": "python_1_1"}])
+        assert manifest.save()
+        
+        (root / "a.md").write_text("изменённая заметка", encoding="utf-8")
+        os.remove(root / "sub" / "b.txt")
+        manifest = NotesManifest(manifest_file, root, analysis_key="v1")
+        assert [scanned.relative_path for scanned in manifest.plan([".md", ".txt"])] == ["a.md"]
+        assert list(manifest.files) == ["a.md"]
+        
+        assert NotesManifest(manifest_file, root, analysis_key="v2").files == {}
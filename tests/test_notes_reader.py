@@ -0,0 +1,40 @@
+import sys
+sys.path.append('.')
+
+import json
+import tempfile
+from pathlib import Path
+
+import src.utils.notes_reader as notes_reader
+from src.utils.notes_reader import iter_text_blocks
+
+def test_streaming_reader_extracts_chat_messages_and_skips_binary():
+    export = {"mapping": {"1": {"message": {"author": {"role": "user"},
+                                            "content": {"content_type": "text",
+                                                        "parts": ["Собрал образ \"v2\"\nчерез Dockerfile"]}}}},
+              "messages": [{"type": "message", "text": ["Ссылка: ", {"type": "link", "text": "https://x"}]}]}
+    with tempfile.TemporaryDirectory() as temp_dir:
+        chat = Path(temp_dir) / "chat.json"
+        chat.write_text(json.dumps(export, ensure_ascii=False), encoding="utf-8")
+        binary = Path(temp_dir) / "dump.txt"
+        binary.write_bytes(b"\x00\x01\x02binary")
+        
+        expected = ['Собрал образ "v2"\nчерез Dockerfile', "Ссылка: ", "https://x"]
+        assert list(notes_reader.iter_note_blocks(chat)) == expected
+        # Разбор не зависит от того, где проходят границы блоков чтения
+        original_read_size = notes_reader.READ_SIZE
+        notes_reader.READ_SIZE = 5
+        try:
+            assert list(notes_reader.iter_json_messages(chat)) == expected
+        finally:
+            notes_reader.READ_SIZE = original_read_size
+        assert list(notes_reader.iter_note_blocks(binary)) == []
+
+def test_text_blocks_align_to_paragraphs():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        notes = Path(temp_dir) / "notes.md"
+        notes.write_text("\n\n".join("строка " * 10 for _ in range(50)), encoding="utf-8")
+        blocks = list(iter_text_blocks(notes, block_size=200))
+        assert len(blocks) > 1
+        assert all(block.endswith("\n\n") for block in blocks[:-1])
+        assert "".join(blocks) == notes.read_text(encoding="utf-8")
@@ -0,0 +1,42 @@
+import sys
+sys.path.append('.')
+
+import pickle
+
+import numpy as np
+
+from src.core.tracker import load_markers
+from src.utils.offline_matcher import OfflineMatcher, init_worker, match_in_worker
+from src.utils.text_features import STEM_FLAG, featurize
+
+def test_offline_matcher_ranks_markers_and_buckets_confidence():
+    matcher = OfflineMatcher(load_markers("src/data/markers"))
+    results = matcher.match([
+        "Сегодня написал скрипт на Python\nдля автоматизации рутинной задачи.",
+        "Сварила борщ и погуляла в парке",
+    ])
+    
+    assert results[0][0]["matched_marker_id"] == "python_1_1"
+    assert results[0][0]["confidence"] == "высокая"
+    assert set(results[0][0]) == {"matched_marker_id", "context_snippet", "confidence", "comment"}
+    assert results[1] == []
+
+def test_offline_matcher_survives_pickling_for_worker_processes():
+    matcher = OfflineMatcher(load_markers("src/data/markers"))
+    chunks = ["Написала Dockerfile и собрала образ", "Сделала первый коммит в git"]
+    expected = matcher.match(chunks)
+    
+    init_worker(pickle.loads(pickle.dumps(matcher)))
+    assert match_in_worker(chunks) == expected
+
+def test_featurize_emits_stems_and_padded_trigrams_without_stop_words():
+    rows, keys = featurize(["Скрипта и скриптов", "", "Ёлка C#"])
+    
+    stems = keys[(keys & STEM_FLAG) != 0]
+    # "скрипта"/"скриптов" дают один стем; "и" — стоп-слово; "ёлка" == "елка"
+    assert len(np.unique(stems)) == 3
+    assert rows.tolist().count(0) == 2 + (7 + 2 - 2) + (8 + 2 - 2)
+    assert rows.tolist().count(1) == 0
+    assert np.array_equal(featurize(["ёлка"])[1], featurize(["ЕЛКА"])[1])
+    # "c#" короче n-граммы: только стем
+    assert len(featurize(["c#"])[1]) == 1
@@ -0,0 +1,70 @@
+import sys
+sys.path.append('.')
+
+import random
+
+import pytest
+
+from src.core.prerequisites import PrerequisiteGraph, UnlockedFrontier
+from src.core.tracker import CareerTracker, Marker, SkillData
+
+def make_marker(marker_id, priority="medium", prerequisites=None):
+    return Marker(marker_id, f"маркер {marker_id}", "", priority, [], {}, prerequisites=prerequisites)
+
+def make_catalog():
+    return {
+        "Git": SkillData("Git", "", {
+            "2": [make_marker("git_2_1", "high")],
+            "1": [make_marker("git_1_1"), make_marker("git_1_2")],
+        }),
+        "Docker": SkillData("Docker", "", {
+            "1": [make_marker("docker_1_1", prerequisites=["git_1_1"])],
+            "2": [make_marker("docker_2_1", prerequisites=[])],
+        }),
+    }
+
+def test_graph_uses_previous_level_unless_prerequisites_are_explicit():
+    graph = PrerequisiteGraph(make_catalog())
+    order = graph.topological_ids()
+    assert order.index("git_1_1") < order.index("git_2_1") and order.index("git_1_1") < order.index("docker_1_1")
+    assert graph.all_prerequisites("git_2_1") == ["git_1_1", "git_1_2"]
+    assert graph.requires("docker_1_1", "git_1_1") and not graph.requires("docker_2_1", "docker_1_1")
+    # git_1_* ведут к high-priority git_2_1, docker — нет
+    assert [marker_id for i, marker_id in enumerate(graph.ids) if graph.leads_to_high[i]] == ["git_1_1", "git_1_2", "git_2_1"]
+
+def test_cycle_is_rejected():
+    catalog = {"Git": SkillData("Git", "", {"1": [
+        make_marker("a", prerequisites=["b"]), make_marker("b", prerequisites=["a"]),
+    ]})}
+    with pytest.raises(ValueError):
+        PrerequisiteGraph(catalog)
+
+def test_incremental_frontier_matches_rebuild():
+    graph = PrerequisiteGraph(make_catalog())
+    frontier = UnlockedFrontier(graph, [])
+    assert frontier.ids() == ["git_1_1", "git_1_2", "docker_2_1"]
+
+    rng = random.Random(7)
+    completed = set()
+    for _ in range(200):
+        marker_id = rng.choice(graph.ids)
+        if marker_id in completed:
+            completed.discard(marker_id)
+            frontier.revert(marker_id)
+        else:
+            completed.add(marker_id)
+            frontier.complete(marker_id)
+        assert frontier.ids() == UnlockedFrontier(graph, completed).ids()
+
+def test_tracker_recommends_advanced_markers_only_after_basics(tmp_path):
+    tracker = CareerTracker(progress_file=str(tmp_path / "progress.json"))
+    recommended = lambda: [marker.id for _, marker in tracker.recommended_markers()]
+    assert "python_1_1" in recommended() and "python_2_1" not in recommended()
+
+    assert tracker.mark_completed("python_1_1")
+    # Средний по приоритету python_1_2 рекомендуется: без него не открыть high-priority python_2_1
+    assert "python_1_2" in recommended() and "python_2_1" not in recommended()
+    assert tracker.mark_completed_batch(["python_1_2"]) == {"python_1_2": "completed"}
+    assert "python_2_1" in recommended()
+    assert tracker.revert_completed("python_1_2")
+    assert "python_2_1" not in recommended()
@@ -0,0 +1,75 @@
+import sys
+sys.path.append('.')
+
+import json
+
+import pytest
+
+from src.core.progress_bitset import (
+    PROGRESS_FORMAT_BITSET, MarkerOrdinals, ProgressBitset, intersect_all, progress_from_bitset,
+    progress_to_bitset, union_all
+)
+from src.core.tracker import CareerTracker
+
+def test_ordinals_are_stable_and_versioned(tmp_path):
+    ordinals_file = tmp_path / "ordinals.json"
+    ordinals = MarkerOrdinals(str(ordinals_file))
+    ordinals.assign(["git_1_1", "python_1_1"])
+    assert not ordinals.assign(["python_1_1"])
+    ordinals.assign(["docker_1_1"])
+
+    reopened = MarkerOrdinals(str(ordinals_file))
+    assert reopened.version == 2
+    assert [reopened.ordinal(marker_id) for marker_id in ("git_1_1", "python_1_1", "docker_1_1")] == [0, 1, 2]
+
+def test_two_processes_never_share_an_ordinal(tmp_path):
+    ordinals_file = tmp_path / "ordinals.json"
+    # Два экземпляра на один файл — как два процесса
+    first, second = MarkerOrdinals(str(ordinals_file)), MarkerOrdinals(str(ordinals_file))
+    assert first.assign(["git_1_1"])
+    assert second.assign(["python_1_1"])
+    assert second.ids == ["git_1_1", "python_1_1"] and second.version == 2
+
+    encoded = progress_to_bitset({"completed_markers": ["python_1_1"], "in_progress_markers": []}, second)
+    first.reload()
+    assert progress_from_bitset(encoded, first)["completed_markers"] == ["python_1_1"]
+
+    ordinals_file.write_text(json.dumps({"version": 3, "ids": ["docker_1_1", "git_1_1", "python_1_1"]}), encoding="utf-8")
+    with pytest.raises(ValueError):
+        first.reload()
+
+def test_set_algebra_and_lossless_json_round_trip(tmp_path):
+    ordinals = MarkerOrdinals(str(tmp_path / "ordinals.json"))
+    alice = ordinals.bitset(["git_1_1", "python_1_1", "python_1_2"])
+    bob = ordinals.bitset(["python_1_1", "docker_1_1"])
+
+    assert len(alice | bob) == 4 and (alice & bob).ids(ordinals) == ["python_1_1"]
+    added, removed = bob.diff(alice)
+    assert added.ids(ordinals) == ["docker_1_1"] and sorted(removed.ids(ordinals)) == ["git_1_1", "python_1_2"]
+    assert union_all([alice, bob]) == alice | bob and intersect_all([alice, bob]) == alice & bob
+    assert ProgressBitset.decode(alice.encode()) == alice and ProgressBitset.decode(ProgressBitset().encode()) == ProgressBitset()
+
+    progress = {"completed_markers": ["python_1_2", "git_1_1", "unknown_9_9"], "in_progress_markers": ["docker_1_1"]}
+    encoded = progress_to_bitset(progress, ordinals)
+    decoded = progress_from_bitset(json.loads(json.dumps(encoded)), ordinals)
+    assert sorted(decoded["completed_markers"]) == sorted(progress["completed_markers"])
+    assert decoded["in_progress_markers"] == ["docker_1_1"]
+
+    with pytest.raises(ValueError):
+        progress_from_bitset(dict(encoded, ordinals_version=ordinals.version + 1), ordinals)
+
+def test_tracker_stores_progress_as_bitset_and_reads_both_formats(tmp_path):
+    progress_file = tmp_path / "progress.json"
+    ordinals_file = str(tmp_path / "ordinals.json")
+    tracker = CareerTracker(progress_file=str(progress_file), progress_format=PROGRESS_FORMAT_BITSET,
+                            ordinals_file=ordinals_file)
+    assert tracker.mark_completed("python_1_1")
+    assert json.loads(progress_file.read_text(encoding="utf-8"))["format"] == PROGRESS_FORMAT_BITSET
+    assert "python_1_1" not in tracker.remaining_in_skill("Python")
+    assert "python_1_2" in tracker.remaining_in_skill("Python", level="1")
+
+    # Трекер в формате JSON читает битовый файл и сохраняет обратно списки
+    reader = CareerTracker(progress_file=str(progress_file), ordinals_file=ordinals_file)
+    assert reader.progress["completed_markers"] == ["python_1_1"]
+    assert reader.mark_completed("git_1_1")
+    assert json.loads(progress_file.read_text(encoding="utf-8"))["completed_markers"] == ["python_1_1", "git_1_1"]
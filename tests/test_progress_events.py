@@ -0,0 +1,53 @@
+import sys
+sys.path.append('.')
+
+import json
+from datetime import date, datetime
+
+from src.core.progress_events import EVENT_COMPLETED, EVENT_REVERTED, EVENT_STARTED, ProgressEventLog
+from src.core.tracker import CareerTracker
+
+def test_aggregates_are_updated_per_event_and_resume_from_offset(tmp_path):
+    events_file = tmp_path / "progress.events.jsonl"
+    log = ProgressEventLog(str(events_file))
+    log.record(EVENT_STARTED, "git_1_1", skill="Git", priority="high", at=datetime(2025, 3, 3, 10))
+    log.record(EVENT_COMPLETED, "git_1_1", skill="Git", priority="high", at=datetime(2025, 3, 4, 10))
+    log.record(EVENT_COMPLETED, "python_1_1", skill="Python", priority="high", at=datetime(2025, 3, 11, 10))
+    log.record(EVENT_COMPLETED, "python_1_2", skill="Python", priority="medium", at=datetime(2025, 3, 12, 10))
+    log.record(EVENT_REVERTED, "python_1_2", skill="Python", priority="medium", at=datetime(2025, 3, 12, 11))
+
+    assert log.stats["completed"] == 2 and log.stats["started"] == 1
+    assert log.stats["weekly"] == {"2025-W10": 1, "2025-W11": 1}
+    assert log.stats["skills"] == {"Git": 1, "Python": 1}
+    assert log.stats["priorities"] == {"high": 2, "medium": 0}
+    assert log.weekly_velocity(weeks=2, today=date(2025, 3, 12)) == 1.0
+    assert log.eta_weeks(3, weeks=2, today=date(2025, 3, 12)) == 3.0
+    assert log.eta_weeks(3, weeks=2, today=date(2026, 1, 1)) is None
+
+    # Запись другим процессом: новый экземпляр читает только хвост журнала
+    with open(events_file, "a", encoding="utf-8") as f:
+        f.write(json.dumps({"event": EVENT_COMPLETED, "marker_id": "docker_1_1", "skill": "Docker",
+                            "priority": "high", "level": "1", "at": "2025-03-13T09:00:00"}) + "\n")
+    reopened = ProgressEventLog(str(events_file))
+    assert reopened.stats["events"] == 6 and reopened.stats["skills"]["Docker"] == 1
+    assert reopened.stats["offset"] == events_file.stat().st_size
+
+    events_file.write_text("", encoding="utf-8")
+    reopened.refresh()
+    assert reopened.stats["events"] == 0
+
+def test_tracker_records_events_and_forecasts_levels(tmp_path):
+    tracker = CareerTracker(progress_file=str(tmp_path / "progress.json"))
+    assert tracker.mark_started("python_1_1")
+    assert tracker.mark_completed("python_1_1")
+    assert tracker.mark_completed("python_1_2")
+    assert tracker.revert_completed("python_1_2")
+
+    lines = (tmp_path / "progress.events.jsonl").read_text(encoding="utf-8").splitlines()
+    assert [json.loads(line)["event"] for line in lines] == [EVENT_STARTED, EVENT_COMPLETED, EVENT_COMPLETED, EVENT_REVERTED]
+    assert json.loads(lines[1])["level"] == "1" and json.loads(lines[1])["skill"] == "Python"
+
+    assert tracker.velocity() == 0.25
+    python = next(item for item in tracker.level_forecast() if item["skill_name"] == "Python")
+    assert python["level"] == "1"
+    assert python["eta_weeks"] == python["remaining"] / 0.25
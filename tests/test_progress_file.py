@@ -0,0 +1,44 @@
+import sys
+sys.path.append('.')
+
+import json
+
+import pytest
+
+from src.core.progress_bitset import PROGRESS_FORMAT_BITSET
+from src.core.progress_file import ProgressReadError, read_progress_file
+from src.core.tracker import CareerTracker
+from src.utils.cohort_analytics import load_cohort
+from src.utils.portfolio_gen import PortfolioGenerator
+
+def test_portfolio_and_cohort_read_bitset_progress(tmp_path):
+    progress_file = tmp_path / "progress.json"
+    ordinals_file = str(tmp_path / "ordinals.json")
+    tracker = CareerTracker(progress_file=str(progress_file), progress_format=PROGRESS_FORMAT_BITSET,
+                            ordinals_file=ordinals_file)
+    assert tracker.mark_completed_batch(["python_1_1", "git_1_1"]) == {"python_1_1": "completed", "git_1_1": "completed"}
+    assert json.loads(progress_file.read_text(encoding="utf-8"))["format"] == PROGRESS_FORMAT_BITSET
+
+    loaded = read_progress_file(str(progress_file), tracker.catalog_version, ordinals_file=ordinals_file)
+    assert sorted(loaded.progress["completed_markers"]) == ["git_1_1", "python_1_1"]
+
+    cohort = load_cohort(tracker.markers, {"alice": progress_file}, ordinals_file)
+    assert cohort.user_totals().tolist() == [2] and cohort.unknown_markers == 0
+
+    output_file = tmp_path / "portfolio.md"
+    generator = PortfolioGenerator(progress_file=str(progress_file), output_file=str(output_file),
+                                   ordinals_file=ordinals_file)
+    assert generator.generate_portfolio()
+    assert tracker.markers["Python"].levels["1"][0].marker in output_file.read_text(encoding="utf-8")
+
+def test_unreadable_file_is_never_overwritten(tmp_path):
+    progress_file = tmp_path / "progress.json"
+    progress_file.write_text("{не json", encoding="utf-8")
+    with pytest.raises(ProgressReadError):
+        read_progress_file(str(progress_file))
+    assert read_progress_file(str(tmp_path / "missing.json")) is None
+
+    tracker = CareerTracker(progress_file=str(progress_file))
+    assert tracker.progress["completed_markers"] == []
+    assert not tracker.mark_completed("python_1_1")
+    assert progress_file.read_text(encoding="utf-8") == "{не json"
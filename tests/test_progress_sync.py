@@ -0,0 +1,92 @@
+import sys
+sys.path.append('.')
+
+import json
+import os
+import threading
+
+from src.core import tracker as tracker_module
+from src.core.progress_sync import lock_file_for, merge_progress, progress_file_lock
+from src.core.tracker import CareerTracker
+
+def catalog_ids(tracker):
+    return [
+        marker.id
+        for skill_data in tracker.markers.values()
+        for level_markers in skill_data.levels.values()
+        for marker in level_markers
+    ]
+
+def test_merge_applies_our_changes_on_top_of_theirs():
+    base = {"completed_markers": ["a", "b"], "in_progress_markers": ["c"]}
+    ours = {"completed_markers": ["a", "c"], "in_progress_markers": []}
+    theirs = {"completed_markers": ["a", "b", "d"], "in_progress_markers": ["c", "e"]}
+    assert merge_progress(base, ours, theirs) == {
+        "completed_markers": ["a", "d", "c"],
+        "in_progress_markers": ["e"],
+    }
+
+def test_stale_tracker_merges_instead_of_overwriting(tmp_path):
+    progress_file = tmp_path / "progress.json"
+    first = CareerTracker(progress_file=str(progress_file))
+    second = CareerTracker(progress_file=str(progress_file))
+
+    assert first.mark_completed("python_1_1")
+    assert second.mark_completed("python_1_2")
+    data = json.loads(progress_file.read_text(encoding="utf-8"))
+    assert data["completed_markers"] == ["python_1_1", "python_1_2"] and data["revision"] == 2
+
+    # Отметка снята в одном трекере — второй подтягивает её без повторного чтения при неизменном файле
+    assert second.revert_completed("python_1_1")
+    assert first.refresh() and first.progress["completed_markers"] == ["python_1_2"]
+    assert not first.refresh()
+
+def test_failed_save_keeps_other_writers_markers(tmp_path, monkeypatch):
+    progress_file = tmp_path / "progress.json"
+    first = CareerTracker(progress_file=str(progress_file))
+    second = CareerTracker(progress_file=str(progress_file))
+    assert second.mark_completed_batch(["git_1_1"]) == {"git_1_1": "completed"}
+
+    real_replace = os.replace
+    calls = []
+
+    def failing_once(src, dst):
+        calls.append(dst)
+        if len(calls) == 1:
+            raise OSError("диск недоступен")
+        return real_replace(src, dst)
+
+    monkeypatch.setattr(tracker_module.os, "replace", failing_once)
+    assert first.mark_completed_batch(["python_1_1"]) == {"python_1_1": "error"}
+    assert first.mark_completed_batch(["python_1_2"]) == {"python_1_2": "completed"}
+    data = json.loads(progress_file.read_text(encoding="utf-8"))
+    assert data["completed_markers"] == ["git_1_1", "python_1_2"]
+
+def test_concurrent_writers_lose_no_updates(tmp_path):
+    progress_file = tmp_path / "progress.json"
+    trackers = [CareerTracker(progress_file=str(progress_file)) for _ in range(4)]
+    marker_ids = catalog_ids(trackers[0])[:20]
+
+    def work(index):
+        for marker_id in marker_ids[index::4]:
+            assert trackers[index].mark_completed_batch([marker_id]) == {marker_id: "completed"}
+
+    threads = [threading.Thread(target=work, args=(i,)) for i in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    data = json.loads(progress_file.read_text(encoding="utf-8"))
+    assert sorted(data["completed_markers"]) == sorted(marker_ids)
+    assert data["revision"] == len(marker_ids)
+    assert lock_file_for(str(progress_file)).exists()
+
+def test_lock_times_out_while_held(tmp_path):
+    progress_file = tmp_path / "progress.json"
+    with progress_file_lock(str(progress_file)):
+        try:
+            with progress_file_lock(str(progress_file), timeout=0.05):
+                raise AssertionError("блокировка получена дважды")
+        except TimeoutError:
+            pass
@@ -0,0 +1,23 @@
+import sys
+sys.path.append('.')
+
+import tempfile
+from pathlib import Path
+
+from src.utils.reasoning_cache import ResponseCache
+
+def test_response_cache_hits_and_evicts_least_recently_used():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        cache = ResponseCache(str(Path(temp_dir) / "cache.sqlite3"), max_bytes=350)
+        keys = [ResponseCache.make_key(f"chunk {i}", "catalog", "gpt-4", "1") for i in range(3)]
+        
+        cache.put(keys[0], [{"matched_marker_id": "python_1_1", "context_snippet": "x" * 80}])
+        cache.put(keys[1], [{"matched_marker_id": "python_1_2", "context_snippet": "y" * 80}])
+        assert cache.get(keys[0])[0]["matched_marker_id"] == "python_1_1"
+        cache.put(keys[2], [{"matched_marker_id": "git_1_1", "context_snippet": "z" * 80}])
+        
+        assert cache.get(keys[1]) is None
+        assert cache.get(keys[0]) is not None
+        stats = cache.stats()
+        assert stats["hits"] == 2 and stats["misses"] == 1 and stats["evictions"] == 1
+        cache.close()
@@ -0,0 +1,132 @@
+import sys
+sys.path.append('.')
+sys.path.append('scripts')
+
+import json
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import reasoning_integration
+from reasoning_integration import ReasoningIntegrator
+from reasoning_stub_server import canned_matches
+from src.core.tracker import CareerTracker
+
+class FakeResponse:
+    def __init__(self, data):
+        self._data = data
+    
+    def raise_for_status(self):
+        pass
+    
+    def json(self):
+        return self._data
+
+class FakeReasoningApi:
+    """Вместо HTTP отвечает детерминированными совпадениями локальной заглушки."""
+    
+    def __init__(self):
+        self.calls = 0
+    
+    def post(self, url, json=None, **kwargs):
+        self.calls += 1
+        content = canned_matches(json["messages"][-1]["content"], max_matches=2)
+        return FakeResponse({"choices": [{"message": {"content": _dumps(content)}}]})
+
+def _dumps(data):
+    return json.dumps(data, ensure_ascii=False)
+
+def write_archive(root: Path, count: int) -> Path:
+    notes = root / "notes"
+    notes.mkdir()
+    for i in range(count):
+        (notes / f"note_{i:02}.md").write_text(
+            f"Заметка {i}: написала скрипт на Python, собрала Docker образ и сделала git commit номер {i}",
+            encoding="utf-8"
+        )
+    return notes
+
+def make_integrator(tmp_path: Path, monkeypatch, api: bool = True, cache: bool = True) -> ReasoningIntegrator:
+    monkeypatch.setenv("REASONING_CACHE", "1" if cache else "0")
+    monkeypatch.setenv("REASONING_CACHE_FILE", str(tmp_path / "cache.sqlite3"))
+    monkeypatch.delenv("REASONING_API_KEY", raising=False)
+    integrator = ReasoningIntegrator(CareerTracker(progress_file=str(tmp_path / "progress.json")))
+    if api:
+        integrator.reasoning_api_key = "test"
+        integrator.http = FakeReasoningApi()
+    return integrator
+
+def test_response_cache_is_reused_across_directory_runs(tmp_path, monkeypatch):
+    integrator = make_integrator(tmp_path, monkeypatch)
+    notes = write_archive(tmp_path, 5)
+    
+    first = integrator.process_notes_directory(str(notes), manifest_file=str(tmp_path / "first.json"))
+    requests_sent = integrator.http.calls
+    assert requests_sent >= 1 and first
+    
+    # Другой манифест: все файлы анализируются заново, но ответы берутся из кэша
+    second = integrator.process_notes_directory(str(notes), manifest_file=str(tmp_path / "second.json"))
+    assert integrator.http.calls == requests_sent
+    assert second == first
+    assert integrator.cache.stats()["hits"] == 5
+
+def test_directory_rescan_analyses_only_changed_files(tmp_path, monkeypatch):
+    integrator = make_integrator(tmp_path, monkeypatch, cache=False)
+    notes = write_archive(tmp_path, 5)
+    manifest_file = str(tmp_path / "manifest.json")
+    
+    first = integrator.process_notes_directory(str(notes), manifest_file=manifest_file)
+    requests_sent = integrator.http.calls
+    
+    assert integrator.process_notes_directory(str(notes), manifest_file=manifest_file) == first
+    assert integrator.http.calls == requests_sent
+    
+    (notes / "note_03.md").write_text("Настроила CI в GitHub Actions", encoding="utf-8")
+    (notes / "note_04.md").unlink()
+    third = integrator.process_notes_directory(str(notes), manifest_file=manifest_file)
+    assert integrator.http.calls == requests_sent + 1
+    assert {Path(match["source_file"]).name for match in third} <= {f"note_{i:02}.md" for i in range(4)}
+    unchanged = [match for match in first if Path(match["source_file"]).name in {"note_00.md", "note_01.md", "note_02.md"}]
+    assert [match for match in third if Path(match["source_file"]).name != "note_03.md"] == unchanged
+
+def test_offline_process_pool_matches_sequential_run(tmp_path, monkeypatch, capsys):
+    notes = write_archive(tmp_path, 12)
+    sequential = make_integrator(tmp_path, monkeypatch, api=False, cache=False)
+    sequential.pack_max_items = 2
+    expected = sequential.process_notes_directory(str(notes), manifest_file=str(tmp_path / "sequential.json"))
+    assert expected
+    
+    parallel = make_integrator(tmp_path, monkeypatch, api=False, cache=False)
+    parallel.pack_max_items = 2
+    parallel.offline_workers = 2
+    pools = []
+    class RecordingPool(ProcessPoolExecutor):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            pools.append(self)
+    monkeypatch.setattr(reasoning_integration, "ProcessPoolExecutor", RecordingPool)
+    
+    assert parallel.process_notes_directory(str(notes), manifest_file=str(tmp_path / "parallel.json")) == expected
+    assert len(pools) == 1
+    assert "📈 Проанализировано файлов: 12/12" in capsys.readouterr().out
+
+def test_matches_are_applied_with_one_save(tmp_path, monkeypatch):
+    monkeypatch.setenv("REASONING_CACHE", "0")
+    tracker = CareerTracker(progress_file=str(tmp_path / "progress.json"))
+    assert tracker.mark_completed("git_1_1")
+    saves = []
+    original_save = tracker._save_progress
+    monkeypatch.setattr(tracker, "_save_progress", lambda: saves.append(1) or original_save())
+    
+    integrator = ReasoningIntegrator(tracker)
+    results = integrator.apply_matches_to_tracker([
+        {"matched_marker_id": "python_1_1"},
+        {"matched_marker_id": "python_1_2"},
+        {"matched_marker_id": "python_1_1"},
+        {"matched_marker_id": "git_1_1"},
+        {"matched_marker_id": "no_such_marker"},
+        {},
+    ])
+    
+    assert results == {"applied": 2, "skipped": 2, "errors": 2}
+    assert len(saves) == 1
+    assert tracker.progress["completed_markers"] == ["git_1_1", "python_1_1", "python_1_2"]
@@ -0,0 +1,21 @@
+import sys
+sys.path.append('.')
+
+from src.utils.request_packer import PACK_SECTION_RE, format_pack, iter_packs, split_pack_matches
+
+def test_request_packer_bins_in_order_and_attributes_matches():
+    items = ["a" * 10, "b" * 10, None, "c" * 25, "d" * 5]
+    packs = list(iter_packs(items, lambda item: len(item) if item else 0, max_size=25, max_items=3))
+    assert packs == [["a" * 10, "b" * 10, None], ["c" * 25], ["d" * 5]]
+    
+    text = format_pack([("a.md", "первая"), ("b.py", "вторая\nстрока")])
+    assert PACK_SECTION_RE.findall(text) == [("1", "первая"), ("2", "вторая\nстрока")]
+    
+    per_item, unattributed = split_pack_matches([
+        {"source": 2, "matched_marker_id": "python_1_1"},
+        {"source": "1", "matched_marker_id": "git_1_1"},
+        {"source": 7, "matched_marker_id": "docker_1_1"},
+        {"matched_marker_id": "linux_1_1"},
+    ], count=2)
+    assert per_item == [[{"matched_marker_id": "git_1_1"}], [{"matched_marker_id": "python_1_1"}]]
+    assert unattributed == 2
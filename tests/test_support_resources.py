@@ -0,0 +1,42 @@
+import sys
+sys.path.append('.')
+
+import json
+import os
+from datetime import date
+from pathlib import Path
+
+from src.core.support_resources import EMERGENCY_CONTACTS, SupportResourceStore
+
+def write_resources(root: Path, quotes, contacts) -> None:
+    (root / "resources").mkdir(exist_ok=True)
+    (root / "resources" / "motivational_quotes.json").write_text(json.dumps(quotes, ensure_ascii=False), encoding="utf-8")
+    (root / "resources" / "crisis_contacts.json").write_text(json.dumps(contacts, ensure_ascii=False), encoding="utf-8")
+
+def test_repository_resources_load_and_validate():
+    store = SupportResourceStore()
+    assert store.quotes() and all(quote["quote"] for quote in store.quotes())
+    assert any(contact["phone"] == "112" for contact in store.crisis_contacts())
+    assert store.community_guide()
+    assert store.daily_quote(date(2025, 1, 1)) == store.daily_quote(date(2025, 1, 1))
+
+def test_files_are_parsed_once_and_reloaded_after_change(tmp_path, monkeypatch):
+    write_resources(tmp_path, [{"quote": "Первая", "author": "А"}, {"author": "без текста"}], [{"name": "112"}])
+    store = SupportResourceStore(str(tmp_path))
+
+    assert store.quotes() == [{"quote": "Первая", "author": "А", "action": ""}]
+    # Контакт без телефона отброшен — показываются встроенные экстренные номера
+    assert store.crisis_contacts() == EMERGENCY_CONTACTS
+    assert store.community_guide() is None
+
+    parsed = []
+    monkeypatch.setattr(json, "load", lambda f: parsed.append(f) or [])
+    assert store.random_quote()["quote"] == "Первая"
+    assert parsed == []
+    monkeypatch.undo()
+
+    quotes_file = tmp_path / "resources" / "motivational_quotes.json"
+    quotes_file.write_text(json.dumps([{"quote": "Вторая", "author": "Б", "action": "шаг"}]), encoding="utf-8")
+    stat = quotes_file.stat()
+    os.utime(quotes_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert store.daily_quote()["quote"] == "Вторая"
@@ -2,10 +2,13 @@ import pytest
 import json
 import tempfile
 from pathlib import Path
+import subprocess
 import sys
 sys.path.append('.')
 
+from src.core.progress_summary import read_summary
 from src.core.tracker import CareerTracker
+from src.core.tracker_pool import TrackerPool
 
 def test_tracker_initialization():
     tracker = CareerTracker()
@@ -21,5 +24,49 @@ def test_progress_file_creation():
         assert tracker.progress["completed_markers"] == []
         assert tracker.progress["in_progress_markers"] == []
 
+def test_tracker_pool_isolates_profiles_and_shares_catalog():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        pool = TrackerPool(
+            default_progress_file=str(Path(temp_dir) / "progress.json"),
+            profiles_dir=str(Path(temp_dir) / "profiles"),
+            max_size=2
+        )
+        alice = pool.get("alice")
+        bob = pool.get("bob")
+        
+        assert alice.progress is not bob.progress
+        assert alice.markers is bob.markers is pool.markers
+        
+        assert alice.mark_completed("python_1_1")
+        assert bob.progress["completed_markers"] == []
+        
+        pool.get("carol")
+        assert len(pool) == 2
+        assert pool.get("alice").progress["completed_markers"] == ["python_1_1"]
+        assert pool.portfolio_file_for("alice") != pool.portfolio_file_for("bob")
+        assert pool.portfolio_file_for("alice").parent == Path(temp_dir) / "profiles"
+
+def test_save_refreshes_summary_read_by_low_energy_mode():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        progress_file = Path(temp_dir) / "progress.json"
+        tracker = CareerTracker(progress_file=str(progress_file))
+        assert tracker.mark_completed("python_1_1")
+        
+        summary = read_summary(tracker.summary_file)
+        assert tracker.summary_file.parent == progress_file.parent
+        assert summary["completed"] == 1 and summary["total"] > 1
+        assert summary["skills"]["Python"]["completed"] == 1
+        assert summary["last_completed"]["id"] == "python_1_1"
+        # Последнее достижение переживает перезапуск трекера
+        assert CareerTracker(progress_file=str(progress_file)).progress_summary()["last_completed"] == summary["last_completed"]
+        
+        script = (
+            "import runpy, sys, builtins; builtins.input = lambda *a: ''; "
+            f"mode = runpy.run_path('support/low_energy_mode.py')['LowEnergyMode']({str(progress_file)!r}); "
+            "mode.show_progress(); assert 'src.core.tracker' not in sys.modules"
+        )
+        output = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, check=True).stdout
+        assert f"Выполнено маркеров: 1 из {summary['total']}" in output
+
 if __name__ == "__main__":
     pytest.main([__file__])